@@ -2,22 +2,36 @@ from __future__ import annotations
 from typing import Any
 import webbrowser
 import secrets
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict
 
-from auth0.authentication.async_token_verifier import AsyncAsymmetricSignatureVerifier
-
 from .base import BaseAuth
 from .user import User
+from fastapi import APIRouter
+
 from auth0_ai.server.auth_server import AuthServer
+from auth0_ai.server.routes import create_auth_router
+from auth0_ai.server.session_dependency import SessionDependency
+from auth0_ai.token_module.jwks import JwksCache, JwksSignatureVerifier
 from auth0_ai.token_module.manager import TokenManager
+from auth0_ai.token_module.refresh_policy import RefreshPolicy
 from auth0_ai.session_module.manager import SessionManager
 from auth0_ai.state.login_state import LoginState
 from auth0_ai.state.link_state import LinkState
+from auth0_ai.state.storage import MemoryStateStore, StateStore
+from auth0_ai.state.waiters import StateWaiters
+from auth0_ai.utils.admission import AdmissionController
+from auth0_ai.utils.call_policy import CallPolicy, OutboundPolicies
+from auth0_ai.utils.metrics import REGISTRY, observe_store
+from auth0_ai.utils.offload import run_blocking
+from auth0_ai.utils.tracing import set_attributes, traced
 from auth0_ai.utils.url_builder import URLBuilder
 
 
 class AIAuth(BaseAuth):
     """Main authentication class that orchestrates the auth flow"""
+    # Default number of threads blocking SDK calls and session store I/O are offloaded to
+    IO_WORKERS = 32
 
     def __init__(
             self,
@@ -26,8 +40,48 @@ class AIAuth(BaseAuth):
             client_secret: str | None = None,
             redirect_uri: str | None = None,
             secret_key: str | None = None,
-            *args, **kwargs):
-        """Initialize AIAuth with all necessary components"""
+            *args,
+            persist_connection_tokens: bool = False,
+            prefetch_jwks: bool = True,
+            userinfo_ttl: float = TokenManager.USERINFO_TTL,
+            refresh_policy: RefreshPolicy | None = None,
+            call_policies: Dict[str, CallPolicy] | None = None,
+            admission: AdmissionController | None = None,
+            outbound_admission: AdmissionController | None = None,
+            io_workers: int = IO_WORKERS,
+            standalone_server: bool = True,
+            headless: bool = False,
+            start_server: bool = False,
+            state_store: StateStore | None = None,
+            expose_metrics: bool = False,
+            **kwargs):
+        """
+        Initialize AIAuth with all necessary components
+        Args:
+            persist_connection_tokens: Keep federated connection tokens in the user's session
+                in addition to the in-memory cache
+            prefetch_jwks: Load the tenant's signing keys in the background at startup
+            userinfo_ttl: Seconds a /userinfo response is served from cache (0 disables caching)
+            refresh_policy: Skew, refresh-ahead and jitter applied on every token expiry check
+            call_policies: Per-endpoint timeouts, hedging and circuit breakers for calls to Auth0,
+                keyed by endpoint name (see OutboundPolicies.ENDPOINTS)
+            admission: Global and per-client (by IP address) rate limits of /auth/login and
+                /auth/callback; requests over the limit are queued up to its max_wait, then get a 429
+            outbound_admission: Global and per-endpoint rate limits of calls to Auth0, keeping bursts
+                under the tenant's rate limit; shed calls raise RateLimitedError
+            io_workers: Size of the thread pool blocking Auth0 calls and session store I/O run on,
+                so a slow call never stalls the callback server's event loop
+            standalone_server: Serve the /auth routes on a private uvicorn thread bound to the
+                redirect URI's port. Disable when mounting create_router() on your own ASGI app.
+                The server starts lazily on the first interactive login or link, or with start().
+            headless: Construct without any server and without prefetching keys, for processes that
+                only read sessions and tokens. Interactive flows are unavailable.
+            start_server: Start the standalone server right away instead of on first use
+            state_store: Store for in-flight login and link states. Use a shared store
+                (SQLiteStateStore, RedisStateStore) when the callback runs in several workers.
+            expose_metrics: Serve the metrics registry at /auth/metrics, without authentication.
+                Off by default; auth_client.metrics is always available to export them otherwise.
+        """
         super().__init__(
             domain=domain,
             client_id=client_id,
@@ -36,26 +90,78 @@ class AIAuth(BaseAuth):
             secret_key=secret_key,
             *args, **kwargs
         )
-        # Initialize token verifier
-        jwk_url = f"https://{self.domain}/.well-known/jwks.json"
-        self.token_verifier = AsyncAsymmetricSignatureVerifier(
-            jwks_url=jwk_url)
+        self.io_executor = ThreadPoolExecutor(
+            max_workers=io_workers, thread_name_prefix="auth0-ai-io")
+        self.call_policies = OutboundPolicies(
+            call_policies, offload_executor=self.io_executor, admission=outbound_admission)
+        self.admission = admission
+        # Latencies and counters of this process, also served at /auth/metrics
+        self.metrics = REGISTRY
+        self.expose_metrics = expose_metrics
+        # Initialize token verifier, sharing one key cache per tenant
+        self.jwks_cache = JwksCache.for_domain(self.domain, protocol=self.protocol)
+        # Key fetches run under this client's policies and executor, not those of the shared cache
+        self.token_verifier = JwksSignatureVerifier(
+            self.jwks_cache, call_policies=self.call_policies, executor=self.io_executor)
+        if prefetch_jwks and not headless:
+            self.jwks_cache.prefetch(call_policies=self.call_policies)
         # Initialize components
-        self.state_store: Dict[str, Dict[str, Any]] = {}
-        self.session_manager = SessionManager(self)
-        self.token_manager = TokenManager(self)
+        self.state_store: StateStore = state_store if state_store is not None else MemoryStateStore()
+        # Woken by the callback so pending logins and links don't poll the state store
+        self.state_waiters = StateWaiters()
+        self.session_manager = SessionManager(self, executor=self.io_executor)
+        self.token_manager = TokenManager(
+            self,
+            persist_connection_tokens=persist_connection_tokens,
+            userinfo_ttl=userinfo_ttl,
+            refresh_policy=refresh_policy,
+            call_policies=self.call_policies)
         self.url_builder = URLBuilder(self)
-        # Initialize server
-        self.server = AuthServer(self)
+        # FastAPI dependency decoding the session cookie, shared by the /auth routes and the application
+        self.current_session = SessionDependency(self)
+        # Initialize server, unless headless or the routes are mounted on the application's own server
+        self.headless = headless
+        self.server = AuthServer(self) if standalone_server and not headless else None
+        if start_server:
+            self.start()
+
+    def start(self) -> None:
+        """Start the standalone auth server if it is not running yet"""
+        if self.server is not None:
+            self.server.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """
+        Stop the standalone auth server gracefully.
+        Args:
+            timeout: Seconds to wait for in-flight requests before forcing the shutdown
+        """
+        if self.server is not None:
+            self.server.stop(timeout)
+
+    async def _ensure_server(self) -> None:
+        """Make sure a server can receive the callback of an interactive flow"""
+        if self.headless:
+            raise RuntimeError("Interactive flows need the auth server, but AIAuth was created headless.")
+        await run_blocking(self.io_executor, self.start)
+
+    def create_router(self) -> APIRouter:
+        """
+        Create the /auth routes as a router to include in an existing FastAPI app.
+        Returns:
+            Router serving the authentication endpoints
+        """
+        return create_auth_router(self, self.current_session, expose_metrics=self.expose_metrics)
 
     def _generate_state(self, return_to: str | None = None) -> str:
         """Generate a secure random state and store it for validation."""
         state = secrets.token_urlsafe(16)  # Generate a random state
         # Store it temporarily and flag it as false as we havent received it back as yet
-        self.state_store[state] = {
-            "is_competed": False, "return_to": return_to}
+        with observe_store("state", "set"):
+            self.state_store.set_state(state, {"is_completed": False, "return_to": return_to})
         return state
 
+    @traced("auth0_ai.interactive_login")
     async def interactive_login(
         self,
         connection: str | None = None,
@@ -71,11 +177,13 @@ class AIAuth(BaseAuth):
         Returns:
             User instance if successful, error string if failed
         """
+        set_attributes(connection=connection, scope=scope, audience=kwargs.get("audience"))
         if scope is None:
             scope = "openid profile email"
         # Generate state and create login state tracker
-        state = self._generate_state()
-        login_state = LoginState(self.state_store, state)
+        await self._ensure_server()
+        state = await run_blocking(self.io_executor, self._generate_state)
+        login_state = LoginState(self.state_store, state, self.state_waiters, self.io_executor)
         # Generate authorization URL
         auth_url = self.url_builder.get_authorize_url(
             state=state,
@@ -90,10 +198,12 @@ class AIAuth(BaseAuth):
             print(f"Please navigate here: {auth_url}")
         # Wait for authentication completion
         user_id = await login_state.wait_for_completion()
+        set_attributes(outcome="completed" if user_id else "failed")
         if not user_id:
             return "login failed"
         return User(self, user_id=user_id)
 
+    @traced("auth0_ai.link")
     async def link(
         self,
         primary_user_id: str,
@@ -113,10 +223,12 @@ class AIAuth(BaseAuth):
         Returns:
             Dict containing link status and user information
         """
-        state = self._generate_state()
-        link_state = LinkState(self.state_store, state)
-        link_state.set_user(primary_user_id)
-        link_state.set_value(key="operation", val={
+        set_attributes(connection=connection, scope=scope)
+        await self._ensure_server()
+        state = await run_blocking(self.io_executor, self._generate_state)
+        link_state = LinkState(self.state_store, state, self.state_waiters, self.io_executor)
+        await run_blocking(self.io_executor, link_state.set_user, primary_user_id)
+        await run_blocking(self.io_executor, link_state.set_value, key="operation", val={
                              "type": "linking", "connection": connection})
 
         auth_url = self.url_builder.get_authorize_url(
@@ -167,10 +279,11 @@ class AIAuth(BaseAuth):
         Returns:
             Dict containing link status and user information
         """
-        state = self._generate_state()
-        link_state = LinkState(self.state_store, state)
-        link_state.set_user(primary_user_id)
-        link_state.set_value(key="operation", val={
+        await self._ensure_server()
+        state = await run_blocking(self.io_executor, self._generate_state)
+        link_state = LinkState(self.state_store, state, self.state_waiters, self.io_executor)
+        await run_blocking(self.io_executor, link_state.set_user, primary_user_id)
+        await run_blocking(self.io_executor, link_state.set_value, key="operation", val={
                              "type": "unlinking", "connection": connection})
 
         auth_url = self.url_builder.get_authorize_url(
@@ -191,6 +304,9 @@ class AIAuth(BaseAuth):
 
             # Wait for linking completion
             user_id = await link_state.wait_for_completion()
+            if user_id:
+                self.token_manager.invalidate_upstream_tokens(
+                    primary_user_id, connection)
             return {
                 "is_successful": bool(user_id),
                 "user_id": user_id or primary_user_id
@@ -210,11 +326,24 @@ class AIAuth(BaseAuth):
         self,
         connection: str,
         refresh_token: str,
-        additional_scopes: str | None = None
+        additional_scopes: str | None = None,
+        user_id: str | None = None
     ) -> Dict[str, Any]:
-        """Get token for federated connection"""
+        """Get token for federated connection (additional_scopes is deprecated and not sent to Auth0)"""
         return self.token_manager.get_upstream_token(
             connection=connection,
             refresh_token=refresh_token,
-            additional_scopes=additional_scopes
+            additional_scopes=additional_scopes,
+            user_id=user_id
+        )
+
+    def get_client_credentials_token(
+        self,
+        audience: str,
+        scope: str | None = None
+    ) -> Dict[str, Any]:
+        """Get a cached machine-to-machine token for an API audience"""
+        return self.token_manager.get_client_credentials_token(
+            audience=audience,
+            scope=scope
         )
@@ -46,6 +46,11 @@ class BaseAuth(AuthenticationBase):
             *args, **kwargs
         )
 
+    @property
+    def base_url(self) -> str:
+        """Base URL of the Auth0 tenant, honouring the configured protocol"""
+        return f"{self.protocol}://{self.domain}"
+
     def _validate_and_set(self, field: str, value: str | None) -> None:
         """Validate and set a configuration value"""
         if not value:
@@ -65,9 +65,9 @@ class User:
         """Get the user's ID token"""
         return self._auth_client.token_manager.get_id_token(self.user_id)
 
-    def get_access_token(self, audience: str | None = None) -> str:
-        """Get the user's access token"""
-        return self._auth_client.token_manager.get_access_token(self.user_id, aud=audience)
+    def get_access_token(self, audience: str | None = None, scope: str | None = None) -> str:
+        """Get the user's access token, optionally one covering the given scopes"""
+        return self._auth_client.token_manager.get_access_token(self.user_id, aud=audience, scope=scope)
 
     def get_refresh_token(self) -> str:
         """Get the user's refresh token"""
@@ -76,13 +76,14 @@ class User:
     def get_token_for_connection(self, connection: str) -> Dict[str, Any]:
         """
         Get access token for a linked third-party provider.
+        Tokens are served from cache while still valid.
         Args:
             connection: The name of the third-party connection (e.g., 'github')
         Returns:
             Dict containing the third-party access token and related information
         """
         refresh_token = self.get_refresh_token()
-        return self._auth_client.get_upstream_token(connection, refresh_token)
+        return self._auth_client.get_upstream_token(connection, refresh_token, user_id=self.user_id)
 
     def get_profile(self) -> Dict[str, Any]:
         """
@@ -93,23 +94,43 @@ class User:
         access_token = self.get_access_token()
         return self._auth_client.token_manager.get_userinfo(access_token)
 
-    async def get_token_info(self) -> Dict[str, Any]:
+    async def get_profile_async(self) -> Dict[str, Any]:
+        """
+        Get the user's profile information without blocking the event loop.
+        Returns:
+            Dict containing user profile data
+        """
+        access_token = self.get_access_token()
+        return await self._auth_client.token_manager.get_userinfo_async(access_token)
+
+    async def get_token_info(self, audience: str | None = None) -> Dict[str, Any]:
         """
         Get detailed information about the user's tokens.
+        Read from the tokens' verified claims and the session, without calling Auth0.
+        Args:
+            audience: Audience of the access token to describe, defaults to /userinfo
         Returns:
-            Dict containing token information
+            Dict with the introspection of the ID token and the access token
         """
+        token_manager = self._auth_client.token_manager
+        token_data = token_manager.get_token_data(self.user_id, aud=audience) or {}
         id_token = self.get_id_token()
-        access_token = self.get_access_token()
-        return await self._auth_client.token_manager.get_tokeninfo(id_token, access_token)
+        return {
+            "id_token": await token_manager.introspect(id_token) if isinstance(id_token, str) else {"active": False},
+            "access_token": await token_manager.introspect(token_data["access_token"], token_data)
+            if token_data.get("access_token") else {"active": False},
+        }
 
-    def is_token_valid(self) -> bool:
+    def is_token_valid(self, audience: str | None = None, scope: str | None = None) -> bool:
         """
         Check if the user's tokens are still valid.
+        Args:
+            audience: Audience of the access token, defaults to /userinfo
+            scope: Optional scopes the access token must cover
         Returns:
             bool indicating token validity
         """
-        return self._auth_client.token_manager.validate_tokens(self.user_id)
+        return self._auth_client.token_manager.get_token_data(self.user_id, aud=audience, scope=scope) is not None
 
     async def refresh_tokens(self) -> bool:
         """
@@ -120,7 +141,12 @@ class User:
         refresh_token = self.get_refresh_token()
         if not refresh_token:
             return False
-        return await self._auth_client.token_manager.refresh_tokens(self.user_id, refresh_token)
+        token_data = await self._auth_client.token_manager.refresh_tokens_async(
+            refresh_token, user_id=self.user_id)
+        if not token_data:
+            return False
+        await self._auth_client.session_manager.set_encrypted_session(token_data, user_id=self.user_id)
+        return True
 
     def get_session(self) -> Dict[str, Any]:
         """
@@ -3,6 +3,8 @@ Auth0 AI Server Module
 Internal module for handling OAuth callback server and routes.
 """
 from .auth_server import AuthServer
-from .routes import setup_routes
+from .cookie_codec import SessionCookieCodec
+from .routes import create_auth_router, setup_routes
+from .session_dependency import SessionDependency
 
-__all__ = ["AuthServer","setup_routes"] 
+__all__ = ["AuthServer", "SessionCookieCodec", "SessionDependency", "create_auth_router", "setup_routes"] 
@@ -10,6 +10,20 @@ from fastapi import FastAPI
 from .routes import setup_routes
 
 
+class _Server(uvicorn.Server):
+    """uvicorn server signalling when it is done starting, whether it succeeded or not"""
+
+    def __init__(self, config: uvicorn.Config):
+        super().__init__(config)
+        self.startup_done = threading.Event()
+
+    async def startup(self, sockets: Any = None) -> None:
+        try:
+            await super().startup(sockets=sockets)
+        finally:
+            self.startup_done.set()
+
+
 class AuthServer:
     """
     FastAPI server handling Auth0 callbacks and authentication routes.
@@ -31,9 +45,12 @@ class AuthServer:
         self.port = parsed_uri.port
         self.protocol = urllib.parse.urlparse(auth_client.redirect_uri).scheme
 
-        # Setup routes with dependencies
-        setup_routes(self.app, auth_client)
-        self.start()
+        # Setup routes with dependencies; the server itself starts on demand (see start)
+        setup_routes(self.app, auth_client, auth_client.current_session,
+                     expose_metrics=getattr(auth_client, "expose_metrics", False))
+        self._server: _Server | None = None
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
 
     def _is_valid_file(self, file_path) -> bool:
         """Check if the file exists and is accessible."""
@@ -44,8 +61,37 @@ class AuthServer:
         except Exception as e:
             return valid
 
-    def start(self):
-        """Runs FastAPI as the middleware inside a separate thread."""
+    @property
+    def is_running(self) -> bool:
+        """Whether the server thread is serving requests"""
+        return self._server is not None and self._thread is not None and self._thread.is_alive()
+
+    def start(self, timeout: float = 5.0) -> None:
+        """
+        Run FastAPI as the middleware inside a separate thread, if not already running.
+        Args:
+            timeout: Seconds to wait for the server to accept connections
+        Raises:
+            ValueError: if HTTPS is configured without valid certificate files
+            RuntimeError: if the server cannot bind its port or does not start in time
+        """
+        with self._lock:
+            if not self.is_running:
+                self._launch()
+            # Waited on outside the lock, unaffected by a concurrent stop() clearing the attributes
+            server, thread = self._server, self._thread
+
+        if not server.startup_done.wait(timeout):
+            raise RuntimeError(
+                f"Auth server did not start on {self.host}:{self.port} within {timeout} seconds.")
+        if not server.started:
+            thread.join(timeout)
+            raise RuntimeError(
+                f"Auth server failed to start on {self.host}:{self.port}, is the port in use?")
+
+    def _launch(self) -> None:
+        """Create the server and its thread, called with the lock held"""
+        kwargs = {"host": self.host, "port": self.port, "log_level": "info"}
         if (self.protocol == "https"):
 
             ssl_keyfile = os.getenv("AUTH0_SSL_KEYFILE")
@@ -55,29 +101,40 @@ class AuthServer:
                 raise ValueError(
                     "AUTH0_SSL_KEYFILE and AUTH0_SSL_CERTFILE environment variables must be set with valid file paths for HTTPS.")
 
-            server_thread = threading.Thread(
-                target=uvicorn.run,
-                args=(self.app,),
-                kwargs={
-                    "host": self.host,
-                    "port": self.port,
-                    "ssl_keyfile": ssl_keyfile,  # Path to private key
-                    "ssl_certfile": ssl_certfile,  # Path to certificate
-                    "log_level": "error"},
-                daemon=True  # Daemon mode so it exits when the main thread exits
-            )
-        else:
-            server_thread = threading.Thread(
-                target=uvicorn.run,
-                args=(self.app,),
-                kwargs={
-                    "host": self.host,
-                    "port": self.port,
-                    "log_level": "info"},
-                daemon=True  # Daemon mode so it exits when the main thread exits
-            )
+            kwargs.update({
+                "ssl_keyfile": ssl_keyfile,  # Path to private key
+                "ssl_certfile": ssl_certfile,  # Path to certificate
+                "log_level": "error"})
+
+        self._server = _Server(uvicorn.Config(self.app, **kwargs))
+        # Daemon mode so it exits when the main thread exits
+        self._thread = threading.Thread(
+            target=self._serve, args=(self._server,), name="auth0-ai-server", daemon=True)
+        self._thread.start()
+
+    def _serve(self, server: _Server) -> None:
         try:
-            server_thread.start()
-        except Exception as e:
-            print(f"Error starting middleware server: {str(e)}")
-            raise e
+            server.run()
+        except SystemExit:
+            # uvicorn exits when it cannot bind the port; start() reports the failure
+            pass
+        finally:
+            # Wakes start() if the server stopped before finishing its startup
+            server.startup_done.set()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """
+        Stop the server gracefully, letting in-flight requests finish.
+        Args:
+            timeout: Seconds to wait before forcing the shutdown
+        """
+        with self._lock:
+            server, thread = self._server, self._thread
+            self._server = self._thread = None
+        if server is None or thread is None:
+            return
+        server.should_exit = True
+        thread.join(timeout)
+        if thread.is_alive():
+            server.force_exit = True
+            thread.join(timeout)
@@ -0,0 +1,133 @@
+from __future__ import annotations
+import base64
+import re
+import zlib
+from typing import Dict, List
+
+from fastapi import Request, Response
+
+
+class SessionCookieCodec:
+    """
+    Stores the session JWT in compressed, chunked cookies.
+    The payload is zlib-compressed and base64url-encoded, then split into
+    {prefix}_0 .. {prefix}_{n-1}. The first chunk starts with a "{n}." header so
+    chunks left over from a larger earlier session are ignored on read and
+    deleted on the next write.
+    """
+    # Bytes reserved per cookie for the name, attributes and the count header
+    COOKIE_OVERHEAD = 128
+    # Decompression happens before the session's signature is checked, so a forged
+    # cookie must not be able to expand to more than this many bytes or chunks
+    MAX_SESSION_BYTES = 256 * 1024
+    MAX_CHUNKS = 50
+
+    def __init__(
+        self,
+        prefix: str = "__session_data",
+        max_size: int = 4096,
+        path: str = "/auth",
+        secure: bool = False
+    ):
+        """
+        Initialize the codec.
+        Args:
+            prefix: Cookie name prefix, chunks are named {prefix}_{index}
+            max_size: Maximum size of a single cookie in bytes
+            path: Cookie path
+            secure: Whether cookies are only sent over HTTPS
+        """
+        self.prefix = prefix
+        self.max_size = max_size
+        self.path = path
+        self.secure = secure
+        self._chunk_name = re.compile(rf"^{re.escape(prefix)}_(\d+)$")
+
+    def encode(self, data: str) -> List[str]:
+        """
+        Compress and split data into cookie values.
+        Args:
+            data: Session data (the encoded session JWT)
+        Returns:
+            Cookie values in chunk order, the first carrying the chunk count
+        """
+        payload = base64.urlsafe_b64encode(zlib.compress(data.encode())).decode().rstrip("=")
+        chunk_size = self.max_size - len(self.prefix) - self.COOKIE_OVERHEAD
+        chunks = [payload[i:i + chunk_size] for i in range(0, len(payload), chunk_size)] or [""]
+        chunks[0] = f"{len(chunks)}.{chunks[0]}"
+        return chunks
+
+    def decode(self, cookies: Dict[str, str]) -> str:
+        """
+        Reassemble and decompress the session from request cookies.
+        Args:
+            cookies: Request cookies
+        Returns:
+            The session data, or an empty string if it is missing or incomplete
+        """
+        chunks = self._chunks(cookies)
+        head = chunks.get(0)
+        if head is None:
+            return ""
+        count, separator, first = head.partition(".")
+        if not separator or not count.isdigit():
+            # Session written before compression: plain JWT split over the chunks
+            return "".join(chunks[index] for index in sorted(chunks))
+        if int(count) > self.MAX_CHUNKS:
+            return ""
+        parts = [first] + [chunks.get(index) for index in range(1, int(count))]
+        if any(part is None for part in parts):
+            return ""
+        payload = "".join(parts)
+        try:
+            decompressor = zlib.decompressobj()
+            data = decompressor.decompress(
+                base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)), self.MAX_SESSION_BYTES)
+            if decompressor.unconsumed_tail or not decompressor.eof:
+                # Larger than any session written by encode, or truncated
+                return ""
+            return data.decode()
+        except (ValueError, zlib.error):
+            return ""
+
+    def read(self, request: Request) -> str:
+        """Get the session data from the request's cookies"""
+        return self.decode(request.cookies)
+
+    def write(self, response: Response, data: str, request: Request | None = None) -> None:
+        """
+        Set the session cookies on the response, each chunk once.
+        Chunks present on the request beyond the new chunk count are deleted.
+        Args:
+            response: Response to set the cookies on
+            data: Session data (the encoded session JWT)
+            request: Optional current request, used to find stale chunks
+        """
+        chunks = self.encode(data)
+        for index, value in enumerate(chunks):
+            response.set_cookie(
+                key=f"{self.prefix}_{index}",
+                value=value,
+                path=self.path,
+                httponly=True,  # Prevent JavaScript access
+                secure=self.secure,
+                samesite="lax",  # Protect against CSRF
+            )
+        if request is not None:
+            for index in self._chunks(request.cookies):
+                if index >= len(chunks):
+                    response.delete_cookie(key=f"{self.prefix}_{index}", path=self.path)
+
+    def clear(self, response: Response, request: Request) -> None:
+        """Delete every session chunk present on the request"""
+        for index in self._chunks(request.cookies):
+            response.delete_cookie(key=f"{self.prefix}_{index}", path=self.path)
+
+    def _chunks(self, cookies: Dict[str, str]) -> Dict[int, str]:
+        """Session chunks keyed by index, ignoring unrelated cookies"""
+        chunks = {}
+        for name, value in cookies.items():
+            match = self._chunk_name.match(name)
+            if match:
+                chunks[int(match.group(1))] = value
+        return chunks
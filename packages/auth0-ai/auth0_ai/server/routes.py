@@ -1,17 +1,131 @@
 from __future__ import annotations
-from typing import Any
-
-from fastapi import FastAPI, Request, Response, HTTPException
-from fastapi.responses import JSONResponse, RedirectResponse
-import jwt
+import asyncio
+import functools
+import json
+import math
 import time
-from auth0.authentication import RevokeToken
+from typing import Any, Callable, Dict, List
 
+from fastapi import APIRouter, Body, Depends, FastAPI, Request, Response, HTTPException
+from fastapi.responses import JSONResponse, PlainTextResponse, RedirectResponse, StreamingResponse
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+from auth0.authentication import RevokeToken
 
-def setup_routes(app: FastAPI, auth_client: Any) -> None:
+from auth0_ai.server.session_dependency import SessionDependency
+from auth0_ai.state.base_state import BaseState
+from auth0_ai.state.waiters import StateWaiters
+from auth0_ai.token_module.scope_index import ScopeIndex
+from auth0_ai.utils.admission import RateLimitedError
+from auth0_ai.utils.metrics import REGISTRY, ROUTE_LATENCY, STATE_VALIDATION_FAILURES, observe_store
+from auth0_ai.utils.offload import run_blocking
+from auth0_ai.utils.timing import StageTimings
+from auth0_ai.utils.tracing import set_attributes, span
+
+
+# Maximum number of audiences in one /auth/get_tokens request
+MAX_BATCH_TOKENS = 20
+# Default and maximum seconds a /auth/wait request is held open
+WAIT_TIMEOUT = 30.0
+MAX_WAIT_TIMEOUT = 120.0
+# Seconds between keep-alive comments of a /auth/wait event stream
+KEEPALIVE_INTERVAL = 15.0
+
+
+class InstrumentedRoute(APIRoute):
+    """
+    Route traced as a span and timed, by path template, method and status, in the metrics registry.
+    Requests shed by admission control are answered with 429 and a Retry-After header.
+    """
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        route = self.path
+
+        async def timed_handler(request: Request) -> Response:
+            started = time.perf_counter()
+            status = 500
+            with span(f"auth0_ai.route {request.method} {route}", route=route, method=request.method):
+                try:
+                    response = await handler(request)
+                    status = response.status_code
+                    return response
+                except RateLimitedError as error:
+                    status = 429
+                    return JSONResponse(
+                        status_code=status, content={"detail": str(error)},
+                        headers={"Retry-After": str(math.ceil(error.retry_after))})
+                except HTTPException as error:
+                    status = error.status_code
+                    raise
+                finally:
+                    set_attributes(status=status)
+                    ROUTE_LATENCY.observe(
+                        time.perf_counter() - started, route=route, method=request.method, status=status)
+
+        return timed_handler
+
+
+class TokenRequest(BaseModel):
+    """One audience and the scopes its token must cover"""
+    audience: str
+    scope: str | None = None
+
+
+def setup_routes(
+    app: FastAPI,
+    auth_client: Any,
+    current_session: SessionDependency | None = None,
+    expose_metrics: bool = False
+) -> None:
     """Set up all routes for the authentication server."""
-
-    @app.get("/auth/callback")
+    app.include_router(create_auth_router(auth_client, current_session, expose_metrics=expose_metrics))
+
+
+def create_auth_router(
+    auth_client: Any,
+    current_session: SessionDependency | None = None,
+    expose_metrics: bool = False
+) -> APIRouter:
+    """
+    Create the authentication routes as a router that can be mounted on any FastAPI app.
+    Args:
+        auth_client: The parent AIAuth instance
+        current_session: Dependency decoding the session cookie, shared with application routes
+        expose_metrics: Serve /auth/metrics. It is unauthenticated and reveals traffic, error
+            counts and Auth0 latency, so only enable it where the path is not publicly reachable.
+    Returns:
+        Router serving the /auth/* endpoints
+    """
+    router = APIRouter(route_class=InstrumentedRoute)
+    # Blocking SDK calls and session store I/O run on this bounded pool, never on the event loop
+    executor = getattr(auth_client, "io_executor", None)
+    current_session = current_session or SessionDependency(auth_client)
+    session_cookies = current_session.cookies
+    # Pending logins and links wait on these instead of polling the state store
+    waiters = getattr(auth_client, "state_waiters", None) or StateWaiters()
+    admission = getattr(auth_client, "admission", None)
+
+    async def admit(request: Request) -> None:
+        """Queues or sheds bursts of requests that call Auth0, before any work is done"""
+        if admission is not None:
+            await admission.acquire_async(request.client.host if request.client else None)
+
+    def state_store(operation: str) -> Callable:
+        """State store method, timed and traced"""
+        method = getattr(auth_client.state_store, f"{operation}_state")
+
+        @functools.wraps(method)
+        def observed(*args, **kwargs):
+            with observe_store("state", operation):
+                return method(*args, **kwargs)
+        return observed
+
+    def reject_state(reason: str, detail: str) -> HTTPException:
+        STATE_VALIDATION_FAILURES.inc(reason=reason)
+        return HTTPException(status_code=400, detail=detail)
+
+    @router.get("/auth/callback", dependencies=[Depends(admit)])
     async def manage_callback(request: Request, response: Response):
         """Parses and validates callback URL query parameters."""
         query_params = request.query_params
@@ -21,38 +135,41 @@ def setup_routes(app: FastAPI, auth_client: Any) -> None:
             error_description = query_params.get(
                 "error_description", "Unknown error occurred.")
             if query_params.get("state"):
-                del auth_client.state_store[query_params.get("state")]
-            raise HTTPException(status_code=400, detail=error_description)
+                await run_blocking(executor, state_store("consume"), query_params.get("state"))
+                waiters.resolve(query_params.get("state"), {"status": "failed", "error": error_description})
+            raise reject_state("authorization_error", error_description)
 
         if not required_keys.issubset(query_params.keys()):
-            raise HTTPException(
-                status_code=400, detail="Missing required query parameters.")
+            raise reject_state("missing_parameters", "Missing required query parameters.")
 
         received_state = query_params["state"]
 
-        # Validate state to prevent CSRF attacks
-        if received_state not in auth_client.state_store:
-            raise HTTPException(
-                status_code=400, detail="Invalid or missing state parameter.")
+        # Validate state to prevent CSRF attacks; the state may have been created by another worker
+        state_data = await run_blocking(executor, state_store("get"), received_state)
+        if not state_data:
+            raise reject_state("unknown_state", "Invalid or missing state parameter.")
+        if state_data.get("is_completed"):
+            raise reject_state("already_used", "Invalid or missing state parameter.")
 
         # Extract code value from query string
         received_code = query_params["code"]
 
-        auth0_tokens = auth_client.token_manager.exchange_code_for_tokens(
-            received_code)
+        timings = StageTimings()
+        with timings.stage("code_exchange"):
+            auth0_tokens = await auth_client.token_manager.exchange_code_for_tokens_async(received_code)
 
         if auth0_tokens:
-            cookie_session_data = await auth_client.session_manager.set_encrypted_session(auth0_tokens, state=received_state)
-
-            # Split the session data into multiple cookies if it exceeds the maximum size
-            _set_cookie = await _split_cookie(response, max_size=4096, encoded_data=cookie_session_data, cookie_prefix="__session_data")
-
-            user_id = auth_client.state_store[received_state].get(
-                "user_id", "failed")
-            return_to = auth_client.state_store[received_state].get(
-                "return_to", None)
-            auth_client.state_store[received_state] = {
-                "user_id": user_id, "is_completed": True}
+            with timings.stage("session"):
+                cookie_session_data = await auth_client.session_manager.set_encrypted_session(
+                    auth0_tokens, state=received_state, timings=timings)
+
+            # set_encrypted_session recorded the user on the state; only the first callback completes it
+            state_data = await run_blocking(executor, state_store("get"), received_state) or {}
+            user_id = state_data.get("user_id", "failed")
+            return_to = state_data.get("return_to", None)
+            if not await run_blocking(executor, state_store("complete"), received_state, user_id=user_id):
+                raise reject_state("already_used", "State parameter was already used.")
+            waiters.resolve(received_state, {"status": "completed", "user_id": user_id})
 
             if return_to:
                 response = RedirectResponse(url=return_to, status_code=302)
@@ -61,34 +178,86 @@ def setup_routes(app: FastAPI, auth_client: Any) -> None:
                 response.body = b'{"message": "login successful"}'
                 response.status_code = 200
 
-            # for some reason, setting the cookie in an outside function does not work!
-            for key, value in _set_cookie.items():
-                response.set_cookie(
-                key=key,
-                value=value,
-                path="/auth",
-                httponly=True,  # Prevent JavaScript access
-                # secure=True,  # Send only over HTTPS
-                samesite="Lax",  # Protect against CSRF
-                )
-            
+            session_cookies.write(response, cookie_session_data, request)
+
+            # Per-stage latency of the login, visible in the browser's network panel
+            response.headers["Server-Timing"] = timings.header()
             return response
 
         else:
             raise HTTPException(
                 status_code=400, detail="Failed to exchange code for tokens.")
 
-    @app.get("/auth/login")
+    def session_index(encrypted_session: str) -> ScopeIndex:
+        """Index of the token entries of a freshly written session, the shape cached tokens are returned in"""
+        return ScopeIndex((current_session.decode(encrypted_session) or {}).get("tokens", []))
+
+    async def read_outcome(state: str) -> Dict[str, Any] | None:
+        """Outcome of a state as recorded in the state store, None while it is pending"""
+        state_data = await run_blocking(executor, state_store("get"), state)
+        if not state_data:
+            return {"status": "unknown"}
+        if state_data.get("is_completed"):
+            return {"status": "completed"}
+        return None
+
+    def public_outcome(outcome: Dict[str, Any] | None) -> Dict[str, Any] | None:
+        """
+        Outcome without the user: the state travels in redirect URLs and browser history,
+        so knowing it must not reveal who logged in.
+        """
+        if outcome is None:
+            return None
+        return {key: outcome[key] for key in ("status", "error") if key in outcome}
+
+    @router.get("/auth/wait", dependencies=[Depends(admit)])
+    async def wait_for_state(request: Request, state: str, timeout: float = WAIT_TIMEOUT):
+        """
+        Waits for a login or link to complete, without polling from the client.
+        Answers as a long poll, or as server-sent events when the client accepts text/event-stream.
+        Only the status is returned, never the user.
+        """
+        timeout = min(max(timeout, 0.0), MAX_WAIT_TIMEOUT)
+        poll = functools.partial(read_outcome, state)
+        poll_interval = BaseState.waiter_poll_interval(auth_client.state_store)
+
+        async def wait(wait_timeout: float) -> Dict[str, Any] | None:
+            return public_outcome(
+                await waiters.wait(state, timeout=wait_timeout, poll=poll, poll_interval=poll_interval))
+
+        outcome = await wait(0)
+        if outcome is not None and outcome["status"] == "unknown":
+            raise HTTPException(status_code=404, detail="Unknown or expired state.")
+
+        if "text/event-stream" not in request.headers.get("accept", ""):
+            if outcome is None:
+                outcome = await wait(timeout)
+            return JSONResponse(content=outcome or {"status": "pending"})
+
+        async def events():
+            result = outcome
+            deadline = time.monotonic() + timeout
+            while result is None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    yield f"event: timeout\ndata: {json.dumps({'status': 'pending'})}\n\n"
+                    return
+                result = await wait(min(remaining, KEEPALIVE_INTERVAL))
+                if result is None:
+                    # Keeps proxies from closing an idle stream
+                    yield ": keep-alive\n\n"
+            yield f"event: {result['status']}\ndata: {json.dumps(result)}\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+    @router.get("/auth/login", dependencies=[Depends(admit)])
     async def manage_login(request: Request, response: Response,
                            return_to: str | None = None, audience: str | None = None, 
-                           scope: str | None = None, connection: str | None = None):
+                           scope: str | None = None, connection: str | None = None,
+                           session: Dict[str, Any] | None = Depends(current_session.optional)):
         """Handle login initiation."""
         # check cookie for existing session
-        auth_cookie = _reconstruct_cookie(request, cookie_prefix="__session_data")
-        # auth_cookie = request.cookies.get("__sessionData")
-        if auth_cookie:
-            decoded_data = jwt.decode(
-                auth_cookie, auth_client.secret_key, algorithms=["HS256"])
+        if session:
             # Session cookie exists, do something with it
             # ...
             return RedirectResponse(url="/auth/get_user", status_code=302)
@@ -96,8 +265,9 @@ def setup_routes(app: FastAPI, auth_client: Any) -> None:
             # No session cookie, redirect to Auth0
             _scope = scope or "openid profile email"
             _connection = connection or "Username-Password-Authentication"
+            set_attributes(audience=audience, connection=_connection, scope=_scope)
 
-            state = auth_client._generate_state(return_to=return_to)
+            state = await run_blocking(executor, auth_client._generate_state, return_to=return_to)
 
             if audience:
                 auth_url = auth_client.url_builder.get_authorize_url(
@@ -108,228 +278,197 @@ def setup_routes(app: FastAPI, auth_client: Any) -> None:
 
         return RedirectResponse(url=auth_url, status_code=302)
 
-    @app.get("/auth/get_user")
-    async def get_user(request: Request):
-        """Reads the session cookie and extracts user info."""
-        auth_cookie = _reconstruct_cookie(request, cookie_prefix="__session_data")
-        # auth_cookie = request.cookies.get("__sessionData")
-
-        if not auth_cookie:
-            raise HTTPException(
-                status_code=401, detail="No active session.")
-
-        try:
-            # Decode the JWT stored in the session cookie
-            decoded_data = jwt.decode(
-                auth_cookie, auth_client.secret_key, algorithms=["HS256"])
-
-            # Extract the user ID (sub) from the decoded JWT
-            user_id = decoded_data.get("user").get("sub")
-
-            if not user_id:
-                raise HTTPException(
-                    status_code=400, detail="Invalid session cookie: Missing 'sub' claim.")
-
-            return JSONResponse(content=auth_client.session_manager._get_user_response(decoded_data))
-
-        except jwt.ExpiredSignatureError:
-            raise HTTPException(
-                status_code=401, detail="Session cookie has expired.")
-        except jwt.InvalidTokenError:
-            raise HTTPException(
-                status_code=401, detail="Invalid session cookie.")
-
-    @app.get("/auth/logout")
-    async def manage_logout(request: Request, response: Response):
+    @router.get("/auth/get_user")
+    async def get_user(session: Dict[str, Any] = Depends(current_session.required)):
         """Reads the session cookie and extracts user info."""
-        auth_cookie = _reconstruct_cookie(request, cookie_prefix="__session_data")
-        # auth_cookie = request.cookies.get("__sessionData")
+        # Extract the user ID (sub) from the decoded session
+        user_id = (session.get("user") or {}).get("sub")
 
-        if not auth_cookie:
+        if not user_id:
             raise HTTPException(
-                status_code=401, detail="No active session.")
-
-        try:
-            # Decode the JWT stored in the session cookie
-            decoded_data = jwt.decode(
-                auth_cookie, auth_client.secret_key, algorithms=["HS256"])
-
-            # Extract the user ID (sub) from the decoded JWT
-            user_id = decoded_data.get('user').get('sub')
+                status_code=400, detail="Invalid session cookie: Missing 'sub' claim.")
 
-            if not user_id:
-                raise HTTPException(
-                    status_code=400, detail="Invalid session cookie: Missing 'sub' claim.")
+        return JSONResponse(content=auth_client.session_manager._get_user_response(session))
 
-            auth_client.get(url=f"https://{auth_client.domain}/v2/logout")
-            rt = decoded_data.get("refresh_token", None)
-            if rt:
-                rt_manager = RevokeToken(
-                    auth_client.domain, auth_client.client_id, auth_client.client_secret)
-                rt_manager.revoke_refresh_token(token=rt)
-
-            for cookie_name in request.cookies.keys():
-            # Delete all cookies, including split session cookies (e.g., __sessionData_0, __sessionData_1, etc.)
-                if cookie_name.startswith("__session_data") or True:  
-                    response.delete_cookie(key = cookie_name, path = "/auth")
-            
-            response.delete_cookie(key="__sessionData", path="/auth")
-            auth_client.session_manager._delete_stored_session(user_id)
-
-            # MODIFY RESPONSE to ensure it returns properly
-            response.body = b'{"message": "logout successful"}'
-            response.status_code = 200
-            response.media_type = "application/json"
-
-            return response
+    @router.get("/auth/logout")
+    async def manage_logout(request: Request, response: Response,
+                            session: Dict[str, Any] = Depends(current_session.required)):
+        """Logs the user out of Auth0, revokes the refresh token and clears the session."""
+        # Extract the user ID (sub) from the decoded session
+        user_id = (session.get("user") or {}).get("sub")
 
-        except jwt.ExpiredSignatureError:
+        if not user_id:
             raise HTTPException(
-                status_code=401, detail="Session cookie has expired.")
-        except jwt.InvalidTokenError:
-            raise HTTPException(
-                status_code=401, detail="Invalid session cookie.")
-
-    @app.get("/auth/get_token")
+                status_code=400, detail="Invalid session cookie: Missing 'sub' claim.")
+
+        call_policies = auth_client.call_policies
+        await call_policies.call_async("logout", lambda: auth_client.get(url=f"{auth_client.base_url}/v2/logout"))
+        rt = session.get("refresh_token", None)
+        if rt:
+            rt_manager = RevokeToken(
+                auth_client.domain, auth_client.client_id, auth_client.client_secret,
+                timeout=call_policies.timeout("revoke"), protocol=auth_client.protocol)
+            await call_policies.call_async("revoke", lambda: rt_manager.revoke_refresh_token(token=rt))
+
+        # Delete all session chunks (__session_data_0, __session_data_1, etc.)
+        current_session.invalidate(request)
+        session_cookies.clear(response, request)
+        response.delete_cookie(key="__sessionData", path="/auth")
+        await run_blocking(executor, auth_client.session_manager._delete_stored_session, user_id)
+
+        # MODIFY RESPONSE to ensure it returns properly
+        response.body = b'{"message": "logout successful"}'
+        response.status_code = 200
+        response.media_type = "application/json"
+
+        return response
+
+    @router.get("/auth/get_token")
     async def get_token(request: Request, audience: str | None = None,
-     scope: str | None = None, connection: str | None = None):
-        """Reads the session cookie and extracts user info."""
-        auth_cookie = _reconstruct_cookie(request, cookie_prefix="__session_data")
-        # auth_cookie = request.cookies.get("__sessionData")
-
-        if not auth_cookie:
-            raise HTTPException(
-                status_code=401, detail="No active session.")
-
+                        scope: str | None = None, connection: str | None = None,
+                        session: Dict[str, Any] = Depends(current_session.required)):
+        """Returns a token for the audience covering the scopes, refreshing it when expired."""
         if not audience or connection:
             raise HTTPException(
                 status_code=401, detail="Missing audience or connection.")
 
-        # TODO build the fact scenario where a token is required for a connection
-        if connection:
+        set_attributes(audience=audience, scope=scope)
+        # Check for an existing token for the audience whose scopes cover the request
+        sub = session.get("user").get("sub")
+        token_manager = auth_client.token_manager
+        scope_index = ScopeIndex(session.get("tokens", []))
+
+        token = scope_index.find(audience, scope, is_valid=token_manager.validate_tokens)
+        set_attributes(**{"cache.session_tokens": "hit" if token else "miss"})
+        if token:
             return JSONResponse(content=token)
 
+        expired = scope_index.find(audience, scope)
+        if expired:
+            # Token is expired, use the refresh token already in the session
+            rt = session.get("refresh_token")
+            # Try to get a new token using the refresh token
+            if rt:
+                # Refreshed with all of the expired token's scopes: the session keeps one token
+                # per audience, and a narrower one would send the next full-scope request to /authorize
+                token_data = await token_manager.refresh_tokens_async(
+                    refresh_token = rt, scope = expired.get("scope"), user_id = sub, audience = audience)
+
+                if not token_data:
+                    raise HTTPException(status_code=401, detail="Failed to get a new token with refresh token.")
+
+                cookie_session_data = await auth_client.session_manager.set_encrypted_session(token_data, user_id = sub)
+                # Only the session's token entry goes to the client, never the refresh or ID token
+                token = session_index(cookie_session_data).find(audience, scope)
+                if token:
+                    response = JSONResponse(content=token)
+                else:
+                    # Granted fewer scopes than requested, get the rest using /authorize endpoint
+                    try:
+                        token_url = await run_blocking(
+                            executor, token_manager.get_new_token_url, audience=audience, scope=scope, return_to=str(request.url))
+                    except Exception as e:
+                        raise HTTPException(status_code=401, detail="Refreshed token does not cover the requested scopes.")
+                    response = RedirectResponse(url=token_url, status_code=302)
+                session_cookies.write(response, cookie_session_data, request)
+                return response
+            else:
+                # Token is expired and no refesh token, get new token using /authorize endpoint
+                try:
+                    token_url = await run_blocking(
+                        executor, token_manager.get_new_token_url, audience=audience, scope=scope, return_to=str(request.url))
+                    return RedirectResponse(url=token_url, status_code=302)
+                except Exception as e:
+                    raise HTTPException(status_code=401, detail="Valid audience but failed to get new token.")
+
+        # No tokens found, get new token using /authorize endpoint
         try:
-            # Decode the stored session in the session cookie
-            decoded_data = jwt.decode(
-                auth_cookie, auth_client.secret_key, algorithms=["HS256"])
-
-            # Check for existing token via audience
-            token = {}
-            sub = decoded_data.get("user").get("sub")
-
-            if audience and "tokens" in decoded_data:
-                # Verify existing token audience
-                for token in decoded_data.get("tokens"):
-                    
-                    aud = token.get("aud")
-                    # Check if audience is a list, possible if an AT is issued with openid and profile scopes
-                    if isinstance(aud, list):  
-                        aud = aud[0]
-          
-                    if aud == audience: 
-                        if auth_client.token_manager._match_scopes(token.get("scope"),scope):
-                            # found a match for audience and scope. checking if the token is not expired
-                            if token.get("expires_at").get("epoch") > time.time():
-                                return JSONResponse(content=token)
-                            else:
-                                # Token is expired, check if we have a refresh token
-                                rt = auth_client.token_manager.get_refresh_token(user_id = sub)
-                                # Try to get a new token using the refresh token
-                                if rt:
-                                    token =  auth_client.token_manager.refresh_tokens(refresh_token = rt, scope = scope)
-
-                                    if token:
-                                        cookie_session_data = await auth_client.session_manager.set_encrypted_session(token, user_id = sub)
-
-                                        _set_cookie = await _split_cookie(response, max_size=4096, encoded_data=cookie_session_data, cookie_prefix="__session_data")
-
-                                        # for some reason, setting the cookie in an outside function does not work!
-                                        for key, value in _set_cookie.items():
-                                            response.set_cookie(
-                                            key=key,
-                                            value=value,
-                                            path="/auth",
-                                            httponly=True,  # Prevent JavaScript access
-                                            # secure=True,  # Send only over HTTPS
-                                            samesite="Lax",  # Protect against CSRF
-                                            )
-            
-                                        response.body = token
-                                        response.status_code = 200
-
-                                        return response
-                                    else:
-                                        raise HTTPException(status_code=401, detail="Failed to get a new token with refresh token.")
-                                else:
-                                    # Token is expired and no refesh token, get new token using /authorize endpoint
-                                    try:
-                                        token_url = auth_client.token_manager.get_new_token_url(audience = audience, scope = scope,  return_to = request.url)
-                                        return RedirectResponse(url=token_url, status_code=302)
-                                    except Exception as e:
-                                        raise HTTPException(status_code=401, detail="Valid audience but failed to get new token.")
-                        else:
-                            # Token scope does not match, get new token using /authorize endpoint
-                            try:
-                                token_url = auth_client.token_manager.get_new_token_url(audience = audience, scope = scope,  return_to = request.url)
-                                return RedirectResponse(url=token_url, status_code=302)
-                            except Exception as e:
-                                raise HTTPException(status_code=401, detail="Failed to get new token with different scopes.")
-                if not token:
-                    raise HTTPException(
-                        status_code=401, detail="Failed to get an updated token for the audience.")
-
-            # No tokens found, get new token using /authorize endpoint    
-            try:
-                token_url = auth_client.token_manager.get_new_token_url(audience = audience, scope = scope,  return_to = request.url)
-                return RedirectResponse(url=token_url, status_code=302)
-                
-            except Exception as e:
-                raise HTTPException(status_code=401, detail="Failed to get new token with different scopes.")
-            
-        except jwt.ExpiredSignatureError:
+            token_url = await run_blocking(
+                executor, token_manager.get_new_token_url, audience=audience, scope=scope, return_to=str(request.url))
+            return RedirectResponse(url=token_url, status_code=302)
+        except Exception as e:
+            raise HTTPException(status_code=401, detail="Failed to get new token with different scopes.")
+
+    @router.post("/auth/get_tokens")
+    async def get_tokens(request: Request, token_requests: List[TokenRequest] = Body(...),
+                         session: Dict[str, Any] = Depends(current_session.required)):
+        """
+        Returns tokens for several audiences in one call. Cached tokens are served as is,
+        expired ones are refreshed concurrently and the session is written back once. All refreshes
+        use the session's refresh token, relying on Auth0's reuse interval when it is rotated.
+        Audiences without a usable token get an authorize_url to obtain one.
+        """
+        if not token_requests or len(token_requests) > MAX_BATCH_TOKENS:
             raise HTTPException(
-                status_code=401, detail="Session cookie has expired.")
-        except jwt.InvalidTokenError:
-            raise HTTPException(
-                status_code=401, detail="Invalid session cookie.")
-
-        # if we are here, there is some error
-        raise HTTPException(
-            status_code=401, detail="Generic token error.")
-
-
-    async def _split_cookie(response: Response, encoded_data: str,  max_size=4096, cookie_prefix="__session_data") -> dict[str, str]:
-        
-        # Calculate chunk size, ensuring space for the key name and additional characters
-        chunk_size = max_size - len(cookie_prefix) - 10  
-        cookies = {}
-
-        # Split data into chunks and store in the response cookies
-        for i in range(0, len(encoded_data), chunk_size):
-            chunk_name = f"{cookie_prefix}_{i // chunk_size}"
-            chunk_value = encoded_data[i:i + chunk_size]
-            cookies[chunk_name] = chunk_value
-            response.set_cookie(key=chunk_name, value=chunk_value, path="/auth", httponly=True, samesite="Lax")
-
-        return cookies  # Returning for debugging/logging if needed
-        
-    def _reconstruct_cookie(request: Request, cookie_prefix="__session_data"):
-        session_parts = []
-
-        # Extract all cookies that match cookie_prefix
-        for key, value in request.cookies.items():
-            if key.startswith(cookie_prefix):
-                index = int(key.split("_")[-1])  # Extract the index from the cookie name
-                session_parts.append((index, value))
-
-        if not session_parts:
-            # No cookie found, return empty string
-            return ""
-            # raise HTTPException(status_code=400, detail="Session data not found in cookies")
-
-        # Sort by index and reconstruct the full session string
-        session_parts.sort()  # Sort by index
-        full_encoded_data = "".join(part[1] for part in session_parts)  # Concatenate in order
-
-        return full_encoded_data
\ No newline at end of file
+                status_code=400, detail=f"Request between 1 and {MAX_BATCH_TOKENS} tokens.")
+
+        sub = session.get("user").get("sub")
+        rt = session.get("refresh_token")
+        token_manager = auth_client.token_manager
+        scope_index = ScopeIndex(session.get("tokens", []))
+
+        results: List[Dict[str, Any]] = []
+        # Result indexes by (audience, scopes of the expired token), each refreshed once with all its scopes
+        to_refresh: Dict[tuple, List[int]] = {}
+        for token_request in token_requests:
+            audience, scope = token_request.audience, token_request.scope
+            result: Dict[str, Any] = {"audience": audience, "scope": scope}
+            token = scope_index.find(audience, scope, is_valid=token_manager.validate_tokens)
+            expired = None if token else scope_index.find(audience, scope)
+            if token:
+                result["token"] = token
+            elif rt and expired:
+                # Expired, refreshed below together with the others
+                to_refresh.setdefault((audience, expired.get("scope")), []).append(len(results))
+            else:
+                result["error"] = "login_required"
+                # No return_to: this POST-only endpoint can't be the target of the callback's redirect
+                result["authorize_url"] = await run_blocking(
+                    executor, token_manager.get_new_token_url, audience=audience, scope=scope)
+            results.append(result)
+
+        set_attributes(batch_size=len(token_requests), refresh_count=len(to_refresh),
+                       cache_hits=sum(1 for result in results if "token" in result))
+        refreshes = await asyncio.gather(*[
+            token_manager.refresh_tokens_async(
+                refresh_token=rt, scope=refresh_scope, user_id=sub, audience=audience)
+            for audience, refresh_scope in to_refresh
+        ], return_exceptions=True)
+        token_data_list = []
+        refreshed: List[int] = []
+        for indexes, token_data in zip(to_refresh.values(), refreshes):
+            if not token_data or isinstance(token_data, Exception):
+                for i in indexes:
+                    results[i]["error"] = "refresh_failed"
+                continue
+            token_data_list.append(token_data)
+            refreshed.extend(indexes)
+
+        cookie_session_data = None
+        if token_data_list:
+            cookie_session_data = await auth_client.session_manager.set_encrypted_session_tokens(sub, token_data_list)
+            # Only the session's token entries go to the client, never the refresh or ID token
+            scope_index = session_index(cookie_session_data)
+            for i in refreshed:
+                audience, scope = results[i]["audience"], results[i]["scope"]
+                token = scope_index.find(audience, scope)
+                if token:
+                    results[i]["token"] = token
+                else:
+                    # Granted fewer scopes than requested, the rest needs a login
+                    results[i]["error"] = "login_required"
+                    results[i]["authorize_url"] = await run_blocking(
+                        executor, token_manager.get_new_token_url, audience=audience, scope=scope)
+
+        response = JSONResponse(content={"tokens": results})
+        if cookie_session_data:
+            session_cookies.write(response, cookie_session_data, request)
+        return response
+
+    if expose_metrics:
+        @router.get("/auth/metrics")
+        async def metrics():
+            """Latency histograms and counters in Prometheus text format."""
+            return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+    return router
@@ -0,0 +1,119 @@
+from __future__ import annotations
+import hashlib
+import time
+from typing import Any, Dict
+
+import jwt
+from fastapi import HTTPException, Request
+
+from .cookie_codec import SessionCookieCodec
+from auth0_ai.token_module.cache import TTLCache
+
+# Attribute of request.state holding the session decoded for the current request
+_REQUEST_STATE_KEY = "auth0_ai_session"
+_MISSING = object()
+
+
+class SessionDependency:
+    """
+    FastAPI dependency providing the decoded session cookie.
+    The cookie is reassembled and its signature checked once per request; decoded
+    sessions are also kept in a short-lived process cache keyed by the cookie's
+    digest, so repeated requests with the same cookie skip the HMAC and JSON work.
+    The returned session is shared and must not be modified.
+    Use the optional or required method with Depends.
+
+    Usage:
+        @app.get("/me")
+        async def me(session: dict = Depends(auth_client.current_session.required)):
+            return session["user"]
+    """
+    # Seconds a decoded session is served from the process cache
+    CACHE_TTL = 30
+
+    def __init__(
+        self,
+        auth_client: Any,
+        cookies: SessionCookieCodec | None = None,
+        cache_ttl: float = CACHE_TTL,
+        cache_size: int = 4096
+    ):
+        """
+        Initialize the dependency.
+        Args:
+            auth_client: Parent AIAuth instance
+            cookies: Codec of the session cookies
+            cache_ttl: Seconds a decoded session is cached (0 disables the process cache)
+            cache_size: Maximum number of cached sessions
+        """
+        self.auth_client = auth_client
+        self.cookies = cookies or SessionCookieCodec()
+        self.cache_ttl = cache_ttl
+        self._cache = TTLCache(maxsize=cache_size, ttl=cache_ttl, name="session")
+
+    async def optional(self, request: Request) -> Dict[str, Any] | None:
+        """Get the session, or None when the request has no session cookie"""
+        return self.get(request)
+
+    async def required(self, request: Request) -> Dict[str, Any]:
+        """Get the session, rejecting requests without one with 401"""
+        session = self.get(request)
+        if session is None:
+            raise HTTPException(status_code=401, detail="No active session.")
+        return session
+
+    def get(self, request: Request) -> Dict[str, Any] | None:
+        """
+        Decode the request's session cookie, once per request.
+        Args:
+            request: Current request
+        Returns:
+            The decoded session, or None without a session cookie
+        Raises:
+            HTTPException: 401 if the cookie is invalid or expired
+        """
+        session = getattr(request.state, _REQUEST_STATE_KEY, _MISSING)
+        if session is _MISSING:
+            session = self.decode(self.cookies.read(request))
+            setattr(request.state, _REQUEST_STATE_KEY, session)
+        return session
+
+    def invalidate(self, request: Request) -> None:
+        """Drop the request's session from the caches, e.g. on logout"""
+        encoded = self.cookies.read(request)
+        if encoded:
+            self._cache.invalidate(self._key(encoded))
+        setattr(request.state, _REQUEST_STATE_KEY, None)
+
+    def decode(self, encoded: str | None) -> Dict[str, Any] | None:
+        """
+        Decode an encoded session, e.g. one just written by the session manager.
+        Args:
+            encoded: Encoded session as stored in the cookie
+        Returns:
+            The decoded session, or None if encoded is empty
+        Raises:
+            HTTPException: 401 if the session is invalid or expired
+        """
+        if not encoded:
+            return None
+        key = self._key(encoded)
+        session = self._cache.get(key)
+        if session is not None:
+            return session
+        try:
+            session = jwt.decode(encoded, self.auth_client.secret_key, algorithms=["HS256"])
+        except jwt.ExpiredSignatureError:
+            raise HTTPException(status_code=401, detail="Session cookie has expired.")
+        except jwt.InvalidTokenError:
+            raise HTTPException(status_code=401, detail="Invalid session cookie.")
+        if self.cache_ttl:
+            # Never cache past the session's own expiry
+            expires_at = time.time() + self.cache_ttl
+            if isinstance(session.get("exp"), (int, float)):
+                expires_at = min(expires_at, session["exp"])
+            self._cache.set(key, session, expires_at=expires_at)
+        return session
+
+    def _key(self, encoded: str) -> str:
+        return hashlib.sha256(encoded.encode()).hexdigest()
@@ -1,10 +1,26 @@
 from __future__ import annotations
-from typing import Any, Dict, Optional
+import asyncio
+import base64
+import functools
+import hashlib
+import json
+import threading
+from concurrent.futures import Executor
+from typing import Any, Callable, Dict, List, Optional, Tuple
 import jwt
 import time
+from cryptography.fernet import Fernet, InvalidToken
 
 from .storage.base_store import BaseStore
 from .storage.local_store import LocalStore
+from auth0_ai.utils.metrics import observe_store
+from auth0_ai.utils.offload import run_blocking
+from auth0_ai.utils.timing import StageTimings
+from auth0_ai.utils.tracing import set_attributes, traced
+
+
+# Marks an access token that has not been verified yet
+_UNVERIFIED = object()
 
 
 class SessionManager:
@@ -21,7 +37,8 @@ class SessionManager:
         get_ext_session=None,
         set_ext_session=None,
         delete_ext_session=None,
-        store: Optional[BaseStore] = None
+        store: Optional[BaseStore] = None,
+        executor: Optional[Executor] = None
     ):
         """
         Initialize session manager with original parameters plus optional store.
@@ -34,10 +51,18 @@ class SessionManager:
             set_ext_session: Optional custom set_session function
             delete_ext_session: Optional custom delete_session function
             store: Optional custom store implementation
+            executor: Optional bounded executor async methods run store I/O on
         """
         self.auth_client = auth_client
         self.store = store or LocalStore(use_local_cache=use_local_cache)
         self.secret_key = auth_client.secret_key
+        self.executor = executor
+        # Connection tokens are third-party credentials, encrypted rather than only signed in the session
+        self._connection_cipher = Fernet(base64.urlsafe_b64encode(
+            hashlib.sha256(b"auth0_ai.connection_tokens:" + str(self.secret_key).encode()).digest()))
+        # Bumped on every write of a user's session; writes built from an older version are rebuilt
+        self._session_versions: Dict[str, int] = {}
+        self._write_lock = threading.Lock()
 
         # Custom function handlers
         self.get_ext_sessions = get_ext_sessions
@@ -48,88 +73,331 @@ class SessionManager:
     # Original interface methods with exact same names and signatures
     def _get_stored_sessions(self) -> Any:
         """Get all stored session IDs"""
-        if hasattr(self, 'get_ext_sessions') and self.get_ext_sessions:
-            return self.get_ext_sessions()
-        return self.store.get_stored_sessions()
+        with observe_store("session", "list"):
+            if hasattr(self, 'get_ext_sessions') and self.get_ext_sessions:
+                return self.get_ext_sessions()
+            return self.store.get_stored_sessions()
 
     def _get_stored_session(self, user_id: str) -> str:
         """Get a specific stored session"""
-        if hasattr(self, 'get_ext_session') and self.get_ext_session:
-            return self.get_ext_session()
-        return self.store.get_stored_session(user_id)
+        with observe_store("session", "get"):
+            if hasattr(self, 'get_ext_session') and self.get_ext_session:
+                return self.get_ext_session()
+            return self.store.get_stored_session(user_id)
 
     def _set_stored_session(self, user_id: str, encrypted_session_data: str) -> None:
         """Store a session"""
+        with observe_store("session", "set"):
+            if hasattr(self, 'set_ext_session') and self.set_ext_session:
+                self.set_ext_session()
+            else:
+                self.store.set_stored_session(user_id, encrypted_session_data)
+        self._on_session_changed(user_id)
+
+    def _get_many_stored_sessions(self, user_ids: List[str]) -> Dict[str, str | None]:
+        """Get the stored sessions of many users"""
+        if hasattr(self, 'get_ext_session') and self.get_ext_session:
+            return {user_id: self._get_stored_session(user_id) for user_id in user_ids}
+        with observe_store("session", "get_many"):
+            return self.store.get_many_stored_sessions(user_ids)
+
+    def _set_many_stored_sessions(self, encrypted_sessions: Dict[str, str]) -> None:
+        """Store the sessions of many users"""
         if hasattr(self, 'set_ext_session') and self.set_ext_session:
-            self.set_ext_session()
-        else:
-            self.store.set_stored_session(user_id, encrypted_session_data)
+            for user_id, encrypted_session_data in encrypted_sessions.items():
+                self._set_stored_session(user_id, encrypted_session_data)
+            return
+        with observe_store("session", "set_many"):
+            self.store.set_many_stored_sessions(encrypted_sessions)
+        for user_id in encrypted_sessions:
+            self._on_session_changed(user_id)
 
     def _delete_stored_session(self, user_id: str) -> None:
         """Delete a stored session"""
-        if hasattr(self, 'delete_ext_session') and self.delete_ext_session:
-            self.delete_ext_session()
-        else:
-            self.store.delete_stored_session(user_id)
+        with observe_store("session", "delete"):
+            if hasattr(self, 'delete_ext_session') and self.delete_ext_session:
+                self.delete_ext_session()
+            else:
+                self.store.delete_stored_session(user_id)
+        self._on_session_changed(user_id)
+
+    def _on_session_changed(self, user_id: str) -> None:
+        """Drop data cached from the previous version of a user's session"""
+        self._session_versions[user_id] = self._session_versions.get(user_id, 0) + 1
+        token_manager = getattr(self.auth_client, "token_manager", None)
+        if token_manager is not None:
+            token_manager.invalidate_userinfo(user_id)
+
+    def _session_version(self, user_id: str) -> int:
+        """Version of a user's session, taken before reading it for a later _write_session"""
+        return self._session_versions.get(user_id, 0)
+
+    def _write_session(
+        self,
+        user_id: str,
+        rebuild: Callable[[dict | None], dict | None],
+        version: int | None = None,
+        encrypted_session_data: str | None = None
+    ) -> str | None:
+        """
+        Write a user's session without losing a concurrent write in this process.
+        Args:
+            user_id: User whose session is written
+            rebuild: Builds the new session from the current one (None to write nothing)
+            version: Session version encrypted_session_data was built from
+            encrypted_session_data: Session to write if no other write came in since version
+        Returns:
+            The encrypted session written, or None
+        """
+        return self._write_sessions({user_id: (rebuild, version, encrypted_session_data)}).get(user_id)
+
+    def _write_sessions(self, writes: Dict[str, tuple]) -> Dict[str, str]:
+        """
+        Write many sessions in one bulk store write, as _write_session does for one.
+        Sessions written by someone else since they were read are re-read and rebuilt.
+        Args:
+            writes: (rebuild, version, encrypted_session_data) keyed by user ID
+        Returns:
+            The encrypted sessions written, keyed by user ID
+        """
+        with self._write_lock:
+            encrypted_sessions = {}
+            stale = [user_id for user_id, (_, version, encrypted_session_data) in writes.items()
+                     if encrypted_session_data is None or version != self._session_version(user_id)]
+            current = self._get_many_stored_sessions(stale) if stale else {}
+            for user_id, (rebuild, _, encrypted_session_data) in writes.items():
+                if user_id in current:
+                    session_data = rebuild(self._decode_session(current[user_id], check_expiry=False))
+                    if session_data is None:
+                        continue
+                    encrypted_session_data = jwt.encode(session_data, self.secret_key, algorithm="HS256")
+                encrypted_sessions[user_id] = encrypted_session_data
+            if len(encrypted_sessions) == 1:
+                [(user_id, encrypted_session_data)] = encrypted_sessions.items()
+                self._set_stored_session(user_id, encrypted_session_data)
+            elif encrypted_sessions:
+                self._set_many_stored_sessions(encrypted_sessions)
+            return encrypted_sessions
 
     # Session encryption and management methods (from original auth_client.py)
-    async def set_encrypted_session(self, token_data: dict, state: str | None = None, user_id : str | None = None) -> str:
-        """Create or update encrypted session"""
+    @traced("auth0_ai.session.set")
+    async def set_encrypted_session(
+        self,
+        token_data: dict,
+        state: str | None = None,
+        user_id : str | None = None,
+        timings: StageTimings | None = None
+    ) -> str:
+        """
+        Create or update encrypted session.
+        The ID token verification, the access token verification and the read of the
+        existing session run concurrently. The session is prefetched for the ID token's
+        unverified sub and read again only if the verified user turns out different.
+        Args:
+            token_data: Raw token data from Auth0
+            state: Optional login or linking state
+            user_id: Optional user ID, taken from the ID token or state otherwise
+            timings: Optional collector for per-stage durations
+        Returns:
+            Encrypted session data
+        """
+        timings = timings or StageTimings()
+        # Read once: SQLite and Redis state stores block on disk or network I/O
+        state_data = await run_blocking(self.executor, self._get_state_data, state) if state else {}
+        state_user_id = state_data.get("user_id")
+        prefetch_user_id = user_id or self._unverified_sub(token_data) or state_user_id
+        version = self._session_version(prefetch_user_id)
+
+        decoded_id_token, decoded_access_token, stored_session = await asyncio.gather(
+            timings.measure("verify_id_token", self._verify_id_token(token_data)),
+            timings.measure("verify_access_token", self.auth_client.token_manager.verify_token(
+                token_data.get("access_token", {}))),
+            timings.measure("session_read", run_blocking(
+                self.executor, self._get_stored_session, prefetch_user_id)),
+        )
+        # use user_id if already provided, otherwise get user_id from id_token,
+        # otherwise from state (linking/unlinking) scenario
+        user_id = user_id or decoded_id_token.get("sub") or state_user_id
+        if user_id != prefetch_user_id:
+            version = self._session_version(user_id)
+            stored_session = await timings.measure("session_read", run_blocking(
+                self.executor, self._get_stored_session, user_id))
+
+        existing_session = self._decode_session(stored_session, check_expiry=False)
+        encrypted_session_data = await self._build_encrypted_session(
+            token_data, decoded_id_token, existing_session, state_data, decoded_access_token=decoded_access_token)
+        encrypted_session_data = await timings.measure("session_write", run_blocking(
+            self.executor, self._write_session, user_id,
+            lambda session: self._merge_session(token_data, decoded_id_token, session, state_data, decoded_access_token),
+            version, encrypted_session_data))
+
+        if state:
+            await run_blocking(self.executor, self._update_state, state, user_id=user_id)
+
+        return encrypted_session_data
+
+    def _get_state_data(self, state: str) -> Dict[str, Any]:
+        """Get a login or linking state's data, empty if it does not exist"""
+        with observe_store("state", "get"):
+            return self.auth_client.state_store.get(state) or {}
+
+    def _update_state(self, state: str, **fields: Any) -> None:
+        """Merge fields into a login or linking state"""
+        with observe_store("state", "update"):
+            self.auth_client.state_store.update_state(state, **fields)
+
+    @traced("auth0_ai.session.set_many")
+    async def set_encrypted_sessions(
+        self,
+        token_data_by_user: Dict[str, dict],
+        existing_sessions: Dict[str, str | None] | None = None,
+        versions: Dict[str, int] | None = None
+    ) -> Tuple[Dict[str, str], Dict[str, str]]:
+        """
+        Create or update the sessions of many users with a single bulk store read and write.
+        Every user's tokens are verified concurrently; users whose ID token fails verification
+        are left out and reported, the sessions of the others are still written.
+        Args:
+            token_data_by_user: Raw token data from Auth0 keyed by user ID
+            existing_sessions: Stored sessions already read by the caller, read here if omitted
+            versions: Session versions taken before existing_sessions was read
+        Returns:
+            Encrypted session data keyed by user ID, and errors keyed by the IDs of the users left out
+        """
+        set_attributes(batch_size=len(token_data_by_user))
+        if existing_sessions is None:
+            versions = {user_id: self._session_version(user_id) for user_id in token_data_by_user}
+            existing_sessions = await run_blocking(
+                self.executor, self._get_many_stored_sessions, list(token_data_by_user))
+        versions = versions or {}
+        token_manager = self.auth_client.token_manager
+        verified = await asyncio.gather(*(
+            asyncio.gather(self._verify_id_token(token_data),
+                           token_manager.verify_token(token_data.get("access_token", {})),
+                           return_exceptions=True)
+            for token_data in token_data_by_user.values()
+        ))
+        writes, errors = {}, {}
+        for (user_id, token_data), (decoded_id_token, decoded_access_token) in zip(
+                token_data_by_user.items(), verified):
+            if isinstance(decoded_id_token, Exception):
+                errors[user_id] = str(decoded_id_token)
+                continue
+            if isinstance(decoded_access_token, Exception):
+                decoded_access_token = None
+            merge = functools.partial(
+                self._merge_session, token_data, decoded_id_token, decoded_access_token=decoded_access_token)
+            existing_session = self._decode_session(existing_sessions.get(user_id), check_expiry=False)
+            writes[user_id] = (
+                merge, versions.get(user_id),
+                jwt.encode(merge(existing_session), self.secret_key, algorithm="HS256"))
+        encrypted_sessions = await run_blocking(self.executor, self._write_sessions, writes) if writes else {}
+        return encrypted_sessions, errors
+
+    async def _verify_id_token(self, token_data: dict) -> dict:
+        """Verify the ID token in token_data, if any, and return its claims"""
         id_token = token_data.get("id_token", "")
-        decoded_id_token = {}
-        # use user_id is already provided
-        if user_id:
-            user_id = user_id
-        #check if id_token is provided, get user_id from id_token
-        elif id_token:
-            try:
-                decoded_id_token = await self.auth_client.token_verifier.verify_signature(id_token)
-                user_id = decoded_id_token.get("sub")
-                if not user_id:
-                    raise ValueError("ID token missing 'sub' claim.")
-            except Exception as e:
-                raise ValueError(f"Invalid ID token: {str(e)}")
-        # use user_id from state (linking/unlinking) scenario
-        else:
-            user_id = self.auth_client.state_store[state].get(
-                "user_id") if state else None
-
-        existing_encrypted_session = self._get_stored_session(user_id)
-        existing_user_details = {}
-        existing_id_token_details = {}
-        existing_linked_connections = {}
-        existing_token_set = {}
-        existing_refresh_token = {}
-
-        if existing_encrypted_session:
-            # found existing session, check if there is a refresh token to keep
-            existing_session = self.get_encrypted_session(user_id)
-
-            existing_user_details = existing_session.get("user")
-            existing_id_token_details = existing_session.get("id_token")
-            existing_token_set = existing_session.get("tokens", [])
-            existing_refresh_token = existing_session.get(
-                "refresh_token", None)
-            existing_linked_connections = existing_session.get(
-                "linked_connections")
-
-        session_data = {}
-        session_data = {
-            "user": self._get_user(decoded_id_token, existing_user_details),
-            "id_token": self._get_id_token(id_token, decoded_id_token, existing_id_token_details),
-            "refresh_token": self._get_refresh_token(token_data, existing_refresh_token),
-            "tokens": await self._get_token_set(token_data, existing_token_set),
-            "linked_connections": self._get_linked_details(state, existing_linked_connections)
-        }
+        if not id_token:
+            return {}
+        try:
+            decoded_id_token = await self.auth_client.token_manager.verify_claims(id_token)
+            if not decoded_id_token.get("sub"):
+                raise ValueError("ID token missing 'sub' claim.")
+            return decoded_id_token
+        except Exception as e:
+            raise ValueError(f"Invalid ID token: {str(e)}")
+
+    def _unverified_sub(self, token_data: dict) -> str | None:
+        """Read the ID token's sub without verification, only to start fetching the session early"""
+        try:
+            return jwt.decode(token_data.get("id_token") or "", options={"verify_signature": False}).get("sub")
+        except jwt.InvalidTokenError:
+            return None
+
+    @traced("auth0_ai.session.set_tokens")
+    async def set_encrypted_session_tokens(self, user_id: str, token_data_list: List[dict]) -> str:
+        """
+        Merge several token responses (e.g. refreshes for different audiences) into a
+        user's session with a single store read and write.
+        Args:
+            user_id: User whose session is updated
+            token_data_list: Raw token data from Auth0
+        Returns:
+            Encrypted session data
+        """
+        set_attributes(batch_size=len(token_data_list))
+        token_manager = self.auth_client.token_manager
+        version = self._session_version(user_id)
+        stored_session, verified = await asyncio.gather(
+            run_blocking(self.executor, self._get_stored_session, user_id),
+            asyncio.gather(*(
+                asyncio.gather(self._verify_id_token(token_data),
+                               token_manager.verify_token(token_data.get("access_token", {})))
+                for token_data in token_data_list
+            )),
+        )
+        def merge(session_data: dict | None) -> dict:
+            for token_data, (decoded_id_token, decoded_access_token) in zip(token_data_list, verified):
+                session_data = self._merge_session(
+                    token_data, decoded_id_token, session_data, decoded_access_token=decoded_access_token)
+            return session_data
 
         encrypted_session_data = jwt.encode(
-            session_data, self.secret_key, algorithm="HS256")
-        self._set_stored_session(user_id, encrypted_session_data)
+            merge(self._decode_session(stored_session, check_expiry=False)), self.secret_key, algorithm="HS256")
+        return await run_blocking(
+            self.executor, self._write_session, user_id, merge, version, encrypted_session_data)
 
-        if state:
-            self.auth_client.state_store[state]["user_id"] = user_id
+    async def _build_encrypted_session(
+        self,
+        token_data: dict,
+        decoded_id_token: dict,
+        existing_session: dict | None = None,
+        state_data: dict | None = None,
+        decoded_access_token: Any = _UNVERIFIED
+    ) -> str:
+        """Merge new token data into the existing session and encode it"""
+        if decoded_access_token is _UNVERIFIED:
+            decoded_access_token = await self.auth_client.token_manager.verify_token(
+                token_data.get("access_token", {}))
+        session_data = self._merge_session(
+            token_data, decoded_id_token, existing_session, state_data, decoded_access_token)
+        return jwt.encode(session_data, self.secret_key, algorithm="HS256")
+
+    def _merge_session(
+        self,
+        token_data: dict,
+        decoded_id_token: dict,
+        existing_session: dict | None = None,
+        state_data: dict | None = None,
+        decoded_access_token: dict | None = None
+    ) -> dict:
+        """Merge new token data, its verified claims and a linking state's operation into the existing session"""
+        existing_session = existing_session or {}
+        return {
+            "user": self._get_user(decoded_id_token, existing_session.get("user", {})),
+            "id_token": self._get_id_token(token_data.get("id_token", ""), decoded_id_token, existing_session.get("id_token", {})),
+            "refresh_token": self._get_refresh_token(token_data, existing_session.get("refresh_token")),
+            "tokens": self._build_token_set(token_data, decoded_access_token, existing_session.get("tokens", [])),
+            "linked_connections": self._get_linked_details(state_data, existing_session.get("linked_connections")),
+            "connection_tokens": self._encrypt_connection_tokens(self._get_connection_tokens(
+                state_data, self._decrypt_connection_tokens(existing_session.get("connection_tokens"))))
+        }
 
-        return encrypted_session_data
+    def _decode_session(self, encrypted_session: str | None, check_expiry: bool = True) -> Dict[str, Any] | None:
+        """Decode stored session data, returning None if it is missing, invalid or (optionally) expired"""
+        if not encrypted_session:
+            return None
+        try:
+            decoded_data = jwt.decode(
+                encrypted_session, self.secret_key, algorithms=["HS256"])
+        except jwt.InvalidTokenError:
+            return None
+        if check_expiry:
+            token_expiry = decoded_data.get("id_token", {}).get(
+                "id_token_expiry") or 0
+            if token_expiry <= int(time.time()):
+                return None
+        return decoded_data
 
     def get_encrypted_session(self, user_id: str) -> Dict[str, Any]:
         """Retrieve and decrypt session data"""
@@ -155,13 +423,48 @@ class SessionManager:
         except jwt.InvalidTokenError:
             return {"Invalid session."}
 
-    def _update_encrypted_session(self, user_id: str, refresh_token: str) -> None:
+    async def _update_encrypted_session(self, user_id: str, refresh_token: str) -> None:
         """Update session with refreshed tokens"""
         token_manager = self.auth_client.token_manager
-        updated_tokens = token_manager.refresh_tokens(
-            refresh_token=refresh_token)
+        updated_tokens = await token_manager.refresh_tokens_async(
+            refresh_token=refresh_token, user_id=user_id)
         if updated_tokens:
-            self.set_encrypted_session(updated_tokens)
+            await self.set_encrypted_session(updated_tokens, user_id=user_id)
+
+    def get_connection_token(self, user_id: str, connection: str) -> Dict[str, Any] | None:
+        """Get a federated connection token persisted in the user's session"""
+        session = self.get_encrypted_session(user_id)
+        if not isinstance(session, dict):
+            return None
+        return self._decrypt_connection_tokens(session.get("connection_tokens")).get(connection)
+
+    def set_connection_token(self, user_id: str, connection: str, token: Dict[str, Any]) -> None:
+        """Persist a federated connection token in the user's session, encrypted"""
+        def add_token(session: dict | None) -> dict | None:
+            if not session:
+                return None
+            connection_tokens = self._decrypt_connection_tokens(session.get("connection_tokens"))
+            connection_tokens[connection] = token
+            return {**session, "connection_tokens": self._encrypt_connection_tokens(connection_tokens)}
+
+        self._write_session(user_id, add_token)
+
+    def _encrypt_connection_tokens(self, connection_tokens: dict) -> str | None:
+        """Encrypt connection tokens for the session payload, which is signed but readable"""
+        if not connection_tokens:
+            return None
+        return self._connection_cipher.encrypt(json.dumps(connection_tokens).encode()).decode()
+
+    def _decrypt_connection_tokens(self, encrypted: str | dict | None) -> dict:
+        """Decrypt the session's connection tokens (plain dicts of older sessions are accepted)"""
+        if isinstance(encrypted, dict):
+            return dict(encrypted)
+        if not encrypted:
+            return {}
+        try:
+            return json.loads(self._connection_cipher.decrypt(encrypted.encode()))
+        except (InvalidToken, ValueError):
+            return {}
 
     def get_session(self, user: Any) -> Dict[str, Any]:
         """Get session for user object"""
@@ -189,44 +492,54 @@ class SessionManager:
 
     async def _get_token_set(self, token_data: dict, existing_token_set: list[dict] | None = None) -> list[dict]:
         """Extracts the access token, scope, refresh token, and expiry time from the token_data."""
-
         decoded_at = await self.auth_client.token_manager.verify_token(token_data.get("access_token", {}))
-        decoded_at_aud = f"https://{self.auth_client.domain}/userinfo"
+        return self._build_token_set(token_data, decoded_at, existing_token_set)
+
+    def _build_token_set(self, token_data: dict, decoded_at: dict | None, existing_token_set: list[dict] | None = None) -> list[dict]:
+        """Builds the token set from token_data and the already verified access token claims."""
+        decoded_at_aud = f"{self.auth_client.base_url}/userinfo"
 
         if decoded_at and "aud" in decoded_at:
             decoded_at_aud = decoded_at.get("aud")
 
+        now = int(time.time())
         token_list = [{
             "aud": decoded_at_aud,
             "access_token": token_data.get("access_token"),
             "scope": token_data.get("scope"),
-            "expires_at": {"epoch": int(time.time()) + token_data["expires_in"]},
+            # Bounds the refresh window of short-lived tokens, see RefreshPolicy
+            "issued_at": {"epoch": now},
+            "expires_at": {"epoch": now + token_data["expires_in"]},
         }]
 
-        for token in existing_token_set:
+        for token in existing_token_set or []:
             if "aud" in token and token.get("aud") != decoded_at_aud:
                 token_list.append(token)
 
         return token_list
 
-    def _get_linked_details(self, state: str, existing_linked_connections: list[str] | None = None) -> list[str]:
+    def _get_linked_details(self, state_data: dict | None, existing_linked_connections: list[str] | None = None) -> list[str]:
 
         linked_connections = set(existing_linked_connections or [])
 
-        if "operation" in self.auth_client.state_store[state]:
-            operation = self.auth_client.state_store[state].get(
-                "operation").get("type")
-
-            if operation == "linking":
-                linked_connections.add(self.auth_client.state_store[state].get(
-                    "operation").get("connection"))
+        operation = (state_data or {}).get("operation")
+        if operation:
+            if operation.get("type") == "linking":
+                linked_connections.add(operation.get("connection"))
 
-            if operation == "unlinking":
-                linked_connections.remove(
-                    self.auth_client.state_store[state].get("operation").get("connection"))
+            if operation.get("type") == "unlinking":
+                linked_connections.remove(operation.get("connection"))
 
         return list(linked_connections)
 
+    def _get_connection_tokens(self, state_data: dict | None, existing_connection_tokens: dict | None = None) -> dict:
+        """Keeps persisted connection tokens, dropping the one for a connection being unlinked."""
+        connection_tokens = dict(existing_connection_tokens or {})
+        operation = (state_data or {}).get("operation")
+        if operation and operation.get("type") == "unlinking":
+            connection_tokens.pop(operation.get("connection"), None)
+        return connection_tokens
+
     def _get_user_response(self, decoded_data: dict) -> dict:
         """Extracts user info from decoded session data"""
         res = {}
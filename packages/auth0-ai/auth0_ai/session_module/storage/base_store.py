@@ -1,6 +1,6 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Dict, List
 
 class BaseStore(ABC):
     """
@@ -42,4 +42,25 @@ class BaseStore(ABC):
         Args:
             user_id: The ID of the user whose session to delete
         """
-        pass
\ No newline at end of file
+        pass
+
+    def get_many_stored_sessions(self, user_ids: List[str]) -> Dict[str, str | None]:
+        """
+        Get the stored sessions of many users.
+        Stores that support bulk reads should override this.
+        Args:
+            user_ids: The IDs of the users whose sessions to retrieve
+        Returns:
+            The session data (or None) keyed by user ID
+        """
+        return {user_id: self.get_stored_session(user_id) for user_id in user_ids}
+
+    def set_many_stored_sessions(self, encrypted_sessions: Dict[str, str]) -> None:
+        """
+        Store the sessions of many users.
+        Stores that support bulk writes should override this.
+        Args:
+            encrypted_sessions: The encrypted session data keyed by user ID
+        """
+        for user_id, encrypted_session_data in encrypted_sessions.items():
+            self.set_stored_session(user_id, encrypted_session_data)
@@ -1,7 +1,9 @@
 from __future__ import annotations
 import shelve
 import os
-from typing import List
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List
 
 from .base_store import BaseStore
 
@@ -9,7 +11,11 @@ class LocalStore(BaseStore):
     """
     Local storage implementation using Python's shelve module.
     This is the default storage mechanism, maintaining the original implementation's behavior.
+    Every open of the shelve file is serialized per path: shelve does not support
+    concurrent access, and store calls run on a pool of executor threads.
     """
+    _locks: Dict[str, threading.RLock] = {}
+    _locks_lock = threading.Lock()
     
     def __init__(self, file_path: str = ".sessions_cache", use_local_cache: bool = True):
         """
@@ -21,31 +27,53 @@ class LocalStore(BaseStore):
         """
         self.file_path = file_path
         self.use_local_cache = use_local_cache or os.environ.get("AUTH0_USE_LOCAL_CACHE", True)
+        with self._locks_lock:
+            self._lock = self._locks.setdefault(os.path.abspath(file_path), threading.RLock())
+
+    @contextmanager
+    def _open(self) -> Iterator[shelve.Shelf]:
+        """Open the shelve file while holding the lock of its path"""
+        with self._lock, shelve.open(self.file_path) as sessions:
+            yield sessions
 
     def get_stored_sessions(self) -> List[str]:
         """Get all stored session IDs"""
         if self.use_local_cache:
-            with shelve.open(self.file_path) as sessions:
+            with self._open() as sessions:
                 return list(sessions.keys())
         return []
 
     def get_stored_session(self, user_id: str) -> str | None:
         """Get a specific stored session"""
         if self.use_local_cache:
-            with shelve.open(self.file_path) as sessions:
+            with self._open() as sessions:
                 return sessions.get(user_id)
         return None
 
     def set_stored_session(self, user_id: str, encrypted_session_data: str) -> None:
         """Store a session"""
         if self.use_local_cache:
-            with shelve.open(self.file_path) as sessions:
+            with self._open() as sessions:
                 sessions[user_id] = encrypted_session_data
                 sessions.sync()
 
     def delete_stored_session(self, user_id: str) -> None:
         """Delete a stored session"""
         if self.use_local_cache:
-            with shelve.open(self.file_path) as sessions:
+            with self._open() as sessions:
                 if user_id in sessions:
                     del sessions[user_id]
+
+    def get_many_stored_sessions(self, user_ids: List[str]) -> Dict[str, str | None]:
+        """Get the stored sessions of many users with a single open of the shelve file"""
+        if self.use_local_cache:
+            with self._open() as sessions:
+                return {user_id: sessions.get(user_id) for user_id in user_ids}
+        return {user_id: None for user_id in user_ids}
+
+    def set_many_stored_sessions(self, encrypted_sessions: Dict[str, str]) -> None:
+        """Store the sessions of many users with a single open and sync of the shelve file"""
+        if self.use_local_cache:
+            with self._open() as sessions:
+                sessions.update(encrypted_sessions)
+                sessions.sync()
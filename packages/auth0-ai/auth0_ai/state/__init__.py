@@ -5,5 +5,10 @@ Internal module for handling authentication and linking state.
 from .base_state import BaseState
 from .login_state import LoginState
 from .link_state import LinkState
+from .storage import MemoryStateStore, RedisStateStore, SQLiteStateStore, StateStore
+from .waiters import StateWaiters
 
-__all__ = ["BaseState", "LoginState", "LinkState"]
\ No newline at end of file
+__all__ = [
+    "BaseState", "LoginState", "LinkState", "MemoryStateStore", "RedisStateStore", "SQLiteStateStore", "StateStore",
+    "StateWaiters",
+]
\ No newline at end of file
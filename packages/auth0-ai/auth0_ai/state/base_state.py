@@ -1,21 +1,40 @@
 from __future__ import annotations
 import asyncio
-from typing import Any, Dict
+import time
+from concurrent.futures import Executor
+from typing import Any, Optional
 from abc import ABC, abstractmethod
 
+from .storage.base_store import StateStore
+from .waiters import StateWaiters
+from auth0_ai.utils.offload import run_blocking
+
 class BaseState(ABC):
     """
     Base class for state management in authentication flows.
     """
-    def __init__(self, state_store: Dict[str, Dict[str, Any]], state: str):
+    # Seconds between state store checks when no waiters are attached
+    POLL_INTERVAL = 0.25
+
+    def __init__(
+        self,
+        state_store: StateStore,
+        state: str,
+        waiters: StateWaiters | None = None,
+        executor: Executor | None = None
+    ):
         """
         Initialize base state tracker.
         Args:
             state_store: Reference to the global state store
             state: Unique state identifier for this flow
+            waiters: Optional waiters woken by the callback, instead of polling the store
+            executor: Executor the store is read on while waiting (the loop's default executor if omitted)
         """
         self.state_store = state_store
         self.state = state
+        self.waiters = waiters
+        self.executor = executor
 
     @abstractmethod
     def is_completed(self) -> bool:
@@ -31,8 +50,50 @@ class BaseState(ABC):
         pass
     def terminate(self) -> None:
         """Clean up state data"""
-        if self.state in self.state_store:
-            del self.state_store[self.state]
+        self.state_store.delete_state(self.state)
     async def _sleep(self, seconds: float) -> None:
         """Async sleep helper"""
-        await asyncio.sleep(seconds)
\ No newline at end of file
+        await asyncio.sleep(seconds)
+
+    async def _wait_for_completion(self) -> Optional[str]:
+        """
+        Wait until the flow completes, fails or times out. The store is read on the
+        executor, as SQLite and Redis stores block on disk or network I/O.
+        Returns:
+            User ID if successful, None if timeout or failure
+        """
+        while True:
+            state_data = await run_blocking(self.executor, self.state_store.get_state, self.state)
+            if not state_data:
+                # Cancelled, e.g. the callback received an error
+                return None
+            if state_data.get("is_completed"):
+                break
+            if time.time() > self.start_time + self.timeout:
+                await run_blocking(self.executor, self.terminate)
+                return None
+            await self._wait_for_update()
+        # Read and remove in one step so a completed state is handed out once
+        state_data = await run_blocking(self.executor, self.state_store.consume_state, self.state)
+        if not state_data:
+            return None
+        return state_data.get("user_id")
+
+    async def _wait_for_update(self) -> None:
+        """Wait until the state may have changed: woken by the callback if waiters are attached"""
+        if self.waiters is None:
+            await self._sleep(self.POLL_INTERVAL)
+        else:
+            await self.waiters.wait(self.state, timeout=self.waiter_poll_interval(self.state_store))
+
+    @classmethod
+    def waiter_poll_interval(cls, state_store: StateStore) -> float:
+        """
+        Seconds between state store checks while waiters are attached.
+        Args:
+            state_store: Store the state is kept in
+        Returns:
+            POLL_INTERVAL if another process may complete the state without waking the waiters,
+            StateWaiters.POLL_INTERVAL otherwise
+        """
+        return cls.POLL_INTERVAL if getattr(state_store, "SHARED", True) else StateWaiters.POLL_INTERVAL
@@ -1,7 +1,10 @@
 from __future__ import annotations
 import time
-from typing import Any, Dict, Optional
+from concurrent.futures import Executor
+from typing import Optional
 from .base_state import BaseState
+from .storage.base_store import StateStore
+from .waiters import StateWaiters
 
 
 class LinkState(BaseState):
@@ -9,20 +12,28 @@ class LinkState(BaseState):
     Handles the state management for the account linking flow.
     """
 
-    def __init__(self, state_store: Dict[str, Dict[str, Any]], state: str):
+    def __init__(
+        self,
+        state_store: StateStore,
+        state: str,
+        waiters: StateWaiters | None = None,
+        executor: Executor | None = None
+    ):
         """
         Initialize link state tracker.
         Args:
             state_store: Reference to the global state store
             state: Unique state identifier for this linking attempt
+            waiters: Optional waiters woken by the callback, instead of polling the store
+            executor: Executor the store is read on while waiting
         """
-        super().__init__(state_store, state)
+        super().__init__(state_store, state, waiters, executor)
         self.start_time = time.time()
         self.timeout = 120  # Linking timeout in seconds
 
     def is_completed(self) -> bool:
         """Check if linking flow is completed"""
-        return self.state_store[self.state].get("is_completed", False)
+        return (self.state_store.get_state(self.state) or {}).get("is_completed", False)
 
     def get_user(self) -> str:
         """Get user information after linking completion"""
@@ -34,14 +45,10 @@ class LinkState(BaseState):
         Args:
             user_id: ID of the user initiating the link
         """
-        is_completed = self.state_store[self.state].get("is_completed", False)
-        self.state_store[self.state] = {
-            "is_completed": is_completed,
-            "user_id": user_id
-        }
+        self.state_store.update_state(self.state, user_id=user_id)
 
     def set_value(self, key: str, val: str) -> None:
-        self.state_store[self.state][key] = val
+        self.state_store.update_state(self.state, **{key: val})
 
     def complete(self, user_id: str) -> None:
         """
@@ -49,10 +56,7 @@ class LinkState(BaseState):
         Args:
             user_id: ID of the linked user
         """
-        self.state_store[self.state] = {
-            "user_id": user_id,
-            "is_completed": True
-        }
+        self.state_store.complete_state(self.state, user_id=user_id)
 
     async def wait_for_completion(self) -> Optional[str]:
         """
@@ -60,13 +64,4 @@ class LinkState(BaseState):
         Returns:
             User ID if successful, None if timeout or failure
         """
-        while not self.is_completed():
-            if time.time() > self.start_time + self.timeout:
-                self.terminate()
-                return None
-            await self._sleep(0.25)  # Small delay between checks
-        user_id = self.get_user()
-        self.terminate()
-        if user_id == "login failed!":
-            return None
-        return user_id
+        return await self._wait_for_completion()
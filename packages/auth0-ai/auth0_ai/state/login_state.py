@@ -1,8 +1,11 @@
 from __future__ import annotations
 import time
+from concurrent.futures import Executor
 from typing import Any, Dict, Optional
 
 from .base_state import BaseState
+from .storage.base_store import StateStore
+from .waiters import StateWaiters
 
 
 class LoginState(BaseState):
@@ -10,21 +13,29 @@ class LoginState(BaseState):
     Handles the state management for the login flow.
     """
 
-    def __init__(self, state_store: Dict[str, Dict[str, Any]], state: str):
+    def __init__(
+        self,
+        state_store: StateStore,
+        state: str,
+        waiters: StateWaiters | None = None,
+        executor: Executor | None = None
+    ):
         """
         Initialize login state tracker.
 
         Args:
             state_store: Reference to the global state store
             state: Unique state identifier for this login attempt
+            waiters: Optional waiters woken by the callback, instead of polling the store
+            executor: Executor the store is read on while waiting
         """
-        super().__init__(state_store, state)
+        super().__init__(state_store, state, waiters, executor)
         self.start_time = time.time()
         self.timeout = 120  # Login timeout in seconds
 
     def is_completed(self) -> bool:
         """Check if login flow is completed"""
-        return self.state_store[self.state].get("is_completed", False)
+        return (self.state_store.get_state(self.state) or {}).get("is_completed", False)
 
     def get_user(self) -> str | Dict[str, Any]:
         """Get user information after login completion"""
@@ -37,10 +48,7 @@ class LoginState(BaseState):
         Args:
             user_id: ID of the authenticated user
         """
-        self.state_store[self.state] = {
-            "user_id": user_id,
-            "is_completed": True
-        }
+        self.state_store.complete_state(self.state, user_id=user_id)
 
     async def wait_for_completion(self) -> Optional[str]:
         """
@@ -49,16 +57,4 @@ class LoginState(BaseState):
         Returns:
             User ID if successful, None if timeout or failure
         """
-        while not self.is_completed():
-            if time.time() > self.start_time + self.timeout:
-                self.terminate()
-                return None
-            await self._sleep(0.25)  # Small delay between checks
-
-        user_data = self.get_user()
-        self.terminate()
-
-        if user_data == "login failed!":
-            return None
-
-        return user_data.get("user_id")
+        return await self._wait_for_completion()
@@ -0,0 +1,9 @@
+"""
+State Storage Implementations
+"""
+from .base_store import StateStore
+from .memory_store import MemoryStateStore
+from .redis_store import RedisStateStore
+from .sqlite_store import SQLiteStateStore
+
+__all__ = ["StateStore", "MemoryStateStore", "RedisStateStore", "SQLiteStateStore"]
@@ -0,0 +1,116 @@
+from __future__ import annotations
+from abc import ABC, abstractmethod
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterator, List
+
+
+class StateStore(MutableMapping, ABC):
+    """
+    Abstract base class for storage of in-flight authentication states.
+    A state is created when a login or link starts and completed by the callback,
+    which may run in another worker or process than the one waiting for it.
+    Implementations must make update, complete and consume atomic. The store is
+    also usable as a dict of state -> data; values read that way are copies, so
+    changes must be written back through the store.
+    """
+    # Default lifetime of a state in seconds
+    STATE_TTL = 600
+    # Whether states may be completed by another process, which cannot wake this one's waiters
+    SHARED = True
+
+    @abstractmethod
+    def get_state(self, state: str) -> Dict[str, Any] | None:
+        """
+        Get a state's data.
+        Args:
+            state: State identifier
+        Returns:
+            The state data if found and not expired, None otherwise
+        """
+        pass
+
+    @abstractmethod
+    def set_state(self, state: str, data: Dict[str, Any]) -> None:
+        """
+        Create or replace a state.
+        Args:
+            state: State identifier
+            data: State data (JSON serializable)
+        """
+        pass
+
+    @abstractmethod
+    def delete_state(self, state: str) -> None:
+        """
+        Delete a state.
+        Args:
+            state: State identifier
+        """
+        pass
+
+    @abstractmethod
+    def update_state(self, state: str, **fields: Any) -> Dict[str, Any] | None:
+        """
+        Atomically merge fields into an existing state.
+        Args:
+            state: State identifier
+            **fields: Fields to set
+        Returns:
+            The updated state data, or None if the state does not exist
+        """
+        pass
+
+    @abstractmethod
+    def complete_state(self, state: str, **fields: Any) -> Dict[str, Any] | None:
+        """
+        Atomically mark a state as completed, merging in fields (e.g. user_id).
+        Only the first completion of a state succeeds.
+        Args:
+            state: State identifier
+            **fields: Fields to set
+        Returns:
+            The completed state data, or None if the state does not exist or was already completed
+        """
+        pass
+
+    @abstractmethod
+    def consume_state(self, state: str) -> Dict[str, Any] | None:
+        """
+        Atomically get and delete a state, so only one caller receives it.
+        Args:
+            state: State identifier
+        Returns:
+            The state data, or None if the state does not exist
+        """
+        pass
+
+    @abstractmethod
+    def get_states(self) -> List[str]:
+        """
+        Get the identifiers of all live states.
+        Returns:
+            List of state identifiers
+        """
+        pass
+
+    # Dict compatibility
+    def __getitem__(self, state: str) -> Dict[str, Any]:
+        data = self.get_state(state)
+        if data is None:
+            raise KeyError(state)
+        return data
+
+    def __setitem__(self, state: str, data: Dict[str, Any]) -> None:
+        self.set_state(state, data)
+
+    def __delitem__(self, state: str) -> None:
+        self.delete_state(state)
+
+    def __contains__(self, state: object) -> bool:
+        return isinstance(state, str) and self.get_state(state) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.get_states())
+
+    def __len__(self) -> int:
+        return len(self.get_states())
@@ -0,0 +1,76 @@
+from __future__ import annotations
+import copy
+import threading
+import time
+from typing import Any, Dict, List, Tuple
+
+from .base_store import StateStore
+
+
+class MemoryStateStore(StateStore):
+    """
+    In-process state store. This is the default and only works when the
+    callback is served by the same process that started the flow.
+    """
+    SHARED = False
+
+    def __init__(self, ttl: float = StateStore.STATE_TTL):
+        """
+        Initialize memory store.
+        Args:
+            ttl: Lifetime of a state in seconds
+        """
+        self.ttl = ttl
+        self._states: Dict[str, Tuple[Dict[str, Any], float]] = {}
+        self._lock = threading.Lock()
+
+    def get_state(self, state: str) -> Dict[str, Any] | None:
+        with self._lock:
+            data = self._live(state)
+            return copy.deepcopy(data) if data is not None else None
+
+    def set_state(self, state: str, data: Dict[str, Any]) -> None:
+        with self._lock:
+            self._states[state] = (copy.deepcopy(data), time.time() + self.ttl)
+
+    def delete_state(self, state: str) -> None:
+        with self._lock:
+            self._states.pop(state, None)
+
+    def update_state(self, state: str, **fields: Any) -> Dict[str, Any] | None:
+        with self._lock:
+            data = self._live(state)
+            if data is None:
+                return None
+            data.update(copy.deepcopy(fields))
+            return copy.deepcopy(data)
+
+    def complete_state(self, state: str, **fields: Any) -> Dict[str, Any] | None:
+        with self._lock:
+            data = self._live(state)
+            if data is None or data.get("is_completed"):
+                return None
+            data.update(copy.deepcopy(fields), is_completed=True)
+            return copy.deepcopy(data)
+
+    def consume_state(self, state: str) -> Dict[str, Any] | None:
+        with self._lock:
+            data = self._live(state)
+            self._states.pop(state, None)
+            return data
+
+    def get_states(self) -> List[str]:
+        with self._lock:
+            now = time.time()
+            return [state for state, (_, expires_at) in self._states.items() if expires_at > now]
+
+    def _live(self, state: str) -> Dict[str, Any] | None:
+        """Get the stored data of an unexpired state, dropping it if expired. Caller holds the lock."""
+        entry = self._states.get(state)
+        if entry is None:
+            return None
+        data, expires_at = entry
+        if expires_at <= time.time():
+            del self._states[state]
+            return None
+        return data
@@ -0,0 +1,90 @@
+from __future__ import annotations
+import json
+from typing import Any, Dict, List
+
+from .base_store import StateStore
+
+# Merges ARGV[1] into the JSON state at KEYS[1], keeping its TTL. With ARGV[2] == "1"
+# the state is also marked completed, unless it already was.
+_MERGE_SCRIPT = """
+local raw = redis.call('GET', KEYS[1])
+if not raw then return false end
+local data = cjson.decode(raw)
+if ARGV[2] == '1' then
+    if data['is_completed'] == true then return false end
+    data['is_completed'] = true
+end
+for key, value in pairs(cjson.decode(ARGV[1])) do data[key] = value end
+local encoded = cjson.encode(data)
+redis.call('SET', KEYS[1], encoded, 'KEEPTTL')
+return encoded
+"""
+
+
+class RedisStateStore(StateStore):
+    """
+    State store for any server speaking the Redis protocol (Redis, Valkey, KeyDB, ...),
+    shared by every worker and host. Requires the optional redis package.
+    """
+
+    def __init__(
+        self,
+        url: str = "redis://localhost:6379/0",
+        ttl: float = StateStore.STATE_TTL,
+        prefix: str = "auth0_ai:state:",
+        client: Any = None
+    ):
+        """
+        Initialize Redis store.
+        Args:
+            url: Server URL, ignored when client is given
+            ttl: Lifetime of a state in seconds
+            prefix: Key prefix for states
+            client: Optional existing redis.Redis client
+        """
+        if client is None:
+            try:
+                import redis
+            except ImportError as e:
+                raise ImportError(
+                    "RedisStateStore requires the redis package, install auth0-ai[redis].") from e
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+        self._merge = client.register_script(_MERGE_SCRIPT)
+
+    def get_state(self, state: str) -> Dict[str, Any] | None:
+        return self._loads(self.client.get(self._key(state)))
+
+    def set_state(self, state: str, data: Dict[str, Any]) -> None:
+        self.client.set(self._key(state), json.dumps(data), ex=max(int(self.ttl), 1))
+
+    def delete_state(self, state: str) -> None:
+        self.client.delete(self._key(state))
+
+    def update_state(self, state: str, **fields: Any) -> Dict[str, Any] | None:
+        return self._loads(self._merge(keys=[self._key(state)], args=[json.dumps(fields), "0"]))
+
+    def complete_state(self, state: str, **fields: Any) -> Dict[str, Any] | None:
+        return self._loads(self._merge(keys=[self._key(state)], args=[json.dumps(fields), "1"]))
+
+    def consume_state(self, state: str) -> Dict[str, Any] | None:
+        pipeline = self.client.pipeline(transaction=True)
+        pipeline.get(self._key(state))
+        pipeline.delete(self._key(state))
+        raw, _ = pipeline.execute()
+        return self._loads(raw)
+
+    def get_states(self) -> List[str]:
+        return [self._state(key) for key in self.client.scan_iter(match=f"{self.prefix}*")]
+
+    def _key(self, state: str) -> str:
+        return f"{self.prefix}{state}"
+
+    def _state(self, key: bytes | str) -> str:
+        key = key.decode() if isinstance(key, bytes) else key
+        return key[len(self.prefix):]
+
+    def _loads(self, raw: bytes | str | None) -> Dict[str, Any] | None:
+        return json.loads(raw) if raw else None
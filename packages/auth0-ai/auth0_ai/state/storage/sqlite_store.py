@@ -0,0 +1,100 @@
+from __future__ import annotations
+import json
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List
+
+from .base_store import StateStore
+
+
+class SQLiteStateStore(StateStore):
+    """
+    State store backed by a SQLite database file, shared by every worker
+    process on the host. Atomic operations run in immediate transactions.
+    """
+
+    def __init__(self, file_path: str = ".auth_states.db", ttl: float = StateStore.STATE_TTL, timeout: float = 5.0):
+        """
+        Initialize SQLite store.
+        Args:
+            file_path: Path to the database file (default: ".auth_states.db")
+            ttl: Lifetime of a state in seconds
+            timeout: Seconds to wait for a lock held by another process
+        """
+        self.file_path = file_path
+        self.ttl = ttl
+        self.timeout = timeout
+        with self._transaction() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS auth_states "
+                "(state TEXT PRIMARY KEY, data TEXT NOT NULL, expires_at REAL NOT NULL)")
+
+    def get_state(self, state: str) -> Dict[str, Any] | None:
+        with self._transaction(immediate=False) as connection:
+            return self._select(connection, state)
+
+    def set_state(self, state: str, data: Dict[str, Any]) -> None:
+        with self._transaction() as connection:
+            # New states are rare enough to sweep expired ones here
+            connection.execute("DELETE FROM auth_states WHERE expires_at <= ?", (time.time(),))
+            connection.execute(
+                "INSERT OR REPLACE INTO auth_states (state, data, expires_at) VALUES (?, ?, ?)",
+                (state, json.dumps(data), time.time() + self.ttl))
+
+    def delete_state(self, state: str) -> None:
+        with self._transaction() as connection:
+            connection.execute("DELETE FROM auth_states WHERE state = ?", (state,))
+
+    def update_state(self, state: str, **fields: Any) -> Dict[str, Any] | None:
+        with self._transaction() as connection:
+            data = self._select(connection, state)
+            if data is None:
+                return None
+            data.update(fields)
+            self._update(connection, state, data)
+            return data
+
+    def complete_state(self, state: str, **fields: Any) -> Dict[str, Any] | None:
+        with self._transaction() as connection:
+            data = self._select(connection, state)
+            if data is None or data.get("is_completed"):
+                return None
+            data.update(fields, is_completed=True)
+            self._update(connection, state, data)
+            return data
+
+    def consume_state(self, state: str) -> Dict[str, Any] | None:
+        with self._transaction() as connection:
+            data = self._select(connection, state)
+            connection.execute("DELETE FROM auth_states WHERE state = ?", (state,))
+            return data
+
+    def get_states(self) -> List[str]:
+        with self._transaction(immediate=False) as connection:
+            rows = connection.execute(
+                "SELECT state FROM auth_states WHERE expires_at > ?", (time.time(),)).fetchall()
+            return [row[0] for row in rows]
+
+    @contextmanager
+    def _transaction(self, immediate: bool = True) -> Iterator[sqlite3.Connection]:
+        """Run statements in one transaction, taking the write lock up front when immediate"""
+        connection = sqlite3.connect(self.file_path, timeout=self.timeout, isolation_level=None)
+        try:
+            connection.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+            try:
+                yield connection
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+        finally:
+            connection.close()
+
+    def _select(self, connection: sqlite3.Connection, state: str) -> Dict[str, Any] | None:
+        row = connection.execute(
+            "SELECT data FROM auth_states WHERE state = ? AND expires_at > ?", (state, time.time())).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _update(self, connection: sqlite3.Connection, state: str, data: Dict[str, Any]) -> None:
+        connection.execute("UPDATE auth_states SET data = ? WHERE state = ?", (json.dumps(data), state))
@@ -0,0 +1,106 @@
+from __future__ import annotations
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+from auth0_ai.token_module.cache import TTLCache
+
+
+class StateWaiters:
+    """
+    Per-state futures resolved the moment a login or link state is completed or fails.
+    Waiting costs no CPU: each waiter is a future parked on its own event loop, and
+    resolve() may be called from any thread or loop (e.g. the auth server's).
+    Outcomes are remembered for a short while so a waiter arriving just after the
+    callback still receives them. States completed by another worker or process are
+    picked up by re-checking the state store every poll_interval, which callers keep
+    short when the store is shared (see BaseState.waiter_poll_interval).
+    """
+    # Seconds between state store checks while waiting
+    POLL_INTERVAL = 5.0
+    # Seconds an outcome is kept for waiters that arrive after it
+    RESULT_TTL = 60
+
+    def __init__(self, result_ttl: float = RESULT_TTL, max_results: int = 10000):
+        """
+        Initialize the waiters.
+        Args:
+            result_ttl: Seconds an outcome is kept for late waiters
+            max_results: Maximum number of outcomes kept
+        """
+        self._waiters: Dict[str, List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]]] = {}
+        self._results = TTLCache(maxsize=max_results, ttl=result_ttl)
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        """Number of waiters currently parked"""
+        with self._lock:
+            return sum(len(waiters) for waiters in self._waiters.values())
+
+    def resolve(self, state: str, outcome: Dict[str, Any]) -> None:
+        """
+        Wake every waiter of a state.
+        Args:
+            state: State identifier
+            outcome: Outcome handed to the waiters, e.g. {"status": "completed", "user_id": ...}
+        """
+        with self._lock:
+            self._results.set(state, outcome)
+            waiters = self._waiters.pop(state, [])
+        for loop, future in waiters:
+            loop.call_soon_threadsafe(_set_result, future, outcome)
+
+    async def wait(
+        self,
+        state: str,
+        timeout: float,
+        poll: Callable[[], Awaitable[Dict[str, Any] | None]] | None = None,
+        poll_interval: float = POLL_INTERVAL
+    ) -> Dict[str, Any] | None:
+        """
+        Wait for a state's outcome.
+        Args:
+            state: State identifier
+            timeout: Maximum seconds to wait
+            poll: Optional coroutine function reading the outcome from the state store,
+                returning None while the state is pending
+            poll_interval: Seconds between calls of poll
+        Returns:
+            The outcome, or None on timeout
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self._lock:
+            outcome = self._results.get(state)
+            if outcome is not None:
+                return outcome
+            self._waiters.setdefault(state, []).append((loop, future))
+        try:
+            deadline = loop.time() + timeout
+            while True:
+                # Checked after registering, so a completion in between is not missed
+                outcome = await poll() if poll else None
+                if outcome is not None:
+                    return outcome
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return None
+                done, _ = await asyncio.wait({future}, timeout=min(remaining, poll_interval) if poll else remaining)
+                if done:
+                    return future.result()
+        finally:
+            self._discard(state, loop, future)
+
+    def _discard(self, state: str, loop: asyncio.AbstractEventLoop, future: asyncio.Future) -> None:
+        with self._lock:
+            waiters = self._waiters.get(state)
+            if waiters and (loop, future) in waiters:
+                waiters.remove((loop, future))
+                if not waiters:
+                    del self._waiters[state]
+
+
+def _set_result(future: asyncio.Future, outcome: Dict[str, Any]) -> None:
+    if not future.done():
+        future.set_result(outcome)
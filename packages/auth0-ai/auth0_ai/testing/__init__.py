@@ -0,0 +1,8 @@
+"""
+Auth0 AI Testing Module
+Provides a local Auth0 stand-in and an in-process load test for offline load and latency testing.
+"""
+from .fake_auth0 import FakeAuth0
+from .load import LoadReport, LoadTest, check_reports, format_reports
+
+__all__ = ["FakeAuth0", "LoadReport", "LoadTest", "check_reports", "format_reports"]
@@ -0,0 +1,368 @@
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import random
+import secrets
+import socket
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict
+from urllib.parse import urlencode
+
+import jwt
+import uvicorn
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, RedirectResponse
+
+
+class FakeAuth0:
+    """
+    Local stand-in for an Auth0 tenant, issuing real RS256-signed tokens.
+    Implements /authorize (auto-approving), /oauth/token (authorization code,
+    refresh, federated connection exchange and client credentials),
+    /.well-known/jwks.json, /userinfo, /oauth/par, /oauth/revoke and /v2/logout.
+    Latency and error rate can be injected to reproduce slow or degraded tenants.
+
+    Point AIAuth at it with domain=fake.domain and protocol="http".
+    """
+    FEDERATED_GRANT = "urn:auth0:params:oauth:grant-type:token-exchange:federated-connection-access-token"
+
+    def __init__(
+        self,
+        client_id: str = "fake-client-id",
+        client_secret: str = "fake-client-secret",
+        latency: float = 0.0,
+        latency_jitter: float = 0.0,
+        error_rate: float = 0.0,
+        access_token_lifetime: int = 86400,
+        id_token_lifetime: int = 36000,
+        rotate_refresh_tokens: bool = False,
+        seed: int | None = None
+    ):
+        """
+        Initialize the fake tenant.
+        Args:
+            client_id: Client ID accepted by the token endpoint
+            client_secret: Client secret accepted by the token endpoint
+            latency: Seconds added to every response
+            latency_jitter: Upper bound in seconds of random extra latency per response
+            error_rate: Probability in [0, 1] of answering with a 503
+            access_token_lifetime: Lifetime of issued access tokens in seconds
+            id_token_lifetime: Lifetime of issued ID tokens in seconds
+            rotate_refresh_tokens: Issue a new refresh token and revoke the used one on refresh
+            seed: Optional seed for the latency and error injection
+        """
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.access_token_lifetime = access_token_lifetime
+        self.id_token_lifetime = id_token_lifetime
+        self.rotate_refresh_tokens = rotate_refresh_tokens
+        self.kid = "fake-auth0-key"
+        self.private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        # Number of requests served per path
+        self.calls: Counter = Counter()
+        # Served over plain HTTP, hence protocol="http" on the AIAuth side
+        self.scheme = "http"
+        self.host = "127.0.0.1"
+        self.port: int | None = None
+        self._codes: Dict[str, Dict[str, Any]] = {}
+        self._refresh_tokens: Dict[str, Dict[str, Any]] = {}
+        self._random = random.Random(seed)
+        self._server: uvicorn.Server | None = None
+        self._thread: threading.Thread | None = None
+        self.app = FastAPI()
+        self._setup_routes()
+
+    @property
+    def domain(self) -> str:
+        """Domain (host:port) to configure AIAuth with once started"""
+        return f"{self.host}:{self.port}"
+
+    @property
+    def base_url(self) -> str:
+        """URL the tenant is served at once started"""
+        return f"{self.scheme}://{self.domain}"
+
+    @property
+    def issuer(self) -> str:
+        return f"{self.base_url}/"
+
+    @property
+    def jwks(self) -> Dict[str, Any]:
+        """The public JSON web key set"""
+        jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(self.private_key.public_key()))
+        jwk.update({"kid": self.kid, "alg": "RS256", "use": "sig"})
+        return {"keys": [jwk]}
+
+    def issue_code(
+        self,
+        sub: str = "auth0|fake-user",
+        scope: str = "openid profile email offline_access",
+        audience: str | None = None,
+        access_token_lifetime: int | None = None,
+        **claims
+    ) -> str:
+        """
+        Issue an authorization code without going through /authorize.
+        Args:
+            sub: Subject of the user logging in
+            scope: Granted scopes
+            audience: Optional API audience
+            access_token_lifetime: Lifetime of the access token issued for this code only,
+                e.g. to log in with a token that is already due for refresh
+            **claims: Extra profile claims for the ID token and /userinfo
+        Returns:
+            Authorization code to send to AIAuth's /auth/callback
+        """
+        code = secrets.token_urlsafe(16)
+        self._codes[code] = {"sub": sub, "scope": scope, "audience": audience, "claims": claims,
+                             "access_token_lifetime": access_token_lifetime}
+        return code
+
+    def sign(self, claims: Dict[str, Any]) -> str:
+        """Sign claims with the tenant's key"""
+        return jwt.encode(claims, self.private_key, algorithm="RS256", headers={"kid": self.kid})
+
+    def start(self, port: int | None = None) -> "FakeAuth0":
+        """
+        Serve the fake tenant on a daemon thread.
+        Args:
+            port: Port to bind, a free one is picked if omitted
+        Returns:
+            self, once the server accepts connections
+        """
+        self.port = port or _free_port()
+        self._server = uvicorn.Server(uvicorn.Config(
+            self.app, host=self.host, port=self.port, log_level="error"))
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+        self._thread.start()
+        while not self._server.started:
+            if not self._thread.is_alive():
+                raise RuntimeError(f"Fake Auth0 server failed to start on port {self.port}")
+            time.sleep(0.01)
+        return self
+
+    def stop(self) -> None:
+        """Shut the server down and wait for it to exit"""
+        if self._server:
+            self._server.should_exit = True
+            self._thread.join(timeout=5)
+            self._server = None
+
+    def __enter__(self) -> "FakeAuth0":
+        return self.start() if self._server is None else self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    # Token issuance
+    def _token_response(
+        self,
+        sub: str,
+        scope: str,
+        audience: str | None,
+        claims: Dict[str, Any],
+        access_token_lifetime: int | None = None
+    ) -> Dict[str, Any]:
+        now = int(time.time())
+        access_token_lifetime = access_token_lifetime or self.access_token_lifetime
+        userinfo_aud = f"{self.base_url}/userinfo"
+        response = {
+            "access_token": self.sign({
+                "iss": self.issuer,
+                "sub": sub,
+                "aud": [audience, userinfo_aud] if audience else userinfo_aud,
+                "azp": self.client_id,
+                "scope": scope,
+                "iat": now,
+                "exp": now + access_token_lifetime,
+            }),
+            "token_type": "Bearer",
+            "expires_in": access_token_lifetime,
+            "scope": scope,
+        }
+        if "openid" in scope.split():
+            response["id_token"] = self.sign({
+                "iss": self.issuer,
+                "sub": sub,
+                "aud": self.client_id,
+                "iat": now,
+                "exp": now + self.id_token_lifetime,
+                **self._profile(sub, claims),
+            })
+        if "offline_access" in scope.split():
+            refresh_token = secrets.token_urlsafe(32)
+            self._refresh_tokens[refresh_token] = {
+                "sub": sub, "scope": scope, "audience": audience, "claims": claims}
+            response["refresh_token"] = refresh_token
+        return response
+
+    def _profile(self, sub: str, claims: Dict[str, Any]) -> Dict[str, Any]:
+        name = sub.split("|")[-1]
+        return {"name": name, "email": f"{name}@example.com", "email_verified": True, **claims}
+
+    def _grant(self, body: Dict[str, Any]) -> JSONResponse:
+        if body.get("client_id") != self.client_id or body.get("client_secret") != self.client_secret:
+            return _error(401, "access_denied", "Unauthorized")
+        grant_type = body.get("grant_type")
+
+        if grant_type == "authorization_code":
+            grant = self._codes.pop(body.get("code"), None)
+            if not grant:
+                return _error(403, "invalid_grant", "Invalid authorization code")
+            return JSONResponse(self._token_response(
+                grant["sub"], grant["scope"], grant["audience"], grant["claims"], grant["access_token_lifetime"]))
+
+        if grant_type == "refresh_token":
+            grant = self._refresh_tokens.get(body.get("refresh_token"))
+            if not grant:
+                return _error(403, "invalid_grant", "Unknown or invalid refresh token.")
+            scope = body.get("scope") or grant["scope"]
+            audience = body.get("audience") or grant["audience"]
+            response = self._token_response(grant["sub"], scope, audience, grant["claims"])
+            if self.rotate_refresh_tokens:
+                del self._refresh_tokens[body["refresh_token"]]
+            else:
+                self._refresh_tokens.pop(response.pop("refresh_token", None), None)
+            return JSONResponse(response)
+
+        if grant_type == self.FEDERATED_GRANT:
+            if body.get("subject_token") not in self._refresh_tokens:
+                return _error(403, "invalid_grant", "Invalid subject token.")
+            return JSONResponse({
+                "access_token": f"fake_{body.get('connection')}_{secrets.token_urlsafe(16)}",
+                "token_type": "Bearer",
+                "expires_in": 3600,
+                "scope": "",
+                "issued_token_type": body.get("requested_token_type"),
+            })
+
+        if grant_type == "client_credentials":
+            now = int(time.time())
+            return JSONResponse({
+                "access_token": self.sign({
+                    "iss": self.issuer,
+                    "sub": f"{self.client_id}@clients",
+                    "aud": body.get("audience"),
+                    "azp": self.client_id,
+                    "scope": body.get("scope", ""),
+                    "gty": "client-credentials",
+                    "iat": now,
+                    "exp": now + self.access_token_lifetime,
+                }),
+                "token_type": "Bearer",
+                "expires_in": self.access_token_lifetime,
+                "scope": body.get("scope", ""),
+            })
+
+        return _error(400, "unsupported_grant_type", f"Grant type '{grant_type}' not allowed.")
+
+    def _setup_routes(self) -> None:
+        app = self.app
+
+        @app.middleware("http")
+        async def inject_faults(request: Request, call_next):
+            self.calls[request.url.path] += 1
+            delay = self.latency + self._random.uniform(0, self.latency_jitter)
+            if delay:
+                await asyncio.sleep(delay)
+            if self.error_rate and self._random.random() < self.error_rate:
+                return _error(503, "temporarily_unavailable", "Injected failure.")
+            return await call_next(request)
+
+        @app.get("/.well-known/jwks.json")
+        async def jwks():
+            return JSONResponse(self.jwks)
+
+        @app.get("/authorize")
+        async def authorize(redirect_uri: str, state: str | None = None, scope: str = "openid",
+                            audience: str | None = None, login_hint: str | None = None):
+            # Auto-approve: the user is logged in as login_hint (or a default user)
+            code = self.issue_code(sub=login_hint or "auth0|fake-user", scope=scope, audience=audience)
+            params = {"code": code}
+            if state:
+                params["state"] = state
+            return RedirectResponse(f"{redirect_uri}?{urlencode(params)}", status_code=302)
+
+        @app.post("/oauth/token")
+        async def token(request: Request):
+            return self._grant(await _read_body(request))
+
+        @app.get("/userinfo")
+        async def userinfo(request: Request):
+            authorization = request.headers.get("authorization", "")
+            try:
+                claims = jwt.decode(authorization.split(" ", 1)[-1], self.private_key.public_key(),
+                                    algorithms=["RS256"], options={"verify_aud": False})
+            except jwt.InvalidTokenError:
+                return _error(401, "invalid_token", "Invalid access token.")
+            return JSONResponse({"sub": claims["sub"], **self._profile(claims["sub"], {})})
+
+        @app.post("/oauth/par")
+        async def par(request: Request):
+            body = await _read_body(request)
+            if body.get("client_id") != self.client_id:
+                return _error(401, "invalid_client", "Unknown client.")
+            return JSONResponse({
+                "request_uri": f"urn:ietf:params:oauth:request_uri:{secrets.token_urlsafe(16)}",
+                "expires_in": 60,
+            }, status_code=201)
+
+        @app.post("/oauth/revoke")
+        async def revoke(request: Request):
+            body = await _read_body(request)
+            self._refresh_tokens.pop(body.get("token"), None)
+            return JSONResponse({})
+
+        @app.get("/v2/logout")
+        async def logout():
+            return JSONResponse({})
+
+
+async def _read_body(request: Request) -> Dict[str, Any]:
+    """Read a JSON or form-encoded body"""
+    if request.headers.get("content-type", "").startswith("application/json"):
+        return await request.json()
+    return dict(await request.form())
+
+
+def _error(status_code: int, error: str, description: str) -> JSONResponse:
+    return JSONResponse({"error": error, "error_description": description}, status_code=status_code)
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def main() -> None:
+    """Run the fake tenant as a standalone process"""
+    parser = argparse.ArgumentParser(description="Local Auth0 stand-in for offline testing")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--client-id", default="fake-client-id")
+    parser.add_argument("--client-secret", default="fake-client-secret")
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--latency-jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+    fake = FakeAuth0(
+        client_id=args.client_id,
+        client_secret=args.client_secret,
+        latency=args.latency,
+        latency_jitter=args.latency_jitter,
+        error_rate=args.error_rate,
+    )
+    fake.port = args.port
+    print(f"Fake Auth0 tenant listening on {fake.base_url}")
+    uvicorn.run(fake.app, host=fake.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
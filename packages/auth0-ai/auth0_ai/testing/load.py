@@ -0,0 +1,291 @@
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import math
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Awaitable, Callable, Dict, List
+
+import httpx
+from fastapi import FastAPI
+
+from .fake_auth0 import FakeAuth0, _free_port
+from auth0_ai.auth.auth_client import AIAuth
+from auth0_ai.server.routes import setup_routes
+from auth0_ai.session_module.storage.local_store import LocalStore
+from auth0_ai.token_module.refresh_policy import RefreshPolicy
+
+
+class LoadReport:
+    """
+    Latencies and outcome of one load-test scenario.
+    """
+
+    def __init__(self, scenario: str, latencies: List[float], errors: int, duration: float):
+        """
+        Initialize the report.
+        Args:
+            scenario: Scenario name
+            latencies: Latency of every request in seconds
+            errors: Number of requests answered with an unexpected status
+            duration: Wall-clock seconds the scenario took
+        """
+        self.scenario = scenario
+        self.latencies = sorted(latencies)
+        self.errors = errors
+        self.duration = duration
+
+    @property
+    def requests(self) -> int:
+        return len(self.latencies)
+
+    @property
+    def throughput(self) -> float:
+        """Requests per second"""
+        return self.requests / self.duration if self.duration else 0.0
+
+    @property
+    def error_rate(self) -> float:
+        return self.errors / self.requests if self.requests else 0.0
+
+    def percentile(self, percent: float) -> float:
+        """
+        Get a latency percentile (nearest rank).
+        Args:
+            percent: Percentile in (0, 100]
+        Returns:
+            Latency in seconds
+        """
+        if not self.latencies:
+            return 0.0
+        rank = max(math.ceil(percent / 100 * len(self.latencies)), 1)
+        return self.latencies[rank - 1]
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "scenario": self.scenario,
+            "requests": self.requests,
+            "errors": self.errors,
+            "throughput": round(self.throughput, 1),
+            "p50_ms": round(self.percentile(50) * 1000, 2),
+            "p95_ms": round(self.percentile(95) * 1000, 2),
+            "p99_ms": round(self.percentile(99) * 1000, 2),
+            "max_ms": round(self.percentile(100) * 1000, 2),
+        }
+
+
+class LoadTest:
+    """
+    In-process load test of the /auth routes.
+    Serves the app built by setup_routes through an ASGI transport, backed by an
+    AIAuth pointed at a FakeAuth0 tenant, and runs these scenarios in order:
+    callback (concurrent logins), get_user, get_token_warm (cached tokens),
+    get_token_expired (tokens due for refresh) and logout.
+
+    Usage:
+        reports = asyncio.run(LoadTest(users=100, concurrency=50).run())
+        print(format_reports(reports))
+    """
+    AUDIENCE = "https://api.example.com"
+    SCOPE = "read:data"
+    # Access token lifetime of the expired cohort, within the refresh window for its whole lifetime
+    EXPIRING_TOKEN_LIFETIME = 30
+    # Without jitter and with the window allowed to span the whole lifetime, the expiring
+    # cohort's tokens are due for refresh from the moment they are issued
+    REFRESH_POLICY = RefreshPolicy(skew=10, refresh_ahead=30, jitter=0, max_lifetime_fraction=1.0)
+
+    def __init__(
+        self,
+        users: int = 50,
+        concurrency: int = 25,
+        requests_per_user: int = 5,
+        fake: FakeAuth0 | None = None,
+        session_path: str | None = None
+    ):
+        """
+        Initialize the load test.
+        Args:
+            users: Number of simulated users, half of them logging in with tokens due for refresh
+            concurrency: Maximum number of requests in flight at once
+            requests_per_user: get_user and warm get_token requests sent by each user
+            fake: Running fake tenant to use, a private one is started if omitted
+            session_path: Session store file, a temporary one is used if omitted
+        """
+        self.users = users
+        self.concurrency = concurrency
+        self.requests_per_user = requests_per_user
+        self.fake = fake
+        self.session_path = session_path
+
+    async def run(self) -> Dict[str, LoadReport]:
+        """
+        Run every scenario.
+        Returns:
+            Reports keyed by scenario name, in execution order
+        """
+        owns_fake = self.fake is None
+        fake = self.fake or FakeAuth0().start()
+        try:
+            with tempfile.TemporaryDirectory() as directory:
+                return await self._run(fake, self.session_path or os.path.join(directory, "sessions"))
+        finally:
+            if owns_fake:
+                fake.stop()
+
+    async def _run(self, fake: FakeAuth0, session_path: str) -> Dict[str, LoadReport]:
+        auth_client = AIAuth(
+            domain=fake.domain,
+            client_id=fake.client_id,
+            client_secret=fake.client_secret,
+            redirect_uri=f"http://127.0.0.1:{_free_port()}/auth/callback",
+            secret_key="load-test-secret-that-is-long-enough-for-hs256",
+            protocol="http",
+            standalone_server=False,
+            refresh_policy=self.REFRESH_POLICY,
+        )
+        auth_client.session_manager.store = LocalStore(file_path=session_path)
+        app = FastAPI()
+        setup_routes(app, auth_client, auth_client.current_session)
+        transport = httpx.ASGITransport(app=app)
+        clients = [httpx.AsyncClient(transport=transport, base_url="http://test") for _ in range(self.users)]
+        warm, expiring = clients[:self.users // 2], clients[self.users // 2:]
+        token_params = {"audience": self.AUDIENCE, "scope": self.SCOPE}
+        reports: Dict[str, LoadReport] = {}
+        try:
+            # The expiring cohort logs in with tokens that are already due for refresh
+            reports["callback"] = await self._scenario("callback", [
+                self._login(auth_client, fake, client, f"auth0|load-{i}",
+                            self.EXPIRING_TOKEN_LIFETIME if i >= len(warm) else None)
+                for i, client in enumerate(clients)])
+
+            reports["get_user"] = await self._scenario("get_user", [
+                self._get(client, "/auth/get_user") for client in clients for _ in range(self.requests_per_user)])
+            reports["get_token_warm"] = await self._scenario("get_token_warm", [
+                self._get(client, "/auth/get_token", params=token_params)
+                for client in warm for _ in range(self.requests_per_user)])
+            reports["get_token_expired"] = await self._scenario("get_token_expired", [
+                self._get(client, "/auth/get_token", params=token_params) for client in expiring])
+            reports["logout"] = await self._scenario("logout", [
+                self._get(client, "/auth/logout") for client in clients])
+        finally:
+            for client in clients:
+                await client.aclose()
+            auth_client.io_executor.shutdown(wait=False)
+        return reports
+
+    def _login(
+        self,
+        auth_client: Any,
+        fake: FakeAuth0,
+        client: httpx.AsyncClient,
+        sub: str,
+        access_token_lifetime: int | None = None
+    ) -> Callable[[], Awaitable[httpx.Response]]:
+        # Codes and states are issued up front so only the callback itself is measured
+        code = fake.issue_code(
+            sub=sub, scope=f"openid profile email offline_access {self.SCOPE}", audience=self.AUDIENCE,
+            access_token_lifetime=access_token_lifetime)
+        state = auth_client._generate_state()
+        return self._get(client, "/auth/callback", params={"code": code, "state": state})
+
+    def _get(self, client: httpx.AsyncClient, path: str, **kwargs) -> Callable[[], Awaitable[httpx.Response]]:
+        return lambda: client.get(path, **kwargs)
+
+    async def _scenario(self, name: str, requests: List[Callable[[], Awaitable[httpx.Response]]]) -> LoadReport:
+        semaphore = asyncio.Semaphore(self.concurrency)
+        latencies: List[float] = []
+        errors = 0
+
+        async def send(request: Callable[[], Awaitable[httpx.Response]]) -> None:
+            nonlocal errors
+            async with semaphore:
+                started = time.perf_counter()
+                try:
+                    response = await request()
+                    failed = response.status_code != 200
+                except Exception:
+                    failed = True
+                latencies.append(time.perf_counter() - started)
+                errors += failed
+
+        started = time.perf_counter()
+        await asyncio.gather(*(send(request) for request in requests))
+        return LoadReport(name, latencies, errors, time.perf_counter() - started)
+
+
+def format_reports(reports: Dict[str, LoadReport]) -> str:
+    """Render reports as an aligned text table"""
+    columns = ["scenario", "requests", "errors", "throughput", "p50_ms", "p95_ms", "p99_ms", "max_ms"]
+    rows = [columns] + [[str(report.as_dict()[column]) for column in columns] for report in reports.values()]
+    widths = [max(len(row[i]) for row in rows) for i in range(len(columns))]
+    return "\n".join("  ".join(cell.rjust(width) for cell, width in zip(row, widths)) for row in rows)
+
+
+def check_reports(
+    reports: Dict[str, LoadReport],
+    max_p95: float | None = None,
+    min_throughput: float | None = None,
+    max_error_rate: float = 0.0
+) -> List[str]:
+    """
+    Compare reports against performance budgets, e.g. as a CI regression gate.
+    Args:
+        reports: Reports keyed by scenario name
+        max_p95: Maximum p95 latency in seconds per scenario
+        min_throughput: Minimum requests per second per scenario
+        max_error_rate: Maximum share of failed requests per scenario
+    Returns:
+        Descriptions of the budgets that were exceeded (empty when all are met)
+    """
+    failures = []
+    for name, report in reports.items():
+        if report.error_rate > max_error_rate:
+            failures.append(f"{name}: error rate {report.error_rate:.1%} above {max_error_rate:.1%}")
+        if max_p95 is not None and report.percentile(95) > max_p95:
+            failures.append(f"{name}: p95 {report.percentile(95) * 1000:.1f} ms above {max_p95 * 1000:.1f} ms")
+        if min_throughput is not None and report.throughput < min_throughput:
+            failures.append(f"{name}: {report.throughput:.1f} req/s below {min_throughput:.1f} req/s")
+    return failures
+
+
+def main() -> None:
+    """Run the load test from the command line, exiting non-zero when a budget is exceeded"""
+    parser = argparse.ArgumentParser(description="In-process load test of the auth0-ai /auth routes")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=25)
+    parser.add_argument("--requests-per-user", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds the fake tenant adds to every response")
+    parser.add_argument("--max-p95-ms", type=float, default=None)
+    parser.add_argument("--min-throughput", type=float, default=None)
+    parser.add_argument("--max-error-rate", type=float, default=0.0)
+    parser.add_argument("--json", action="store_true", help="Print the reports as JSON")
+    args = parser.parse_args()
+
+    with FakeAuth0(latency=args.latency) as fake:
+        reports = asyncio.run(LoadTest(
+            users=args.users,
+            concurrency=args.concurrency,
+            requests_per_user=args.requests_per_user,
+            fake=fake,
+        ).run())
+
+    if args.json:
+        print(json.dumps([report.as_dict() for report in reports.values()], indent=2))
+    else:
+        print(format_reports(reports))
+    failures = check_reports(
+        reports,
+        max_p95=args.max_p95_ms / 1000 if args.max_p95_ms is not None else None,
+        min_throughput=args.min_throughput,
+        max_error_rate=args.max_error_rate,
+    )
+    for failure in failures:
+        print(f"FAILED {failure}", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
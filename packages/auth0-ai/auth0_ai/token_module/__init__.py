@@ -3,4 +3,9 @@ Auth0 AI Token Management Module
 Internal module for handling token operations and lifecycle.
 """
 from .manager import TokenManager
-__all__ = ["TokenManager"]
+from .cache import TTLCache
+from .jwks import JwksCache, JwksSignatureVerifier
+from .refresh_policy import RefreshPolicy
+from .scope_index import ScopeIndex
+from .single_flight import SingleFlight
+__all__ = ["TokenManager", "TTLCache", "JwksCache", "JwksSignatureVerifier", "RefreshPolicy", "ScopeIndex", "SingleFlight"]
@@ -0,0 +1,129 @@
+from __future__ import annotations
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+from auth0_ai.utils.metrics import CACHE_REQUESTS
+from auth0_ai.utils.tracing import set_attributes
+
+
+class TTLCache:
+    """
+    Thread-safe in-memory cache with per-entry expiry and LRU eviction.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: float | None = None,
+        keep_stale: bool = False,
+        name: str | None = None
+    ):
+        """
+        Initialize the cache.
+        Args:
+            maxsize: Maximum number of entries before the least recently used is evicted
+            ttl: Default lifetime of an entry in seconds (None means no expiry)
+            keep_stale: Keep expired entries (until evicted) so they can be read with get_stale
+            name: Name the cache's hits and misses are counted under in the metrics registry
+        """
+        self.maxsize = maxsize
+        self.name = name
+        self.ttl = ttl
+        self.keep_stale = keep_stale
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Hashable, tuple[Any, float | None]] = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Get a cached value.
+        Args:
+            key: Cache key
+            default: Value returned when the key is missing or expired
+        Returns:
+            The cached value or default
+        """
+        value = self._get(key, _MISSING)
+        if self.name:
+            result = "miss" if value is _MISSING else "hit"
+            CACHE_REQUESTS.inc(cache=self.name, result=result)
+            # Record the outcome on the span of the operation doing the lookup
+            set_attributes(**{f"cache.{self.name}": result})
+        return default if value is _MISSING else value
+
+    def _get(self, key: Hashable, default: Any) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.time():
+                if not self.keep_stale:
+                    del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def get_stale(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Get a cached value even if it has expired, e.g. to serve it while the origin is degraded.
+        Args:
+            key: Cache key
+            default: Value returned when the key is missing
+        Returns:
+            The cached value or default
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            return default if entry is None else entry[0]
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None, expires_at: float | None = None) -> None:
+        """
+        Store a value.
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl: Lifetime in seconds, overrides the cache default
+            expires_at: Absolute expiry epoch, takes precedence over ttl
+        """
+        if expires_at is None:
+            ttl = self.ttl if ttl is None else ttl
+            expires_at = time.time() + ttl if ttl is not None else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        """Remove a single entry if present"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def invalidate_where(self, predicate: Callable[[Hashable], bool]) -> None:
+        """Remove every entry whose key matches the predicate"""
+        with self._lock:
+            for key in [key for key in self._entries if predicate(key)]:
+                del self._entries[key]
+
+    def invalidate_values_where(self, predicate: Callable[[Any], bool]) -> None:
+        """Remove every entry whose value matches the predicate"""
+        with self._lock:
+            for key in [key for key, (value, _) in self._entries.items() if predicate(value)]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        """Remove all entries"""
+        with self._lock:
+            self._entries.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self._get(key, _MISSING) is not _MISSING
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+_MISSING = object()
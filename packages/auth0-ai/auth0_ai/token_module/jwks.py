@@ -0,0 +1,225 @@
+from __future__ import annotations
+import functools
+import threading
+import time
+from concurrent.futures import Executor
+from typing import Any, Dict
+
+import requests
+from auth0.authentication.async_token_verifier import AsyncAsymmetricSignatureVerifier
+from auth0.authentication.token_verifier import JwksFetcher
+from auth0.exceptions import TokenValidationError
+
+from .single_flight import SingleFlight
+from auth0_ai.utils.call_policy import OutboundPolicies
+from auth0_ai.utils.offload import run_blocking
+
+
+class JwksCache:
+    """
+    Shared cache of a tenant's JSON web key set.
+    One instance exists per JWKS URL so every verifier for a tenant reuses the
+    same keys. Keys are refreshed in the background before the TTL runs out and
+    refetched (rate limited) when the set has expired or a token carries an unknown
+    key id. A failed background refresh is retried with exponential backoff.
+    Fetches run under the call policies of the client that triggers them, so
+    clients sharing the cache keep their own timeouts, breakers and admission.
+    """
+    CACHE_TTL = 600  # Lifetime of the key set in seconds
+    REFRESH_AHEAD = 60  # Seconds before expiry at which the background refresh runs
+    MIN_REFETCH_INTERVAL = 30  # Minimum seconds between fetch attempts triggered by verifications
+    RETRY_BACKOFF = 5  # Seconds before retrying a failed background refresh, doubled per failure
+
+    _instances: Dict[str, "JwksCache"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(
+        self,
+        jwks_url: str,
+        cache_ttl: float = CACHE_TTL,
+        refresh_ahead: float = REFRESH_AHEAD,
+        min_refetch_interval: float = MIN_REFETCH_INTERVAL,
+        retry_backoff: float = RETRY_BACKOFF
+    ):
+        """
+        Initialize the key cache.
+        Args:
+            jwks_url: URL of the JSON web key set
+            cache_ttl: Lifetime of the key set in seconds
+            refresh_ahead: Seconds before expiry at which the background refresh runs
+            min_refetch_interval: Minimum seconds between fetch attempts for expired keys or unknown key ids
+            retry_backoff: Seconds before retrying a failed background refresh, doubled per failure
+        """
+        self.jwks_url = jwks_url
+        self.cache_ttl = cache_ttl
+        self.refresh_ahead = refresh_ahead
+        self.min_refetch_interval = min_refetch_interval
+        self.retry_backoff = retry_backoff
+        self._keys: Dict[str, Any] = {}
+        # Last successful fetch, which the TTL runs from, and last attempt, which rate limits fetches
+        self._fetched_at = 0.0
+        self._attempted_at = 0.0
+        self._failures = 0
+        self._closed = False
+        self._lock = threading.Lock()
+        self._fetch_flight = SingleFlight()
+        self._refresh_timer: threading.Timer | None = None
+        # Policies of fetches triggered without a client's own
+        self._call_policies = OutboundPolicies()
+
+    @classmethod
+    def for_url(cls, jwks_url: str) -> "JwksCache":
+        """Get the shared cache for a JWKS URL, creating it on first use"""
+        with cls._instances_lock:
+            cache = cls._instances.get(jwks_url)
+            if cache is None:
+                cache = cls._instances[jwks_url] = cls(jwks_url)
+            return cache
+
+    @classmethod
+    def for_domain(cls, domain: str, protocol: str = "https") -> "JwksCache":
+        """Get the shared cache for an Auth0 tenant domain"""
+        return cls.for_url(f"{protocol}://{domain}/.well-known/jwks.json")
+
+    def prefetch(self, background: bool = True, call_policies: OutboundPolicies | None = None) -> None:
+        """
+        Load the key set ahead of the first verification.
+        Args:
+            background: Fetch on a daemon thread instead of blocking the caller
+            call_policies: Policies the fetch runs under, its "jwks" policy and admission
+        """
+        if background:
+            threading.Thread(target=self._prefetch, args=(call_policies,), daemon=True).start()
+        else:
+            self._prefetch(call_policies)
+
+    def get_key(self, key_id: str, call_policies: OutboundPolicies | None = None) -> Any:
+        """
+        Get the public key for a key id, fetching the key set when needed.
+        Args:
+            key_id: The key id from the token header
+            call_policies: Policies a fetch runs under, its "jwks" policy and admission
+        Returns:
+            The RSA public key
+        Raises:
+            TokenValidationError: when no key with that id exists
+        """
+        if self._is_expired() and self._may_refetch():
+            self._safe_refresh(call_policies)
+        key = self._keys.get(key_id)
+        if key is None and self._may_refetch():
+            self._safe_refresh(call_policies)
+            key = self._keys.get(key_id)
+        if key is None:
+            raise TokenValidationError(
+                f'RSA Public Key with ID "{key_id}" was not found.')
+        return key
+
+    async def get_key_async(
+        self,
+        key_id: str,
+        call_policies: OutboundPolicies | None = None,
+        executor: Executor | None = None
+    ) -> Any:
+        """Async variant of get_key that fetches on the executor, off the event loop"""
+        key = self._keys.get(key_id)
+        if key is not None and not self._is_expired():
+            return key
+        return await run_blocking(executor, self.get_key, key_id, call_policies)
+
+    def close(self) -> None:
+        """Stop the background refresh"""
+        with self._lock:
+            self._closed = True
+            if self._refresh_timer:
+                self._refresh_timer.cancel()
+                self._refresh_timer = None
+
+    def _is_expired(self) -> bool:
+        return self._fetched_at + self.cache_ttl < time.time()
+
+    def _may_refetch(self) -> bool:
+        return time.time() - self._attempted_at >= self.min_refetch_interval
+
+    def _prefetch(self, call_policies: OutboundPolicies | None = None) -> None:
+        if self._is_expired():
+            self._safe_refresh(call_policies)
+
+    def _safe_refresh(self, call_policies: OutboundPolicies | None = None) -> None:
+        """Refresh the key set, keeping the previous keys if the fetch fails"""
+        try:
+            self._fetch_flight.do(self.jwks_url, functools.partial(self._refresh, call_policies or self._call_policies))
+        except Exception:
+            pass
+
+    def _refresh(self, call_policies: OutboundPolicies) -> None:
+        with self._lock:
+            self._attempted_at = time.time()
+        try:
+            # Previous keys are kept (served from cache) while the endpoint's circuit is open
+            keys = call_policies.call("jwks", functools.partial(self._fetch, call_policies.timeout("jwks")))
+        except Exception:
+            with self._lock:
+                self._failures += 1
+            raise
+        else:
+            with self._lock:
+                self._keys = keys
+                self._fetched_at = time.time()
+                self._failures = 0
+        finally:
+            # A failure must not end the chain of background refreshes, which keeps the fetch's policies
+            self._schedule_refresh(call_policies)
+
+    def _fetch(self, timeout: float) -> Dict[str, Any]:
+        response = requests.get(self.jwks_url, timeout=timeout)
+        response.raise_for_status()
+        return JwksFetcher._parse_jwks(response.json())
+
+    def _schedule_refresh(self, call_policies: OutboundPolicies) -> None:
+        """Schedule the next background refresh ahead of the TTL, or sooner to retry a failed one"""
+        with self._lock:
+            if self._closed:
+                return
+            if self._refresh_timer:
+                self._refresh_timer.cancel()
+            delay = self.cache_ttl - self.refresh_ahead
+            if self._failures:
+                delay = min(self.retry_backoff * 2 ** (self._failures - 1), delay)
+            self._refresh_timer = threading.Timer(max(delay, 1), self._safe_refresh, args=(call_policies,))
+            self._refresh_timer.daemon = True
+            self._refresh_timer.start()
+
+
+class JwksSignatureVerifier(AsyncAsymmetricSignatureVerifier):
+    """
+    RS256 signature verifier backed by a shared JwksCache instead of its own fetcher.
+    """
+
+    def __init__(
+        self,
+        jwks_cache: JwksCache,
+        algorithm: str = "RS256",
+        call_policies: OutboundPolicies | None = None,
+        executor: Executor | None = None
+    ):
+        """
+        Initialize the verifier.
+        Args:
+            jwks_cache: Shared key cache for the tenant
+            algorithm: Expected signing algorithm
+            call_policies: This client's policies, key fetches it triggers run under
+            executor: Executor key fetches run on (the loop's default executor if omitted)
+        """
+        super().__init__(jwks_cache.jwks_url, algorithm)
+        self.jwks_cache = jwks_cache
+        self.call_policies = call_policies
+        self.executor = executor
+
+    async def _fetch_key(self, key_id=None):
+        return await self.jwks_cache.get_key_async(key_id, self.call_policies, self.executor)
+
+    def verify_signature_sync(self, token: str) -> Dict[str, Any]:
+        """Verify a token's signature without awaiting, fetching keys synchronously if needed"""
+        kid = self._get_kid(token)
+        return self._decode_jwt(token, self.jwks_cache.get_key(kid, self.call_policies))
@@ -1,25 +1,72 @@
 from __future__ import annotations
-from typing import Any, Dict
+from typing import Any, Dict, Hashable, List
+import asyncio
+import functools
+import hashlib
 import time
+import warnings
 from auth0.authentication import GetToken
-from auth0.authentication.async_token_verifier import AsyncAsymmetricSignatureVerifier
+from auth0.authentication.base import AuthenticationBase
+from auth0.exceptions import Auth0Error
+
+from .cache import TTLCache
+from .refresh_policy import RefreshPolicy
+from .scope_index import ScopeIndex
+from .single_flight import SingleFlight
+from auth0_ai.utils.call_policy import OutboundPolicies
+from auth0_ai.utils.metrics import TOKEN_REFRESHES
+from auth0_ai.utils.offload import run_blocking
+from auth0_ai.utils.tracing import set_attributes, traced
+
+
+# Machine-to-machine tokens are shared by every TokenManager in the process
+_client_credentials_tokens = TTLCache(maxsize=1024, name="client_credentials")
+_client_credentials_flight = SingleFlight()
 
 
 class TokenManager:
     """
     Manages token operations, including exchange, refresh, and validation.
     """
+    # Seconds before a connection token's expiry at which it is no longer served from cache
+    CONNECTION_TOKEN_EXPIRY_MARGIN = 60
+    # Maximum number of verified tokens whose claims are kept in memory
+    VERIFIED_CLAIMS_CACHE_SIZE = 4096
+    # Default lifetime of cached /userinfo responses in seconds
+    USERINFO_TTL = 300
 
-    def __init__(self, auth_client: Any):
+    def __init__(
+        self,
+        auth_client: Any,
+        persist_connection_tokens: bool = False,
+        userinfo_ttl: float = USERINFO_TTL,
+        refresh_policy: RefreshPolicy | None = None,
+        call_policies: OutboundPolicies | None = None
+    ):
         """
         Initialize token manager.
         Args:
             auth_client: Parent AIAuth instance
+            persist_connection_tokens: Whether federated connection tokens are also kept in the user's session
+            userinfo_ttl: Seconds a /userinfo response is served from cache (0 disables caching)
+            refresh_policy: Policy deciding when a token is too close to expiry to hand out
+            call_policies: Timeouts, hedging and circuit breakers for calls to Auth0
         """
         self.auth_client = auth_client
-        self.token_verifier = AsyncAsymmetricSignatureVerifier(
-            jwks_url=f"https://{auth_client.domain}/.well-known/jwks.json"
-        )
+        self.refresh_policy = refresh_policy or RefreshPolicy()
+        self.call_policies = call_policies or OutboundPolicies()
+        self.persist_connection_tokens = persist_connection_tokens
+        # Federated connection tokens keyed by (user, connection, scopes)
+        self._connection_tokens = TTLCache(maxsize=4096, keep_stale=True, name="connection_tokens")
+        # Claims of already verified tokens keyed by token digest, each kept until the token's exp
+        self._verified_claims = TTLCache(maxsize=self.VERIFIED_CLAIMS_CACHE_SIZE, name="verified_claims")
+        # /userinfo responses keyed by access token digest
+        self.userinfo_ttl = userinfo_ttl
+        self._userinfo = TTLCache(maxsize=4096, ttl=userinfo_ttl, keep_stale=True, name="userinfo")
+        # Reuse the parent's verifier so keys are fetched and cached once per tenant
+        self.token_verifier = auth_client.token_verifier
+        # Coalesces concurrent refreshes for the same user, audience and scope
+        self._refresh_flight = SingleFlight()
 
     def exchange_code_for_tokens(self, code: str) -> Dict[str, Any]:
         """
@@ -29,16 +76,15 @@ class TokenManager:
         Returns:
             Dict containing access token, refresh token, and ID token
         """
-        get_token = GetToken(
-            self.auth_client.domain,
-            self.auth_client.client_id,
-            self.auth_client.client_secret
-        )
-        return get_token.authorization_code(
+        return self.call_policies.call("code_exchange", lambda: self._token_client("code_exchange").authorization_code(
             code=code,
             redirect_uri=self.auth_client.redirect_uri,
             grant_type="authorization_code"
-        )
+        ))
+
+    async def exchange_code_for_tokens_async(self, code: str) -> Dict[str, Any]:
+        """Async variant of exchange_code_for_tokens that waits for admission on the event loop"""
+        return await self.call_policies.run_admitted("code_exchange", self.exchange_code_for_tokens, code)
 
     def get_token_set(self, token_data: dict, existing_refresh_token: str | None = None) -> dict:
         """
@@ -49,9 +95,11 @@ class TokenManager:
         Returns:
             Formatted token data with expiry information
         """
+        now = int(time.time())
         return {
             "access_token": token_data.get("access_token"),
-            "expires_at": {"epoch": int(time.time()) + token_data["expires_in"]},
+            "issued_at": {"epoch": now},
+            "expires_at": {"epoch": now + token_data["expires_in"]},
             "refresh_token": token_data.get("refresh_token", existing_refresh_token),
             "id_token": token_data.get("id_token"),
             "scope": token_data.get("scope"),
@@ -66,92 +114,486 @@ class TokenManager:
             Decoded token claims
         """
         try:
-            rest = await self.token_verifier.verify_signature(token)
+            rest = await self.verify_claims(token)
             return rest
         except:
             return None
 
-    def refresh_tokens(self, refresh_token: str, scope: str | None = None) -> Dict[str, Any]:
+    @traced("auth0_ai.token.verify")
+    async def verify_claims(self, token: str) -> Dict[str, Any]:
+        """
+        Verify a token's signature and return its claims.
+        Verified claims are cached by token digest until the token expires, so
+        repeated verifications of the same token skip the RS256 check.
+        Args:
+            token: Signed JWT to verify
+        Returns:
+            Decoded token claims
+        Raises:
+            TokenValidationError: if the token cannot be decoded or its signature is invalid
+        """
+        key = hashlib.sha256(token.encode()).hexdigest()
+        claims = self._verified_claims.get(key)
+        if claims is None:
+            claims = await self.token_verifier.verify_signature(token)
+            self._cache_verified_claims(key, claims)
+        return dict(claims)
+
+    def _cache_verified_claims(self, key: str, claims: Dict[str, Any]) -> None:
+        """Cache verified claims, capped at the token's exp. Tokens without exp are not cached."""
+        exp = claims.get("exp")
+        if isinstance(exp, (int, float)) and exp > time.time():
+            self._verified_claims.set(key, dict(claims), expires_at=exp)
+
+    @traced("auth0_ai.token.refresh")
+    def refresh_tokens(
+        self,
+        refresh_token: str,
+        scope: str | None = None,
+        user_id: str | None = None,
+        audience: str | None = None
+    ) -> Dict[str, Any]:
         """
         Refresh access token using refresh token.
+        Concurrent refreshes for the same (user, audience, scope) share a single
+        request to Auth0 and all receive its result.
+        Args:
+            refresh_token: Refresh token to use
+            scope: Optional scope to request
+            user_id: Optional ID of the user the refresh token belongs to
+            audience: Optional audience the refreshed token is for
+        Returns:
+            New token set
+        """
+        set_attributes(audience=audience, scope=scope)
+        key = self._refresh_key(refresh_token, scope, user_id, audience)
+        return self._refresh_flight.do(key, lambda: self._request_refresh(refresh_token, scope, audience))
+
+    @traced("auth0_ai.token.refresh")
+    async def refresh_tokens_async(
+        self,
+        refresh_token: str,
+        scope: str | None = None,
+        user_id: str | None = None,
+        audience: str | None = None
+    ) -> Dict[str, Any]:
+        """
+        Async variant of refresh_tokens that does not block the event loop.
+        Shares in-flight refreshes with sync callers.
         Args:
             refresh_token: Refresh token to use
+            scope: Optional scope to request
+            user_id: Optional ID of the user the refresh token belongs to
+            audience: Optional audience the refreshed token is for
         Returns:
             New token set
         """
-        token_client = GetToken(
+        set_attributes(audience=audience, scope=scope)
+        key = self._refresh_key(refresh_token, scope, user_id, audience)
+        return await self._refresh_flight.do_async(
+            key, lambda: self._request_refresh(refresh_token, scope, audience),
+            run=functools.partial(self.call_policies.run_admitted, "refresh"))
+
+    @traced("auth0_ai.token.refresh_many")
+    async def refresh_many(
+        self,
+        user_ids: List[str],
+        audience: str | None = None,
+        scope: str | None = None,
+        concurrency: int = 10
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Refresh the tokens of many users with bounded concurrency.
+        Sessions are read and written back through bulk store operations.
+        Args:
+            user_ids: IDs of the users whose tokens to refresh
+            audience: Optional audience the refreshed tokens are for
+            scope: Optional scope to request
+            concurrency: Maximum number of refreshes in flight at once
+        Returns:
+            Dict keyed by user ID containing is_successful and, on failure, the error
+        """
+        set_attributes(audience=audience, scope=scope, batch_size=len(user_ids))
+        session_manager = self.auth_client.session_manager
+        versions = {user_id: session_manager._session_version(user_id) for user_id in user_ids}
+        stored_sessions = await run_blocking(
+            self.call_policies.offload_executor, session_manager._get_many_stored_sessions, list(user_ids))
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def refresh_one(user_id: str) -> Dict[str, Any]:
+            session = session_manager._decode_session(
+                stored_sessions.get(user_id), check_expiry=False)
+            refresh_token = session.get("refresh_token") if session else None
+            if not refresh_token:
+                return {"error": "no refresh token in session"}
+            async with semaphore:
+                try:
+                    token_data = await self.refresh_tokens_async(
+                        refresh_token, scope=scope, user_id=user_id, audience=audience)
+                except Exception as error:
+                    return {"error": str(error)}
+            if not token_data:
+                return {"error": "empty token response"}
+            return {"token_data": token_data}
+
+        outcomes = dict(zip(user_ids, await asyncio.gather(
+            *[refresh_one(user_id) for user_id in user_ids])))
+
+        refreshed = {user_id: outcome["token_data"]
+                     for user_id, outcome in outcomes.items() if "token_data" in outcome}
+        if refreshed:
+            try:
+                _, errors = await session_manager.set_encrypted_sessions(
+                    refreshed, existing_sessions=stored_sessions, versions=versions)
+            except Exception as error:
+                errors = {user_id: str(error) for user_id in refreshed}
+            for user_id, error in errors.items():
+                outcomes[user_id] = {"error": f"failed to store session: {error}"}
+
+        return {
+            user_id: {"is_successful": "token_data" in outcome, "error": outcome.get("error")}
+            for user_id, outcome in outcomes.items()
+        }
+
+    def _request_refresh(
+        self,
+        refresh_token: str,
+        scope: str | None = None,
+        audience: str | None = None
+    ) -> Dict[str, Any]:
+        """Perform the refresh token grant against Auth0, for the given audience if any"""
+        token_client = self._token_client("refresh")
+        if audience:
+            # GetToken.refresh_token cannot send an audience
+            request = lambda: token_client.authenticated_post(f"{self.auth_client.base_url}/oauth/token", data={
+                "client_id": self.auth_client.client_id,
+                "refresh_token": refresh_token,
+                "scope": scope or "",
+                "audience": audience,
+                "grant_type": "refresh_token",
+            })
+        else:
+            request = lambda: token_client.refresh_token(refresh_token=refresh_token, scope=scope or "")
+        try:
+            token_data = self.call_policies.call("refresh", request)
+        except Exception:
+            TOKEN_REFRESHES.inc(outcome="failure")
+            raise
+        TOKEN_REFRESHES.inc(outcome="success")
+        return token_data
+
+    def _token_client(self, endpoint: str) -> GetToken:
+        """Build a token endpoint client using the endpoint's timeout"""
+        return GetToken(
+            self.auth_client.domain,
+            self.auth_client.client_id,
+            self.auth_client.client_secret,
+            timeout=self.call_policies.timeout(endpoint),
+            protocol=self.auth_client.protocol
+        )
+
+    def _rest_client(self, endpoint: str) -> AuthenticationBase:
+        """Build a plain Auth0 client using the endpoint's timeout"""
+        return AuthenticationBase(
             self.auth_client.domain,
             self.auth_client.client_id,
-            self.auth_client.client_secret
+            self.auth_client.client_secret,
+            timeout=self.call_policies.timeout(endpoint),
+            protocol=self.auth_client.protocol
         )
-        return token_client.refresh_token(refresh_token=refresh_token, scope=scope)
+
+    def _refresh_key(
+        self,
+        refresh_token: str,
+        scope: str | None,
+        user_id: str | None,
+        audience: str | None
+    ) -> Hashable:
+        """Build the single-flight key for a refresh, falling back to the refresh token digest when no user is given"""
+        subject = user_id or hashlib.sha256(str(refresh_token).encode()).hexdigest()
+        normalized_scope = " ".join(sorted(set(scope.split()))) if scope else None
+        return (subject, audience, normalized_scope)
 
     def get_3rd_party_token(self, connection: str) -> dict[str, Any]:
         return self.get_upstream_token(connection, self.get_refresh_token())
 
-    def tokeninfo(self) -> dict[str, Any]:
-        id_token = self.get_id_token()
-        self.parent.post()
-        data: dict[str, Any] = self.parent.get(
-            url=f"https://{self.parent.domain}/tokeninfo",
-            headers={"Authorization": f"Bearer {access_token}"},
-        )
-        return data
+    async def introspect(self, token: str, token_data: Dict[str, Any] | None = None) -> Dict[str, Any]:
+        """
+        Describe a token locally: whether it is active, its subject, audience, scopes and expiry.
+        JWTs are read from their verified claims (cached per token), so no call to Auth0 is
+        made once the tenant's keys are cached. Opaque tokens are described from token_data
+        when given (e.g. the session's token entry), otherwise /userinfo is asked.
+        Args:
+            token: Access or ID token
+            token_data: Optional stored token entry with aud, scope and expires_at
+        Returns:
+            Dict with active, sub, aud, scope, exp and iat (keys unknown for a token are omitted)
+        """
+        if self._is_jwt(token):
+            try:
+                claims = await self.verify_claims(token)
+            except Exception:
+                return {"active": False}
+            info = {key: claims[key] for key in ("sub", "aud", "iss", "azp", "exp", "iat") if key in claims}
+            if "scope" in claims or "permissions" in claims:
+                info["scope"] = claims.get("scope") or " ".join(claims.get("permissions", []))
+            info["active"] = isinstance(claims.get("exp"), (int, float)) and claims["exp"] > time.time()
+            return info
+
+        if token_data is not None:
+            expiry = (token_data.get("expires_at") or {}).get("epoch")
+            info = {"active": bool(expiry) and expiry > time.time(), "aud": token_data.get("aud"),
+                    "scope": token_data.get("scope"), "exp": expiry}
+            return {key: value for key, value in info.items() if value is not None}
 
+        # Opaque token without local metadata: only Auth0 can tell whether it is still accepted
+        try:
+            profile = await self.get_userinfo_async(token)
+        except Auth0Error as error:
+            if getattr(error, "status_code", None) in (401, 403):
+                return {"active": False}
+            raise
+        return {"active": True, "sub": profile.get("sub")}
+
+    @staticmethod
+    def _is_jwt(token: str) -> bool:
+        """JWS compact tokens have three segments; anything else (opaque, JWE) is treated as opaque"""
+        return isinstance(token, str) and token.count(".") == 2
+
+    @traced("auth0_ai.token.federated_exchange")
     def get_upstream_token(
         self,
         connection: str,
         refresh_token: str,
-        additional_scopes: str | None = None
+        additional_scopes: str | None = None,
+        user_id: str | None = None
     ) -> Dict[str, Any]:
         """
         Get token for federated connection.
+        Tokens are cached per (user, connection, scopes) until shortly before
+        the returned expires_in elapses.
         Args:
             connection: Name of the connection (e.g., 'github')
             refresh_token: Refresh token to use
-            additional_scopes: Optional additional scopes to request
+            additional_scopes: Deprecated. The federated exchange takes no scopes, the token
+                carries those granted when the connection was linked.
+            user_id: Optional ID of the user the refresh token belongs to
         Returns:
             Token for the federated connection
         """
-        token_client = GetToken(
-            self.auth_client.domain,
-            self.auth_client.client_id,
-            self.auth_client.client_secret
-        )
-        return token_client.access_token_for_connection(
-            subject_token_type="urn:ietf:params:oauth:token-type:refresh_token",
-            subject_token=refresh_token,
-            requested_token_type="http://auth0.com/oauth/token-type/federated-connection-access-token",
-            connection=connection,
-            grant_type="urn:auth0:params:oauth:grant-type:token-exchange:federated-connection-access-token"
+        if additional_scopes is not None:
+            warnings.warn(
+                "additional_scopes is deprecated and has no effect: the federated connection token "
+                "carries the scopes granted when the connection was linked.",
+                DeprecationWarning, stacklevel=2)
+        set_attributes(connection=connection, scope=additional_scopes)
+        key = self._connection_token_key(connection, refresh_token, additional_scopes, user_id)
+        cached = self._connection_tokens.get(key)
+        if cached:
+            return cached
+
+        if self.persist_connection_tokens and user_id:
+            persisted = self._get_persisted_connection_token(user_id, connection)
+            if persisted:
+                self._connection_tokens.set(
+                    key, persisted, expires_at=persisted["expires_at"]["epoch"] - self.CONNECTION_TOKEN_EXPIRY_MARGIN)
+                return persisted
+
+        served_stale = False
+
+        def stale_token() -> Dict[str, Any] | None:
+            # While the endpoint is degraded, serve a cached token that has not actually expired yet
+            nonlocal served_stale
+            token = self._unexpired(self._connection_tokens.get_stale(key))
+            served_stale = token is not None
+            return token
+
+        token = self.call_policies.call(
+            "federated_exchange",
+            lambda: self._token_client("federated_exchange").access_token_for_connection(
+                subject_token_type="urn:ietf:params:oauth:token-type:refresh_token",
+                subject_token=refresh_token,
+                requested_token_type="http://auth0.com/oauth/token-type/federated-connection-access-token",
+                connection=connection,
+                grant_type="urn:auth0:params:oauth:grant-type:token-exchange:federated-connection-access-token"
+            ),
+            fallback=stale_token
         )
+        if served_stale:
+            return token
+
+        expires_in = token.get("expires_in") if isinstance(token, dict) else None
+        if expires_in and expires_in > self.CONNECTION_TOKEN_EXPIRY_MARGIN:
+            now = int(time.time())
+            token = {**token, "issued_at": {"epoch": now}, "expires_at": {"epoch": now + expires_in}}
+            self._connection_tokens.set(
+                key, token, ttl=expires_in - self.CONNECTION_TOKEN_EXPIRY_MARGIN)
+            if self.persist_connection_tokens and user_id:
+                self.auth_client.session_manager.set_connection_token(
+                    user_id, connection, token)
+        return token
+
+    @traced("auth0_ai.token.client_credentials")
+    def get_client_credentials_token(self, audience: str, scope: str | None = None) -> Dict[str, Any]:
+        """
+        Get a machine-to-machine token for an API using the client credentials grant.
+        Tokens are cached in-process per (tenant, client, audience, scope), refreshed
+        ahead of expiry according to the refresh policy, and concurrent fetches for
+        the same key share a single request.
+        Args:
+            audience: API audience
+            scope: Optional space separated scopes
+        Returns:
+            Token data including access_token and expires_at
+        """
+        set_attributes(audience=audience, scope=scope)
+        key = self._client_credentials_key(audience, scope)
+        token = _client_credentials_tokens.get(key)
+        if token and self.validate_tokens(token):
+            return token
+        return _client_credentials_flight.do(
+            key, lambda: self._request_client_credentials(key, audience, scope))
+
+    @traced("auth0_ai.token.client_credentials")
+    async def get_client_credentials_token_async(self, audience: str, scope: str | None = None) -> Dict[str, Any]:
+        """Async variant of get_client_credentials_token that fetches off the event loop"""
+        set_attributes(audience=audience, scope=scope)
+        key = self._client_credentials_key(audience, scope)
+        token = _client_credentials_tokens.get(key)
+        if token and self.validate_tokens(token):
+            return token
+        return await _client_credentials_flight.do_async(
+            key, lambda: self._request_client_credentials(key, audience, scope),
+            run=functools.partial(self.call_policies.run_admitted, "client_credentials"))
+
+    def _request_client_credentials(self, key: Hashable, audience: str, scope: str | None) -> Dict[str, Any]:
+        """Perform the client credentials grant and cache the result until it expires"""
+        data = {
+            "client_id": self.auth_client.client_id,
+            "audience": audience,
+            "grant_type": "client_credentials",
+        }
+        if scope:
+            data["scope"] = scope
+        token_client = self._token_client("client_credentials")
+        token = self.call_policies.call("client_credentials", lambda: token_client.authenticated_post(
+            f"{self.auth_client.base_url}/oauth/token", data=data))
+        issued_at = int(time.time())
+        expires_at = issued_at + token["expires_in"]
+        token = {**token, "issued_at": {"epoch": issued_at}, "expires_at": {"epoch": expires_at}}
+        _client_credentials_tokens.set(key, token, expires_at=expires_at)
+        return token
+
+    def _client_credentials_key(self, audience: str, scope: str | None) -> Hashable:
+        normalized_scope = " ".join(sorted(set(scope.split()))) if scope else None
+        return (self.auth_client.domain, self.auth_client.client_id, audience, normalized_scope)
+
+    def invalidate_upstream_tokens(self, user_id: str, connection: str | None = None) -> None:
+        """
+        Drop cached federated connection tokens for a user.
+        Args:
+            user_id: ID of the user
+            connection: Optional connection to drop, all of the user's connections if omitted
+        """
+        self._connection_tokens.invalidate_where(
+            lambda key: key[0] == user_id and (connection is None or key[1] == connection))
+
+    def _unexpired(self, token: Dict[str, Any] | None) -> Dict[str, Any] | None:
+        """Return the token if its hard expiry has not passed"""
+        if token and token.get("expires_at", {}).get("epoch", 0) > time.time():
+            return token
+        return None
 
+    def _connection_token_key(
+        self,
+        connection: str,
+        refresh_token: str,
+        additional_scopes: str | None,
+        user_id: str | None
+    ) -> Hashable:
+        """Build the cache key for a federated connection token"""
+        subject = user_id or hashlib.sha256(str(refresh_token).encode()).hexdigest()
+        scopes = " ".join(sorted(set(additional_scopes.split()))) if additional_scopes else None
+        return (subject, connection, scopes)
+
+    def _get_persisted_connection_token(self, user_id: str, connection: str) -> Dict[str, Any] | None:
+        """Read a still valid connection token from the user's session"""
+        token = self.auth_client.session_manager.get_connection_token(user_id, connection)
+        if token and self.validate_tokens(token):
+            return token
+        return None
+
+    @traced("auth0_ai.token.userinfo")
     def get_userinfo(self, access_token: str) -> Dict[str, Any]:
         """
         Get user information using access token.
+        Responses are cached per access token until the TTL elapses
+        or the user's session changes.
+        Args:
+            access_token: Access token to use
+        Returns:
+            User profile information
+        """
+        key = self._userinfo_key(access_token)
+        profile = self._userinfo.get(key)
+        if profile is None:
+            profile = self._request_userinfo(access_token, key)
+            self._cache_userinfo(key, profile)
+        return profile
+
+    @traced("auth0_ai.token.userinfo")
+    async def get_userinfo_async(self, access_token: str) -> Dict[str, Any]:
+        """
+        Async variant of get_userinfo that does not block the event loop on a cache miss.
         Args:
             access_token: Access token to use
         Returns:
             User profile information
         """
-        return self.auth_client.get(
-            url=f"https://{self.auth_client.domain}/userinfo",
+        key = self._userinfo_key(access_token)
+        profile = self._userinfo.get(key)
+        if profile is None:
+            profile = await self.call_policies.run_admitted("userinfo", self._request_userinfo, access_token, key)
+            self._cache_userinfo(key, profile)
+        return profile
+
+    def invalidate_userinfo(self, user_id: str) -> None:
+        """Drop the cached /userinfo responses for a user"""
+        self._userinfo.invalidate_values_where(
+            lambda profile: isinstance(profile, dict) and profile.get("sub") == user_id)
+
+    def _request_userinfo(self, access_token: str, key: Hashable) -> Dict[str, Any]:
+        # While the endpoint is degraded, serve the last known profile
+        return self.call_policies.call("userinfo", lambda: self._rest_client("userinfo").get(
+            url=f"{self.auth_client.base_url}/userinfo",
             headers={"Authorization": f"Bearer {access_token}"}
-        )
+        ), fallback=lambda: self._userinfo.get_stale(key))
+
+    def _cache_userinfo(self, key: Hashable, profile: Dict[str, Any]) -> None:
+        if self.userinfo_ttl and isinstance(profile, dict):
+            self._userinfo.set(key, profile)
+
+    def _userinfo_key(self, access_token: str) -> Hashable:
+        """
+        Key userinfo by the digest of the whole token. The token's unverified sub must
+        not be used: anyone could forge a token with another user's sub to read their profile.
+        """
+        return ("token", hashlib.sha256(str(access_token).encode()).hexdigest())
 
     async def get_tokeninfo(self, id_token: str, access_token: str) -> Dict[str, Any]:
         """
-        Get detailed token information.
+        Get detailed token information from Auth0's /tokeninfo endpoint.
+        Prefer introspect, which answers from the verified claims without a network call.
         Args:
             id_token: ID token
             access_token: Access token
         Returns:
             Detailed token information
         """
-        return await self.auth_client.get(
-            url=f"https://{self.auth_client.domain}/tokeninfo",
+        return await self.call_policies.call_async("tokeninfo", lambda: self._rest_client("tokeninfo").get(
+            url=f"{self.auth_client.base_url}/tokeninfo",
             headers={"Authorization": f"Bearer {access_token}"}
-        )
+        ))
 
     def validate_tokens(self, token_data: Dict[str, Any]) -> bool:
         """
@@ -164,7 +606,8 @@ class TokenManager:
         if not token_data.get("expires_at"):
             return False
         expiry = token_data["expires_at"].get("epoch", 0)
-        return time.time() < expiry
+        issued_at = (token_data.get("issued_at") or {}).get("epoch")
+        return self.refresh_policy.is_fresh(expiry, key=token_data.get("access_token"), issued_at=issued_at)
 
     # Session Token Methods (used in User.py)
     def get_id_token(self, user_id: str) -> Dict[str, Any]:
@@ -179,23 +622,48 @@ class TokenManager:
         else:
             return {"user_id not found in session store"}
 
-    def get_access_token(self, user_id: str, aud: str | None = None) -> Dict[str, Any]:
-        aud = aud or f"https://{self.auth_client.domain}/userinfo"
+    def get_token_data(
+        self,
+        user_id: str,
+        aud: str | None = None,
+        scope: str | None = None
+    ) -> Dict[str, Any] | None:
+        """
+        Get a still valid stored token entry for the audience covering the requested scopes.
+        Args:
+            user_id: User whose session is searched
+            aud: Audience, defaults to the tenant's /userinfo
+            scope: Optional space separated scopes the token must cover
+        Returns:
+            The token entry or None
+        """
+        aud = aud or f"{self.auth_client.base_url}/userinfo"
+        if user_id not in self.auth_client.session_manager._get_stored_sessions():
+            return None
+        session = self.auth_client.session_manager.get_encrypted_session(user_id)
+        if not isinstance(session, dict):
+            return None
+        # Any unexpired token whose scopes cover the requested ones will do
+        return ScopeIndex(session.get("tokens")).find(aud, scope, is_valid=self.validate_tokens)
+
+    def get_access_token(self, user_id: str, aud: str | None = None, scope: str | None = None) -> Dict[str, Any]:
         if user_id in self.auth_client.session_manager._get_stored_sessions():
-            for token in self.auth_client.session_manager.get_encrypted_session(user_id).get("tokens"):
-                if token.get('aud') == aud and token.get("expires_at").get("epoch") > time.time():
-                    return token.get("access_token")
+            token = self.get_token_data(user_id, aud=aud, scope=scope)
+            if token:
+                return token.get("access_token")
             return {"no valid tokens found"}
         else:
             return {"user_id not found in session store"}
 
-    def get_new_token_url(self, audience: str, scope: str, return_to: str) -> Dict[str, Any]:
+    def get_new_token_url(self, audience: str, scope: str, return_to: str | None = None) -> Dict[str, Any]:
         state = self.auth_client._generate_state(return_to=return_to)
+        # Without return_to the callback answers with its completion message
+        kwargs = {"return_to": return_to} if return_to else {}
         url = self.auth_client.url_builder.get_authorize_url(
             state=state,
             audience=audience,
             scope=scope,
-            return_to=return_to
+            **kwargs
         )
         return url
 
@@ -0,0 +1,81 @@
+from __future__ import annotations
+import random
+import time
+from typing import Hashable
+
+
+class RefreshPolicy:
+    """
+    Decides when a token is too close to expiry to be handed out.
+    A token stops being fresh at expires_at - skew - refresh_ahead - jitter,
+    where jitter is a random offset in [0, jitter] that is stable per token so
+    a cohort of tokens expiring in the same second is refreshed spread out.
+    When the token's issue time is known, that window is scaled down to at most
+    max_lifetime_fraction of its lifetime, so short-lived tokens are still used.
+    """
+
+    def __init__(
+        self,
+        skew: float = 10,
+        refresh_ahead: float = 30,
+        jitter: float = 20,
+        max_lifetime_fraction: float = 0.5
+    ):
+        """
+        Initialize the refresh policy.
+        Args:
+            skew: Allowance in seconds for clock differences with Auth0 and downstream APIs
+            refresh_ahead: Seconds before expiry at which a token is refreshed
+            jitter: Upper bound in seconds of the random extra refresh-ahead per token
+            max_lifetime_fraction: Largest fraction of a token's lifetime spent in the refresh window
+        """
+        self.skew = skew
+        self.refresh_ahead = refresh_ahead
+        self.jitter = jitter
+        self.max_lifetime_fraction = max_lifetime_fraction
+
+    def refresh_at(self, expires_at: float, key: Hashable | None = None, issued_at: float | None = None) -> float:
+        """
+        Get the epoch from which a token should be refreshed instead of used.
+        Args:
+            expires_at: Token expiry epoch
+            key: Optional value identifying the token (e.g. the token itself) used to seed its jitter
+            issued_at: Optional token issue epoch, bounding the window by the token's lifetime
+        Returns:
+            Epoch at which the token should be refreshed
+        """
+        window = self.skew + self.refresh_ahead + self._jitter(expires_at, key)
+        if issued_at is not None and expires_at > issued_at:
+            # Scaled rather than clipped, so the jitter still spreads short-lived tokens out
+            limit = (expires_at - issued_at) * self.max_lifetime_fraction
+            full_window = self.skew + self.refresh_ahead + self.jitter
+            if full_window > limit:
+                window *= limit / full_window
+        return expires_at - window
+
+    def is_fresh(
+        self,
+        expires_at: float | None,
+        key: Hashable | None = None,
+        now: float | None = None,
+        issued_at: float | None = None
+    ) -> bool:
+        """
+        Check whether a token can still be handed out.
+        Args:
+            expires_at: Token expiry epoch
+            key: Optional value identifying the token used to seed its jitter
+            now: Optional current epoch, defaults to time.time()
+            issued_at: Optional token issue epoch, bounding the window by the token's lifetime
+        Returns:
+            True if the token is not yet due for refresh
+        """
+        if not expires_at:
+            return False
+        now = time.time() if now is None else now
+        return now < self.refresh_at(expires_at, key, issued_at)
+
+    def _jitter(self, expires_at: float, key: Hashable | None) -> float:
+        if not self.jitter:
+            return 0.0
+        return random.Random(f"{key}:{expires_at}").uniform(0, self.jitter)
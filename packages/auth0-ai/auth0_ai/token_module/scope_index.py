@@ -0,0 +1,57 @@
+from __future__ import annotations
+from typing import Any, Callable, Dict, Iterable, List
+
+
+class ScopeIndex:
+    """
+    Per-audience index of cached tokens by granted scopes.
+    Finds a token whose scopes are a superset of the requested ones, so a
+    request for a subset of an existing token's scopes reuses that token.
+    """
+
+    def __init__(self, tokens: Iterable[Dict[str, Any]] | None = None):
+        """
+        Initialize the index.
+        Args:
+            tokens: Session token entries with aud, scope and expires_at
+        """
+        self._by_audience: Dict[str, List[tuple[frozenset, Dict[str, Any]]]] = {}
+        for token in tokens or []:
+            self.add(token)
+
+    def add(self, token: Dict[str, Any]) -> None:
+        """Index a token under each of its audiences"""
+        audiences = token.get("aud")
+        if not isinstance(audiences, list):
+            audiences = [audiences]
+        scopes = frozenset((token.get("scope") or "").split())
+        for audience in audiences:
+            self._by_audience.setdefault(audience, []).append((scopes, token))
+
+    def find(
+        self,
+        audience: str,
+        scope: str | None = None,
+        is_valid: Callable[[Dict[str, Any]], bool] | None = None
+    ) -> Dict[str, Any] | None:
+        """
+        Find a token for the audience covering the requested scopes.
+        Among matches the one with the fewest extra scopes is preferred, then the
+        one expiring last.
+        Args:
+            audience: Requested audience
+            scope: Requested space separated scopes
+            is_valid: Optional predicate a token must satisfy (e.g. not expired)
+        Returns:
+            The matching token or None
+        """
+        requested = frozenset((scope or "").split())
+        matches = [
+            (scopes, token) for scopes, token in self._by_audience.get(audience, [])
+            if requested <= scopes and (is_valid is None or is_valid(token))
+        ]
+        if not matches:
+            return None
+        _, token = min(matches, key=lambda match: (
+            len(match[0]), -match[1].get("expires_at", {}).get("epoch", 0)))
+        return token
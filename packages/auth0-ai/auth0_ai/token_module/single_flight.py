@@ -0,0 +1,107 @@
+from __future__ import annotations
+import asyncio
+import threading
+from concurrent.futures import Executor, Future
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+from auth0_ai.utils.offload import run_blocking
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key into a single in-flight call.
+    The first caller for a key runs the function, every caller that arrives
+    while it is running waits for and receives the same result (or error).
+    Sync and async callers share the same flights.
+    """
+
+    def __init__(self):
+        """Initialize an empty flight group."""
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Future] = {}
+
+    def _join(self, key: Hashable) -> tuple[Future, bool]:
+        """
+        Get the in-flight call for a key, registering a new one if needed.
+        Returns:
+            The call future and whether the caller is the leader
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                return call, False
+            call = Future()
+            self._calls[key] = call
+            return call, True
+
+    def _finish(self, key: Hashable, call: Future, fn: Callable[[], Any]) -> None:
+        """Run the leader's function and publish its outcome to all waiters."""
+        if not call.set_running_or_notify_cancel():
+            # Abandoned before it started, see do_async
+            return
+        try:
+            result = fn()
+        except BaseException as error:
+            call.set_exception(error)
+        else:
+            call.set_result(result)
+        finally:
+            self._forget(key, call)
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Run fn once for all concurrent sync callers of the same key.
+        Args:
+            key: Identifies the call to coalesce
+            fn: Blocking function to run
+        Returns:
+            The result of the shared call
+        """
+        call, is_leader = self._join(key)
+        if is_leader:
+            self._finish(key, call, fn)
+        return call.result()
+
+    async def do_async(
+        self,
+        key: Hashable,
+        fn: Callable[[], Any],
+        executor: Executor | None = None,
+        run: Callable[..., Awaitable[Any]] | None = None
+    ) -> Any:
+        """
+        Run fn once for all concurrent sync and async callers of the same key.
+        The blocking function runs in an executor so the event loop is not
+        blocked while waiting.
+        Args:
+            key: Identifies the call to coalesce
+            fn: Blocking function to run
+            executor: Executor to run fn on, defaults to the loop's default executor
+            run: Optional coroutine function running a blocking function off the event loop,
+                e.g. OutboundPolicies.run_admitted, used instead of executor
+        Returns:
+            The result of the shared call
+        """
+        call, is_leader = self._join(key)
+        if is_leader:
+            try:
+                if run is not None:
+                    await run(self._finish, key, call, fn)
+                else:
+                    await run_blocking(executor, self._finish, key, call, fn)
+            except asyncio.CancelledError:
+                # Cancelled before fn started (e.g. while queued): fail the flight instead of leaving it hanging
+                if call.cancel():
+                    self._forget(key, call)
+                raise
+        return await asyncio.wrap_future(call)
+
+    def _forget(self, key: Hashable, call: Future) -> None:
+        with self._lock:
+            if self._calls.get(key) is call:
+                del self._calls[key]
+
+    def in_flight(self, key: Hashable) -> bool:
+        """Check whether a call for the key is currently running"""
+        with self._lock:
+            return key in self._calls
@@ -1,7 +1,15 @@
 """
 Auth0 AI Utilities Module
-Provides utility functions and helpers for URL building and other common operations.
+Provides utility functions and helpers for URL building, outbound call policies, admission control, metrics and other common operations.
 """
+from .admission import AdmissionController, RateLimitedError, TokenBucket
+from .call_policy import CallPolicy, CircuitBreaker, CircuitOpenError, OutboundPolicies
+from .metrics import Counter, Histogram, MetricsRegistry, REGISTRY
+from .offload import run_blocking
+from .timing import StageTimings
 from .url_builder import URLBuilder
 
-__all__ = ["URLBuilder"]
+__all__ = [
+    "AdmissionController", "CallPolicy", "CircuitBreaker", "CircuitOpenError", "Counter", "Histogram", "MetricsRegistry", "OutboundPolicies",
+    "RateLimitedError", "REGISTRY", "StageTimings", "TokenBucket", "URLBuilder", "run_blocking",
+]
@@ -0,0 +1,161 @@
+from __future__ import annotations
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Tuple
+
+from .metrics import ADMISSIONS
+
+
+class RateLimitedError(Exception):
+    """Raised when a request is shed because admitting it would exceed its deadline."""
+
+    def __init__(self, limiter: str, scope: str, retry_after: float):
+        super().__init__(f"Rate limit of '{limiter}' exceeded ({scope}), retry in {retry_after:.1f}s.")
+        self.limiter = limiter
+        self.scope = scope
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """
+    Token bucket refilled at rate tokens per second, holding at most burst tokens.
+    Tokens are reserved ahead of time: a request arriving at an empty bucket is given
+    the delay after which its token will exist, which queues it without holding a lock.
+    """
+
+    def __init__(self, rate: float, burst: float | None = None):
+        """
+        Initialize the bucket, full.
+        Args:
+            rate: Tokens added per second
+            burst: Bucket size, the number of requests admitted at once (rate if omitted, at least 1)
+        """
+        self.rate = rate
+        self.burst = burst if burst is not None else max(rate, 1.0)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, max_wait: float) -> Tuple[bool, float]:
+        """
+        Reserve one token.
+        Args:
+            max_wait: Maximum seconds the caller will wait for the token
+        Returns:
+            (True, delay until the token is available) if it is reserved, or
+            (False, delay it would have needed) if that exceeds max_wait
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            delay = max(1.0 - self._tokens, 0.0) / self.rate
+            if delay > max_wait:
+                return False, delay
+            self._tokens -= 1.0
+            return True, delay
+
+    def refund(self) -> None:
+        """Give back a reserved token that was not used"""
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + 1.0)
+
+
+class AdmissionController:
+    """
+    Admission control with a global token bucket and one bucket per client.
+    A request is admitted when both buckets have a token for it, waiting up to
+    max_wait for them; otherwise it is rejected with RateLimitedError right away,
+    so overload is shed before any work is done instead of queueing without bound.
+    """
+    # Maximum number of per-client buckets kept, least recently used ones are dropped
+    MAX_CLIENTS = 10000
+
+    def __init__(
+        self,
+        rate: float | None = None,
+        burst: float | None = None,
+        per_client_rate: float | None = None,
+        per_client_burst: float | None = None,
+        max_wait: float = 1.0,
+        max_clients: int = MAX_CLIENTS,
+        name: str = "admission"
+    ):
+        """
+        Initialize the controller.
+        Args:
+            rate: Requests per second admitted in total (unlimited if omitted)
+            burst: Requests admitted at once in total (rate if omitted)
+            per_client_rate: Requests per second admitted per client (unlimited if omitted)
+            per_client_burst: Requests admitted at once per client (per_client_rate if omitted)
+            max_wait: Seconds a request may be queued before it is rejected instead
+            max_clients: Maximum number of per-client buckets kept
+            name: Name of the controller in errors and metrics
+        """
+        self.name = name
+        self.max_wait = max_wait
+        self.max_clients = max_clients
+        self.per_client_rate = per_client_rate
+        self.per_client_burst = per_client_burst
+        self._global = TokenBucket(rate, burst) if rate else None
+        # An evicted bucket was idle long enough to be full, so dropping it changes nothing
+        self._clients: OrderedDict[str, TokenBucket] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def reserve(self, client: str | None = None) -> float:
+        """
+        Reserve admission for a request.
+        Args:
+            client: Client the request is accounted to, e.g. an IP address or an endpoint
+        Returns:
+            Seconds the request must wait before proceeding
+        Raises:
+            RateLimitedError: if the request cannot be admitted within max_wait
+        """
+        client_bucket = self._client_bucket(client)
+        client_delay = 0.0
+        if client_bucket is not None:
+            admitted, client_delay = client_bucket.reserve(self.max_wait)
+            if not admitted:
+                self._reject("client", client_delay)
+        global_delay = 0.0
+        if self._global is not None:
+            admitted, global_delay = self._global.reserve(self.max_wait)
+            if not admitted:
+                if client_bucket is not None:
+                    client_bucket.refund()
+                self._reject("global", global_delay)
+        delay = max(client_delay, global_delay)
+        ADMISSIONS.inc(limiter=self.name, outcome="queued" if delay else "admitted")
+        return delay
+
+    def acquire(self, client: str | None = None) -> None:
+        """Wait until a request is admitted, blocking the calling thread"""
+        delay = self.reserve(client)
+        if delay:
+            time.sleep(delay)
+
+    async def acquire_async(self, client: str | None = None) -> None:
+        """Wait until a request is admitted, without blocking the event loop"""
+        delay = self.reserve(client)
+        if delay:
+            await asyncio.sleep(delay)
+
+    def _client_bucket(self, client: str | None) -> TokenBucket | None:
+        if not self.per_client_rate or client is None:
+            return None
+        with self._lock:
+            bucket = self._clients.get(client)
+            if bucket is None:
+                bucket = self._clients[client] = TokenBucket(self.per_client_rate, self.per_client_burst)
+                if len(self._clients) > self.max_clients:
+                    self._clients.popitem(last=False)
+            else:
+                self._clients.move_to_end(client)
+            return bucket
+
+    def _reject(self, scope: str, delay: float) -> None:
+        ADMISSIONS.inc(limiter=self.name, outcome="rejected")
+        raise RateLimitedError(self.name, scope, delay)
@@ -0,0 +1,332 @@
+from __future__ import annotations
+import asyncio
+import contextvars
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Executor, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict
+
+from auth0.exceptions import Auth0Error
+
+from .admission import AdmissionController, RateLimitedError
+from .metrics import OUTBOUND_LATENCY
+from .offload import run_blocking
+from .tracing import set_attributes, span
+
+# Admission already waited for on the event loop by run_admitted: (endpoint, error if it was shed).
+# Only ever set in the context copied to the worker thread, so it never leaks to the caller.
+_admitted: contextvars.ContextVar[tuple | None] = contextvars.ContextVar("auth0_ai_admitted", default=None)
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the endpoint's circuit is open."""
+
+    def __init__(self, endpoint: str):
+        super().__init__(f"Circuit for '{endpoint}' is open, Auth0 endpoint is degraded.")
+        self.endpoint = endpoint
+
+
+class CircuitBreaker:
+    """
+    Opens after consecutive failures so calls fail fast while an endpoint is degraded.
+    After reset_timeout one trial call is let through (half-open); its outcome
+    closes the circuit again or keeps it open for another period.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """
+        Initialize the circuit breaker.
+        Args:
+            failure_threshold: Consecutive failures after which the circuit opens
+            reset_timeout: Seconds the circuit stays open before a trial call is allowed
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """Current state: closed, open or half_open"""
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if time.time() - self._opened_at >= self.reset_timeout:
+                return "half_open"
+            return "open"
+
+    def allow(self) -> bool:
+        """Check whether a call may be attempted now"""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.time() - self._opened_at >= self.reset_timeout:
+                # Let a single trial through and hold the others for another period
+                self._opened_at = time.time()
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.failure_threshold:
+                self._opened_at = time.time()
+
+
+class CallPolicy:
+    """
+    Outbound call policy for one Auth0 endpoint: timeout, optional hedging and a circuit breaker.
+    """
+
+    def __init__(
+        self,
+        timeout: float = 5.0,
+        hedge_after: float | None = None,
+        breaker: CircuitBreaker | None = None
+    ):
+        """
+        Initialize the call policy.
+        Args:
+            timeout: Connect and read timeout in seconds for each attempt
+            hedge_after: Seconds after which a second identical request is sent if the first
+                has not completed. Only set this for idempotent calls.
+            breaker: Circuit breaker for the endpoint (a default one is created if omitted)
+        """
+        self.timeout = timeout
+        self.hedge_after = hedge_after
+        self.breaker = breaker or CircuitBreaker()
+
+
+class OutboundPolicies:
+    """
+    Registry of call policies for the Auth0 endpoints used by AIAuth.
+    """
+    ENDPOINTS = (
+        "code_exchange", "refresh", "federated_exchange", "client_credentials", "jwks",
+        "userinfo", "tokeninfo", "par", "revoke", "logout",
+    )
+
+    def __init__(
+        self,
+        policies: Dict[str, CallPolicy] | None = None,
+        executor: ThreadPoolExecutor | None = None,
+        offload_executor: Executor | None = None,
+        admission: AdmissionController | None = None
+    ):
+        """
+        Initialize the policies.
+        Args:
+            policies: Policies keyed by endpoint name, overriding the defaults (no hedging)
+            executor: Executor used to run hedged attempts
+            offload_executor: Bounded executor async callers run blocking calls on
+                (the loop's default executor if omitted)
+            admission: Admission control applied before every call, with the endpoint
+                as client, so bursts are queued or shed before they reach the tenant's rate limit
+        """
+        self._policies = {endpoint: CallPolicy() for endpoint in self.ENDPOINTS}
+        self._policies.update(policies or {})
+        self._executor = executor
+        self.offload_executor = offload_executor
+        self.admission = admission
+
+    def get(self, endpoint: str) -> CallPolicy:
+        """Get the policy for an endpoint, creating a default one for unknown endpoints"""
+        policy = self._policies.get(endpoint)
+        if policy is None:
+            policy = self._policies.setdefault(endpoint, CallPolicy())
+        return policy
+
+    def timeout(self, endpoint: str) -> float:
+        """Get the timeout for an endpoint"""
+        return self.get(endpoint).timeout
+
+    def call(
+        self,
+        endpoint: str,
+        fn: Callable[[], Any],
+        fallback: Callable[[], Any] | None = None
+    ) -> Any:
+        """
+        Call an endpoint under its policy.
+        Args:
+            endpoint: Endpoint name
+            fn: Blocking function performing the request
+            fallback: Optional function returning a cached result, used when the circuit is open
+                or the call is shed by admission control
+        Returns:
+            The result of fn, or of fallback when the call cannot be made
+        Raises:
+            CircuitOpenError: if the circuit is open and there is no cached result
+            RateLimitedError: if admission control sheds the call and there is no cached result
+        """
+        admitted = _admitted.get()
+        if admitted is not None and admitted[0] == endpoint:
+            # Queued on the event loop by run_admitted, the admission is used up by this call
+            _admitted.set(None)
+            if admitted[1] is not None:
+                return self._shed(endpoint, fallback, admitted[1])
+            return self._traced_call(endpoint, fn, fallback)
+        try:
+            delay = self._admit(endpoint)
+        except RateLimitedError as error:
+            return self._shed(endpoint, fallback, error)
+        if delay:
+            # Only sync callers get here, async ones wait in call_async or run_admitted
+            time.sleep(delay)
+        return self._traced_call(endpoint, fn, fallback)
+
+    def _traced_call(self, endpoint: str, fn: Callable[[], Any], fallback: Callable[[], Any] | None) -> Any:
+        with span(f"auth0_ai.outbound.{endpoint}", endpoint=endpoint):
+            return self._call(endpoint, fn, fallback)
+
+    def _call(self, endpoint: str, fn: Callable[[], Any], fallback: Callable[[], Any] | None) -> Any:
+        policy = self.get(endpoint)
+        if not policy.breaker.allow():
+            cached = fallback() if fallback else None
+            _observe(endpoint, time.perf_counter(), "circuit_open")
+            if cached is not None:
+                return cached
+            raise CircuitOpenError(endpoint)
+        started = time.perf_counter()
+        try:
+            result = self._execute(endpoint, policy, fn)
+        except Exception as error:
+            _observe(endpoint, started, "error")
+            if _is_degraded(error):
+                policy.breaker.record_failure()
+            else:
+                policy.breaker.record_success()
+            raise
+        _observe(endpoint, started, "success")
+        policy.breaker.record_success()
+        return result
+
+    async def call_async(
+        self,
+        endpoint: str,
+        fn: Callable[[], Any],
+        fallback: Callable[[], Any] | None = None
+    ) -> Any:
+        """Async variant of call that queues on the event loop and runs the blocking request off it"""
+        try:
+            delay = self._admit(endpoint)
+        except RateLimitedError as error:
+            return self._shed(endpoint, fallback, error)
+        if delay:
+            await asyncio.sleep(delay)
+        return await run_blocking(self.offload_executor, self._traced_call, endpoint, fn, fallback)
+
+    async def run_admitted(self, endpoint: str, fn: Callable[..., Any], *args) -> Any:
+        """
+        Run a blocking function that calls an endpoint through call(), on the offload executor.
+        Admission is waited for on the event loop first, so calls queued by admission control
+        do not hold executor threads; the call() made by fn then proceeds without waiting again.
+        Args:
+            endpoint: Endpoint name fn calls
+            fn: Blocking function, e.g. one adding caching or metrics around call()
+            *args: Positional arguments for fn
+        Returns:
+            The result of fn
+        """
+        error = None
+        try:
+            delay = self._admit(endpoint)
+        except RateLimitedError as shed:
+            # Handed to call(), which serves the cached result or raises
+            delay, error = 0.0, shed
+        if delay:
+            await asyncio.sleep(delay)
+        return await run_blocking(self.offload_executor, _run_admitted, endpoint, error, fn, *args)
+
+    def _admit(self, endpoint: str) -> float:
+        """Seconds to wait before calling an endpoint"""
+        return self.admission.reserve(endpoint) if self.admission is not None else 0.0
+
+    def _shed(self, endpoint: str, fallback: Callable[[], Any] | None, error: RateLimitedError) -> Any:
+        """Serve a shed call from cache, or fail it without touching the network"""
+        cached = fallback() if fallback else None
+        _observe(endpoint, time.perf_counter(), "rate_limited")
+        if cached is not None:
+            return cached
+        raise error
+
+    def _execute(self, endpoint: str, policy: CallPolicy, fn: Callable[[], Any]) -> Any:
+        """Run fn, sending a hedged duplicate if it is slower than policy.hedge_after"""
+        if not policy.hedge_after:
+            return fn()
+        executor = self._executor or _hedge_executor()
+        first = executor.submit(fn)
+        done, _ = wait([first], timeout=policy.hedge_after)
+        if done:
+            return first.result()
+        hedge = self._admit_hedge(endpoint, fn)
+        if hedge is None:
+            # The duplicate was shed, keep waiting for the first attempt
+            return first.result()
+        pending = {first, executor.submit(hedge)}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for attempt in done:
+                if attempt.exception() is None:
+                    return attempt.result()
+                error = attempt.exception()
+        raise error
+
+    def _admit_hedge(self, endpoint: str, fn: Callable[[], Any]) -> Callable[[], Any] | None:
+        """
+        The hedged duplicate of fn, charged to admission control like any other call
+        so hedging never pushes the tenant over its rate limit.
+        Returns:
+            fn, or fn delayed until it is admitted, or None if the duplicate is shed
+        """
+        try:
+            delay = self._admit(endpoint)
+        except RateLimitedError:
+            return None
+        if not delay:
+            return fn
+
+        def admitted() -> Any:
+            time.sleep(delay)
+            return fn()
+        return admitted
+
+
+def _run_admitted(endpoint: str, error: RateLimitedError | None, fn: Callable[..., Any], *args) -> Any:
+    """Run fn in the worker's copy of the context, marked as admitted to call endpoint"""
+    _admitted.set((endpoint, error))
+    return fn(*args)
+
+
+def _observe(endpoint: str, started: float, outcome: str) -> None:
+    """Record an outbound call's latency and its outcome on the current span"""
+    OUTBOUND_LATENCY.observe(time.perf_counter() - started, endpoint=endpoint, outcome=outcome)
+    set_attributes(outcome=outcome)
+
+
+def _is_degraded(error: Exception) -> bool:
+    """Only server errors, rate limiting and transport failures count against the circuit"""
+    if isinstance(error, Auth0Error):
+        status_code = getattr(error, "status_code", 0) or 0
+        return status_code >= 500 or status_code == 429
+    return True
+
+
+_hedge_pool: ThreadPoolExecutor | None = None
+_hedge_pool_lock = threading.Lock()
+
+
+def _hedge_executor() -> ThreadPoolExecutor:
+    """Shared executor for hedged attempts, created on first use"""
+    global _hedge_pool
+    with _hedge_pool_lock:
+        if _hedge_pool is None:
+            _hedge_pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix="auth0-ai-hedge")
+        return _hedge_pool
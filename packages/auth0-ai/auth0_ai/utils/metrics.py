@@ -0,0 +1,206 @@
+from __future__ import annotations
+import bisect
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Sequence, Tuple
+
+from .tracing import span
+
+# Latency buckets in seconds, from a cached lookup to a slow Auth0 round trip
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _Metric:
+    """Base class for labelled metrics"""
+    TYPE = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _label_values(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _format_labels(self, values: Tuple[str, ...], extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+        pairs = list(zip(self.labelnames, values)) + list(extra)
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+    def collect(self) -> List[str]:
+        """Render the metric in Prometheus text format"""
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.TYPE}"] + self._samples()
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing count per label set"""
+    TYPE = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        """Increase the count for the label set"""
+        key = self._label_values(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: Any) -> float:
+        """Current count for the label set"""
+        with self._lock:
+            return self._values.get(self._label_values(labels), 0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            return [f"{self.name}{self._format_labels(key)} {value}" for key, value in sorted(self._values.items())]
+
+
+class Histogram(_Metric):
+    """Distribution of observed values (e.g. latencies) per label set"""
+    TYPE = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: observations per bucket (the last one is +Inf), sum
+        self._values: Dict[Tuple[str, ...], Tuple[List[int], float]] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        """Record an observation for the label set"""
+        key = self._label_values(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._values.get(key) or ([0] * (len(self.buckets) + 1), 0.0)
+            counts[index] += 1
+            self._values[key] = (counts, total + value)
+
+    @contextmanager
+    def time(self, **labels: Any) -> Iterator[None]:
+        """Observe the duration of the enclosed block"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def wrap(self, fn: Callable[..., Any], **labels: Any) -> Callable[..., Any]:
+        """Wrap a function so every call's duration is observed"""
+        @functools.wraps(fn)
+        def timed(*args, **kwargs):
+            with self.time(**labels):
+                return fn(*args, **kwargs)
+        return timed
+
+    def count(self, **labels: Any) -> int:
+        """Number of observations for the label set"""
+        with self._lock:
+            entry = self._values.get(self._label_values(labels))
+            return sum(entry[0]) if entry else 0
+
+    def _samples(self) -> List[str]:
+        samples = []
+        with self._lock:
+            for key, (counts, total) in sorted(self._values.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    samples.append(f"{self.name}_bucket{self._format_labels(key, (('le', le),))} {cumulative}")
+                samples.append(f"{self.name}_sum{self._format_labels(key)} {total}")
+                samples.append(f"{self.name}_count{self._format_labels(key)} {cumulative}")
+        return samples
+
+
+class MetricsRegistry:
+    """
+    Registry of metrics rendered together in Prometheus text format.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Get or create a counter"""
+        return self._register(Counter, name, documentation, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        """Get or create a histogram"""
+        return self._register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def get(self, name: str) -> _Metric | None:
+        """Get a registered metric by name"""
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """Render every metric in Prometheus text exposition format"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(line for metric in metrics for line in metric.collect()) + "\n"
+
+    def _register(self, cls, name: str, documentation: str, labelnames: Sequence[str], **kwargs) -> Any:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, labelnames, **kwargs)
+            elif not isinstance(metric, cls) or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"Metric {name} is already registered with a different type or labels")
+            return metric
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+# Process-wide registry served at /auth/metrics
+REGISTRY = MetricsRegistry()
+
+ROUTE_LATENCY = REGISTRY.histogram(
+    "auth0_ai_route_duration_seconds", "Latency of /auth routes.", ("route", "method", "status"))
+OUTBOUND_LATENCY = REGISTRY.histogram(
+    "auth0_ai_outbound_duration_seconds", "Latency of calls to Auth0 endpoints.", ("endpoint", "outcome"))
+STORE_LATENCY = REGISTRY.histogram(
+    "auth0_ai_store_duration_seconds", "Latency of session and state store operations.", ("store", "operation"))
+CACHE_REQUESTS = REGISTRY.counter(
+    "auth0_ai_cache_requests_total", "Cache lookups by cache and result (hit or miss).", ("cache", "result"))
+TOKEN_REFRESHES = REGISTRY.counter(
+    "auth0_ai_token_refreshes_total", "Refresh token grants sent to Auth0 by outcome.", ("outcome",))
+STATE_VALIDATION_FAILURES = REGISTRY.counter(
+    "auth0_ai_state_validation_failures_total", "Callbacks rejected because of their state parameter.", ("reason",))
+ADMISSIONS = REGISTRY.counter(
+    "auth0_ai_admissions_total", "Requests admitted, queued or rejected by admission control.", ("limiter", "outcome"))
+
+
+@contextmanager
+def observe_store(store: str, operation: str) -> Iterator[None]:
+    """
+    Time a session or state store operation and trace it as a span.
+    Args:
+        store: Store kind, session or state
+        operation: Operation name, e.g. get or set
+    """
+    with STORE_LATENCY.time(store=store, operation=operation), \
+            span(f"auth0_ai.store.{store}.{operation}", store=store, operation=operation):
+        yield
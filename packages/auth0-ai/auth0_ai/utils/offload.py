@@ -0,0 +1,23 @@
+from __future__ import annotations
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import Executor
+from typing import Any, Callable
+
+
+async def run_blocking(executor: Executor | None, fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Run a blocking function on an executor so the event loop keeps serving other requests.
+    The caller's context (e.g. the current tracing span) is carried over to the worker thread.
+    Args:
+        executor: Bounded executor to run on, or None for the loop's default executor
+        fn: Blocking function (SDK call, session store I/O)
+        *args: Positional arguments for fn
+        **kwargs: Keyword arguments for fn
+    Returns:
+        The result of fn
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(executor, functools.partial(context.run, fn, *args, **kwargs))
@@ -0,0 +1,40 @@
+from __future__ import annotations
+import time
+from contextlib import contextmanager
+from typing import Any, Awaitable, Dict, Iterator
+
+
+class StageTimings:
+    """
+    Collects the duration of named request stages, e.g. for a Server-Timing header.
+    Stages may overlap; each one records its own wall-clock duration.
+    """
+
+    def __init__(self):
+        self.durations: Dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as stage name"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._record(name, started)
+
+    async def measure(self, name: str, awaitable: Awaitable[Any]) -> Any:
+        """Await an awaitable and record its duration as stage name"""
+        started = time.perf_counter()
+        try:
+            return await awaitable
+        finally:
+            self._record(name, started)
+
+    def header(self) -> str:
+        """Format the stages as a Server-Timing header value (durations in milliseconds)"""
+        return ", ".join(
+            f"{name};dur={duration * 1000:.1f}" for name, duration in self.durations.items())
+
+    def _record(self, name: str, started: float) -> None:
+        # A stage that runs more than once (e.g. a re-read) accumulates
+        self.durations[name] = self.durations.get(name, 0.0) + time.perf_counter() - started
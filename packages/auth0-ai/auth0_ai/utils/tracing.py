@@ -0,0 +1,75 @@
+from __future__ import annotations
+import functools
+import inspect
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator
+
+try:
+    from opentelemetry import trace
+except ImportError:  # OpenTelemetry is optional, spans are skipped without it
+    trace = None
+
+TRACER_NAME = "auth0_ai"
+# Namespace of every span attribute set by this package
+ATTRIBUTE_PREFIX = "auth0_ai."
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Any]:
+    """
+    Run the enclosed block in an OpenTelemetry span, a no-op when OpenTelemetry is not installed.
+    Args:
+        name: Span name, e.g. auth0_ai.token.refresh
+        **attributes: Span attributes, prefixed with auth0_ai. (None values are skipped)
+    Returns:
+        The span, or None without OpenTelemetry
+    """
+    if trace is None:
+        yield None
+        return
+    tracer = trace.get_tracer(TRACER_NAME)
+    with tracer.start_as_current_span(name, attributes=_attributes(attributes)) as current:
+        yield current
+
+
+def traced(name: str) -> Callable:
+    """
+    Decorator running every call of a sync or async function in a span.
+    Attributes known inside the function are added with set_attributes.
+    Args:
+        name: Span name
+    """
+    def decorator(fn: Callable) -> Callable:
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with span(name):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def set_attributes(**attributes: Any) -> None:
+    """
+    Add attributes to the current span, e.g. a cache outcome or a batch size known only later.
+    Args:
+        **attributes: Span attributes, prefixed with auth0_ai. (None values are skipped)
+    """
+    if trace is None:
+        return
+    current = trace.get_current_span()
+    if current.is_recording():
+        current.set_attributes(_attributes(attributes))
+
+
+def _attributes(attributes: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        ATTRIBUTE_PREFIX + name: value if isinstance(value, (bool, int, float, str)) else str(value)
+        for name, value in attributes.items() if value is not None
+    }
@@ -56,7 +56,7 @@ class URLBuilder:
         params.update(kwargs)
         # Construct URL
         query_string = urlencode(params)
-        return f"https://{self.auth_client.domain}/authorize?{query_string}"
+        return f"{self.auth_client.base_url}/authorize?{query_string}"
 
     def get_authorize_par_url(self, state: str, request_uri: str) -> str:
         """
@@ -73,7 +73,7 @@ class URLBuilder:
             "request_uri": request_uri
         }
         query_string = urlencode(params)
-        return f"https://{self.auth_client.domain}/authorize?{query_string}"
+        return f"{self.auth_client.base_url}/authorize?{query_string}"
 
     async def create_par_request(
         self,
@@ -94,10 +94,13 @@ class URLBuilder:
         Returns:
             PAR response containing request_uri
         """
+        call_policies = self.auth_client.call_policies
         par_client = PushedAuthorizationRequests(
             self.auth_client.domain,
             self.auth_client.client_id,
-            self.auth_client.client_secret
+            self.auth_client.client_secret,
+            timeout=call_policies.timeout("par"),
+            protocol=self.auth_client.protocol
         )
         # Prepare authorization details for account linking
         auth_details = [{
@@ -116,4 +119,5 @@ class URLBuilder:
             "id_token_hint": id_token,
             **kwargs
         }
-        return await par_client.pushed_authorization_request(**par_request)
+        return await call_policies.call_async(
+            "par", lambda: par_client.pushed_authorization_request(**par_request))
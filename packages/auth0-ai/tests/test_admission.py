@@ -0,0 +1,117 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+
+from fastapi import FastAPI
+from unittest.mock import MagicMock
+from auth0_ai.server.routes import create_auth_router
+from auth0_ai.utils import AdmissionController, OutboundPolicies, RateLimitedError, TokenBucket, run_blocking
+
+
+def test_bucket_queues_then_sheds():
+    bucket = TokenBucket(rate=10, burst=2)
+
+    assert bucket.reserve(max_wait=0.5) == (True, 0.0)
+    assert bucket.reserve(max_wait=0.5) == (True, 0.0)
+    admitted, delay = bucket.reserve(max_wait=0.5)
+    assert admitted and 0 < delay <= 0.1
+    # Each queued request pushes the next one a token further back
+    admitted, delay = bucket.reserve(max_wait=0.05)
+    assert not admitted and delay > 0.1
+
+
+def test_clients_are_limited_separately_and_globally():
+    admission = AdmissionController(rate=3, per_client_rate=2, max_wait=0)
+
+    admission.reserve("10.0.0.1")
+    admission.reserve("10.0.0.1")
+    with pytest.raises(RateLimitedError) as error:
+        admission.reserve("10.0.0.1")
+    assert error.value.scope == "client"
+
+    admission.reserve("10.0.0.2")
+    with pytest.raises(RateLimitedError) as error:
+        admission.reserve("10.0.0.3")
+    assert error.value.scope == "global"
+    # The rejected request gave its client token back
+    admission.max_wait = 1.0
+    assert admission.reserve("10.0.0.3") > 0
+
+
+@pytest.mark.asyncio
+async def test_queued_requests_wait_for_their_token():
+    admission = AdmissionController(rate=20, burst=1, max_wait=1.0)
+
+    started = time.perf_counter()
+    for _ in range(3):
+        await admission.acquire_async()
+
+    assert time.perf_counter() - started >= 0.09
+
+
+@pytest.mark.asyncio
+async def test_callback_bursts_are_shed_with_429():
+    auth_client = MagicMock()
+    auth_client.io_executor = None
+    auth_client.admission = AdmissionController(per_client_rate=1, max_wait=0)
+    app = FastAPI()
+    app.include_router(create_auth_router(auth_client))
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        first = await client.get("/auth/callback")
+        second = await client.get("/auth/callback")
+
+    # Admitted, then rejected before the missing parameters are even looked at
+    assert first.status_code == 400
+    assert second.status_code == 429
+    assert int(second.headers["Retry-After"]) >= 1
+
+
+@pytest.mark.asyncio
+async def test_outbound_calls_shed_to_cache_or_fail_fast():
+    policies = OutboundPolicies(admission=AdmissionController(rate=1, max_wait=0))
+    fn = MagicMock(return_value={"access_token": "fresh"})
+
+    assert await policies.call_async("client_credentials", fn) == {"access_token": "fresh"}
+    assert policies.call("client_credentials", fn, fallback=lambda: {"access_token": "cached"}) == {
+        "access_token": "cached"}
+    with pytest.raises(RateLimitedError):
+        policies.call("client_credentials", fn)
+    assert fn.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_queued_outbound_calls_do_not_hold_executor_threads():
+    executor = ThreadPoolExecutor(max_workers=1)
+    policies = OutboundPolicies(offload_executor=executor,
+                                admission=AdmissionController(rate=10, burst=1, max_wait=1.0))
+    fn = MagicMock(return_value={"sub": "user|1"})
+    calls = [asyncio.create_task(policies.run_admitted("userinfo", policies.call, "userinfo", fn))
+             for _ in range(4)]
+    await asyncio.sleep(0.02)
+
+    # The queued calls wait on the event loop, so the only worker is free for other blocking work
+    started = time.perf_counter()
+    await run_blocking(executor, lambda: None)
+    assert time.perf_counter() - started < 0.1
+    assert fn.call_count == 1
+
+    await asyncio.gather(*calls)
+    assert fn.call_count == 4
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_calls_shed_before_offloading_use_the_fallback():
+    policies = OutboundPolicies(admission=AdmissionController(rate=1, max_wait=0))
+    fn = MagicMock(return_value={"sub": "fresh"})
+
+    def request():
+        return policies.call("userinfo", fn, fallback=lambda: {"sub": "cached"})
+
+    assert await policies.run_admitted("userinfo", request) == {"sub": "fresh"}
+    assert await policies.run_admitted("userinfo", request) == {"sub": "cached"}
+    assert fn.call_count == 1
@@ -0,0 +1,49 @@
+import httpx
+import pytest
+
+from fastapi import FastAPI
+from auth0_ai.auth.auth_client import AIAuth
+from auth0_ai.server.routes import create_auth_router
+
+
+@pytest.fixture
+def auth_client(tmp_path):
+    return AIAuth(
+        domain="example.auth0.com",
+        client_id="client-id",
+        client_secret="client-secret",
+        redirect_uri="http://localhost:3000/auth/callback",
+        secret_key="a-test-secret-that-is-long-enough-for-hs256",
+        prefetch_jwks=False,
+        standalone_server=False,
+    )
+
+
+def test_no_standalone_server_is_started(auth_client):
+    assert auth_client.server is None
+
+
+@pytest.mark.asyncio
+async def test_router_serves_auth_routes_on_host_app(auth_client):
+    app = FastAPI()
+
+    @app.get("/health")
+    async def health():
+        return {"ok": True}
+
+    app.include_router(auth_client.create_router())
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        login = await client.get("/auth/login", follow_redirects=False)
+        user = await client.get("/auth/get_user")
+        health_response = await client.get("/health")
+
+    assert login.status_code == 302
+    assert login.headers["location"].startswith("https://example.auth0.com/authorize")
+    assert user.status_code == 401
+    assert health_response.json() == {"ok": True}
+
+
+def test_router_paths():
+    paths = {route.path for route in create_auth_router(object()).routes}
+    assert {"/auth/callback", "/auth/login", "/auth/get_user", "/auth/logout", "/auth/get_token"} <= paths
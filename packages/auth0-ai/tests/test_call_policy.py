@@ -0,0 +1,93 @@
+import threading
+import time
+
+import pytest
+
+from auth0.exceptions import Auth0Error
+from auth0_ai.utils.admission import AdmissionController
+from auth0_ai.utils.call_policy import CallPolicy, CircuitBreaker, CircuitOpenError, OutboundPolicies
+
+
+def test_circuit_opens_after_consecutive_failures():
+    policies = OutboundPolicies({"refresh": CallPolicy(breaker=CircuitBreaker(failure_threshold=2, reset_timeout=60))})
+
+    def failing():
+        raise ConnectionError("timeout")
+
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            policies.call("refresh", failing)
+
+    with pytest.raises(CircuitOpenError):
+        policies.call("refresh", lambda: {"access_token": "at"})
+    assert policies.get("refresh").breaker.state == "open"
+
+
+def test_open_circuit_serves_cached_result():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    policies = OutboundPolicies({"userinfo": CallPolicy(breaker=breaker)})
+    breaker.record_failure()
+
+    assert policies.call("userinfo", lambda: {"sub": "fresh"}, fallback=lambda: {"sub": "cached"}) == {"sub": "cached"}
+
+
+def test_client_errors_do_not_open_circuit():
+    policies = OutboundPolicies({"refresh": CallPolicy(breaker=CircuitBreaker(failure_threshold=1))})
+
+    def invalid_grant():
+        raise Auth0Error(403, "invalid_grant", "Unknown or invalid refresh token.")
+
+    with pytest.raises(Auth0Error):
+        policies.call("refresh", invalid_grant)
+    assert policies.get("refresh").breaker.state == "closed"
+
+
+def test_half_open_trial_closes_circuit():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    policies = OutboundPolicies({"jwks": CallPolicy(breaker=breaker)})
+    breaker.record_failure()
+    time.sleep(0.1)
+
+    assert policies.call("jwks", lambda: "keys") == "keys"
+    assert breaker.state == "closed"
+
+
+def test_slow_call_is_hedged():
+    policies = OutboundPolicies({"jwks": CallPolicy(hedge_after=0.05)})
+    attempts = []
+    lock = threading.Lock()
+
+    def first_slow():
+        with lock:
+            attempts.append(1)
+            attempt = len(attempts)
+        if attempt == 1:
+            time.sleep(1)
+            return "slow"
+        return "fast"
+
+    started = time.time()
+    assert policies.call("jwks", first_slow) == "fast"
+    assert time.time() - started < 0.5
+    assert len(attempts) == 2
+
+
+def test_hedging_is_off_by_default():
+    policies = OutboundPolicies()
+
+    assert all(policies.get(endpoint).hedge_after is None for endpoint in OutboundPolicies.ENDPOINTS)
+
+
+def test_hedged_attempt_is_charged_to_admission():
+    # One call per second for the endpoint: the first attempt uses it, so the duplicate is shed
+    admission = AdmissionController(per_client_rate=1, max_wait=0)
+    policies = OutboundPolicies({"userinfo": CallPolicy(hedge_after=0.05)}, admission=admission)
+    attempts = []
+
+    def slow():
+        attempts.append(1)
+        time.sleep(0.2)
+        return "slow"
+
+    assert policies.call("userinfo", slow) == "slow"
+    assert len(attempts) == 1
@@ -0,0 +1,99 @@
+import asyncio
+import threading
+import time
+
+import jwt
+import pytest
+
+from unittest.mock import MagicMock
+from auth0_ai.session_module.manager import SessionManager
+from auth0_ai.session_module.storage.local_store import LocalStore
+from auth0_ai.state.storage import MemoryStateStore
+from auth0_ai.utils.timing import StageTimings
+
+SECRET_KEY = "a-test-secret-that-is-long-enough-for-hs256"
+STAGE_SECONDS = 0.2
+
+
+@pytest.fixture
+def auth_client(tmp_path):
+    auth_client = MagicMock()
+    auth_client.domain = "example.auth0.com"
+    auth_client.secret_key = SECRET_KEY
+    auth_client.state_store = {}
+
+    async def verify_claims(token):
+        await asyncio.sleep(STAGE_SECONDS)
+        return jwt.decode(token, options={"verify_signature": False})
+
+    async def verify_token(token):
+        await asyncio.sleep(STAGE_SECONDS)
+        return {"aud": "https://api.example.com"}
+
+    auth_client.token_manager.verify_claims = verify_claims
+    auth_client.token_manager.verify_token = verify_token
+    session_manager = SessionManager(auth_client, store=LocalStore(file_path=str(tmp_path / "sessions")))
+    stored_session = session_manager._get_stored_session
+
+    def slow_get_stored_session(user_id):
+        time.sleep(STAGE_SECONDS)
+        return stored_session(user_id)
+
+    session_manager._get_stored_session = slow_get_stored_session
+    auth_client.session_manager = session_manager
+    return auth_client
+
+
+def _token_data(sub):
+    id_token = jwt.encode({"sub": sub, "exp": int(time.time()) + 600}, SECRET_KEY, algorithm="HS256")
+    return {"id_token": id_token, "access_token": "at", "scope": "openid", "expires_in": 600}
+
+
+@pytest.mark.asyncio
+async def test_verifications_and_session_read_run_concurrently(auth_client):
+    timings = StageTimings()
+
+    started = time.perf_counter()
+    await auth_client.session_manager.set_encrypted_session(_token_data("user|1"), timings=timings)
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < STAGE_SECONDS * 2
+    assert {"verify_id_token", "verify_access_token", "session_read", "session_write"} <= set(timings.durations)
+    assert "verify_id_token;dur=" in timings.header()
+
+
+@pytest.mark.asyncio
+async def test_session_is_merged_and_token_audience_kept(auth_client):
+    session_manager = auth_client.session_manager
+    await session_manager.set_encrypted_session(_token_data("user|1"))
+    encrypted = await session_manager.set_encrypted_session(_token_data("user|1"))
+
+    session = jwt.decode(encrypted, SECRET_KEY, algorithms=["HS256"])
+    assert session["user"]["sub"] == "user|1"
+    assert [token["aud"] for token in session["tokens"]] == ["https://api.example.com"]
+    assert session_manager.store.get_stored_session("user|1") == encrypted
+
+
+@pytest.mark.asyncio
+async def test_linking_state_is_read_once_off_the_event_loop(auth_client):
+    loop_thread = threading.get_ident()
+    calls = []
+
+    class RecordingStore(MemoryStateStore):
+        def get_state(self, state):
+            calls.append(("get", threading.get_ident()))
+            return super().get_state(state)
+
+        def update_state(self, state, **fields):
+            calls.append(("update", threading.get_ident()))
+            return super().update_state(state, **fields)
+
+    auth_client.state_store = RecordingStore()
+    auth_client.state_store.set_state("abc", {
+        "user_id": "user|1", "operation": {"type": "linking", "connection": "github"}})
+    encrypted = await auth_client.session_manager.set_encrypted_session(_token_data("user|1"), state="abc")
+
+    session = jwt.decode(encrypted, SECRET_KEY, algorithms=["HS256"])
+    assert session["linked_connections"] == ["github"]
+    assert [operation for operation, _ in calls] == ["get", "update"]
+    assert loop_thread not in {thread for _, thread in calls}
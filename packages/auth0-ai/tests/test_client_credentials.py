@@ -0,0 +1,62 @@
+import asyncio
+import time
+
+import pytest
+
+from unittest.mock import MagicMock, patch
+from auth0_ai.token_module import manager
+from auth0_ai.token_module.manager import TokenManager
+
+
+@pytest.fixture(autouse=True)
+def clear_shared_cache():
+    manager._client_credentials_tokens.clear()
+    yield
+    manager._client_credentials_tokens.clear()
+
+
+@pytest.fixture
+def mock_token_client():
+    with patch.object(TokenManager, "_token_client") as token_client:
+        token_client.return_value.authenticated_post.side_effect = lambda url, data: (
+            time.sleep(0.1) or {"access_token": f"m2m-{data['audience']}", "expires_in": 86400})
+        yield token_client.return_value
+
+
+def _token_manager():
+    auth_client = MagicMock()
+    auth_client.domain = "example.auth0.com"
+    auth_client.client_id = "client"
+    return TokenManager(auth_client)
+
+
+def test_token_is_shared_across_token_managers(mock_token_client):
+    first = _token_manager().get_client_credentials_token("https://api.example.com", scope="read write")
+    second = _token_manager().get_client_credentials_token("https://api.example.com", scope="write read")
+
+    assert first["access_token"] == second["access_token"] == "m2m-https://api.example.com"
+    assert mock_token_client.authenticated_post.call_count == 1
+
+
+def test_token_is_refetched_ahead_of_expiry(mock_token_client):
+    mock_token_client.authenticated_post.side_effect = lambda url, data: {"access_token": "m2m", "expires_in": 3600}
+    token_manager = _token_manager()
+    now = time.time()
+
+    token_manager.get_client_credentials_token("https://api.example.com")
+    token_manager.get_client_credentials_token("https://api.example.com")
+    with patch("time.time", return_value=now + 3600 - 30):
+        token_manager.get_client_credentials_token("https://api.example.com")
+
+    assert mock_token_client.authenticated_post.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_fetches_are_coalesced(mock_token_client):
+    token_manager = _token_manager()
+
+    tokens = await asyncio.gather(*[
+        token_manager.get_client_credentials_token_async("https://api.example.com") for _ in range(5)])
+
+    assert len({token["access_token"] for token in tokens}) == 1
+    assert mock_token_client.authenticated_post.call_count == 1
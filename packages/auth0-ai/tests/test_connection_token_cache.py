@@ -0,0 +1,144 @@
+import asyncio
+import time
+
+import jwt
+import pytest
+
+from unittest.mock import AsyncMock, MagicMock, patch
+from auth0_ai.session_module.manager import SessionManager
+from auth0_ai.session_module.storage.local_store import LocalStore
+from auth0_ai.token_module.cache import TTLCache
+from auth0_ai.token_module.manager import TokenManager
+
+SECRET_KEY = "a-test-secret-that-is-long-enough-for-hs256"
+
+
+@pytest.fixture
+def token_manager():
+    auth_client = MagicMock()
+    auth_client.domain = "example.auth0.com"
+    return TokenManager(auth_client)
+
+
+@pytest.fixture
+def session_manager(tmp_path):
+    auth_client = MagicMock()
+    auth_client.domain = "example.auth0.com"
+    auth_client.secret_key = SECRET_KEY
+    auth_client.state_store = {}
+
+    async def verify_claims(token):
+        return jwt.decode(token, options={"verify_signature": False})
+
+    auth_client.token_manager.verify_claims = verify_claims
+    auth_client.token_manager.verify_token = AsyncMock(return_value=None)
+    return SessionManager(auth_client, store=LocalStore(file_path=str(tmp_path / "sessions")))
+
+
+def _token_data(sub, access_token="at"):
+    id_token = jwt.encode({"sub": sub, "exp": int(time.time()) + 600}, SECRET_KEY, algorithm="HS256")
+    return {"id_token": id_token, "access_token": access_token, "scope": "openid", "expires_in": 600}
+
+
+@pytest.fixture
+def mock_get_token():
+    with patch("auth0_ai.token_module.manager.GetToken") as get_token:
+        get_token.return_value.access_token_for_connection.return_value = {
+            "access_token": "gho_token", "expires_in": 3600}
+        yield get_token.return_value
+
+
+def test_ttl_cache_expires_entries():
+    cache = TTLCache(maxsize=10)
+    cache.set("key", "value", ttl=0.05)
+    assert cache.get("key") == "value"
+    time.sleep(0.1)
+    assert cache.get("key") is None
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+
+
+def test_upstream_token_is_cached_per_user_and_connection(token_manager, mock_get_token):
+    first = token_manager.get_upstream_token("github", "rt", user_id="user|1")
+    second = token_manager.get_upstream_token("github", "rt", user_id="user|1")
+    token_manager.get_upstream_token("google-oauth2", "rt", user_id="user|1")
+
+    assert first == second
+    assert first["access_token"] == "gho_token"
+    assert mock_get_token.access_token_for_connection.call_count == 2
+
+
+def test_additional_scopes_are_deprecated_and_cached_separately(token_manager, mock_get_token):
+    with pytest.warns(DeprecationWarning):
+        token_manager.get_upstream_token("github", "rt", additional_scopes="repo read:user", user_id="user|1")
+    with pytest.warns(DeprecationWarning):
+        token_manager.get_upstream_token("github", "rt", additional_scopes="read:user repo", user_id="user|1")
+    token_manager.get_upstream_token("github", "rt", user_id="user|1")
+
+    assert mock_get_token.access_token_for_connection.call_count == 2
+
+
+def test_short_lived_upstream_token_is_not_cached(token_manager, mock_get_token):
+    mock_get_token.access_token_for_connection.return_value = {
+        "access_token": "short", "expires_in": 30}
+    token_manager.get_upstream_token("github", "rt", user_id="user|1")
+    token_manager.get_upstream_token("github", "rt", user_id="user|1")
+
+    assert mock_get_token.access_token_for_connection.call_count == 2
+
+
+def test_invalidate_upstream_tokens(token_manager, mock_get_token):
+    token_manager.get_upstream_token("github", "rt", user_id="user|1")
+    token_manager.invalidate_upstream_tokens("user|1", "github")
+    token_manager.get_upstream_token("github", "rt", user_id="user|1")
+
+    assert mock_get_token.access_token_for_connection.call_count == 2
+
+
+def test_persisted_upstream_token_is_reused(token_manager, mock_get_token):
+    token_manager.persist_connection_tokens = True
+    session_manager = token_manager.auth_client.session_manager
+    session_manager.get_connection_token.return_value = {
+        "access_token": "persisted", "expires_at": {"epoch": int(time.time()) + 600}}
+
+    token = token_manager.get_upstream_token("github", "rt", user_id="user|1")
+
+    assert token["access_token"] == "persisted"
+    mock_get_token.access_token_for_connection.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_persisted_connection_tokens_are_encrypted(session_manager):
+    await session_manager.set_encrypted_session(_token_data("user|1"))
+    session_manager.set_connection_token("user|1", "github", {"access_token": "gho_secret"})
+
+    payload = jwt.decode(session_manager.store.get_stored_session("user|1"), SECRET_KEY, algorithms=["HS256"])
+    assert "gho_secret" not in str(payload)
+    assert session_manager.get_connection_token("user|1", "github") == {"access_token": "gho_secret"}
+
+
+@pytest.mark.asyncio
+async def test_connection_token_written_during_login_is_kept(session_manager):
+    async def verify_token(token):
+        if token == "at-2":
+            # The session was already read; another write lands before this login writes
+            await asyncio.sleep(0.05)
+            session_manager.set_connection_token("user|1", "github", {"access_token": "gho_token"})
+        return {"aud": "https://api.example.com"}
+
+    session_manager.auth_client.token_manager.verify_token = verify_token
+    await session_manager.set_encrypted_session(_token_data("user|1"))
+    await session_manager.set_encrypted_session(_token_data("user|1", access_token="at-2"))
+
+    session = session_manager.get_encrypted_session("user|1")
+    assert session["tokens"][0]["access_token"] == "at-2"
+    assert session_manager.get_connection_token("user|1", "github") == {"access_token": "gho_token"}
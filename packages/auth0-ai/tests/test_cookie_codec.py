@@ -0,0 +1,79 @@
+import json
+import random
+import string
+
+from fastapi import Response
+from auth0_ai.server.cookie_codec import SessionCookieCodec
+
+
+def _session(size):
+    rng = random.Random(size)
+    claims = {"tokens": [{"aud": f"https://api{i}.example.com", "scope": "read:a write:a"} for i in range(size)],
+              "nonce": "".join(rng.choice(string.ascii_letters) for _ in range(size))}
+    return json.dumps(claims)
+
+
+def _set_cookies(response):
+    return [value.decode() for key, value in response.raw_headers if key == b"set-cookie"]
+
+
+def _as_request_cookies(codec, data):
+    return {f"{codec.prefix}_{index}": value for index, value in enumerate(codec.encode(data))}
+
+
+def test_round_trip_compresses_and_chunks():
+    codec = SessionCookieCodec(max_size=512)
+    data = _session(200)
+
+    chunks = codec.encode(data)
+
+    assert len(chunks) > 1
+    assert sum(len(chunk) for chunk in chunks) < len(data)
+    assert chunks[0].startswith(f"{len(chunks)}.")
+    assert codec.decode(_as_request_cookies(codec, data)) == data
+
+
+def test_stale_chunks_are_ignored_and_deleted():
+    codec = SessionCookieCodec(max_size=512)
+    cookies = _as_request_cookies(codec, _session(200))
+    small = _session(1)
+    cookies.update(_as_request_cookies(codec, small))
+
+    assert codec.decode(cookies) == small
+
+    request = type("Request", (), {"cookies": cookies})()
+    response = Response()
+    codec.write(response, small, request)
+    set_cookies = _set_cookies(response)
+
+    assert len([cookie for cookie in set_cookies if cookie.startswith("__session_data_0=")]) == 1
+    assert any(cookie.startswith("__session_data_1=") and "Max-Age=0" in cookie for cookie in set_cookies)
+
+
+def test_incomplete_or_corrupt_session_reads_as_empty():
+    codec = SessionCookieCodec(max_size=512)
+    cookies = _as_request_cookies(codec, _session(200))
+    del cookies["__session_data_1"]
+
+    assert codec.decode(cookies) == ""
+    assert codec.decode({"__session_data_0": "1.not-zlib"}) == ""
+    assert codec.decode({"other": "cookie"}) == ""
+
+
+def test_oversized_or_overlong_sessions_read_as_empty():
+    codec = SessionCookieCodec()
+    # A few KB of cookie that would inflate to many MB before the signature is checked
+    bomb = _as_request_cookies(codec, "a" * (codec.MAX_SESSION_BYTES * 16))
+    assert sum(len(value) for value in bomb.values()) < 8192
+
+    assert codec.decode(bomb) == ""
+    assert codec.decode({"__session_data_0": f"{codec.MAX_CHUNKS + 1}.x"}) == ""
+    limit = "a" * codec.MAX_SESSION_BYTES
+    assert codec.decode(_as_request_cookies(codec, limit)) == limit
+
+
+def test_uncompressed_sessions_from_before_the_codec_are_read():
+    codec = SessionCookieCodec()
+    cookies = {"__session_data_1": "payload.signature", "__session_data_0": "eyJhbGciOiJIUzI1NiJ9.claims", "__session_other": "x"}
+
+    assert codec.decode(cookies) == "eyJhbGciOiJIUzI1NiJ9.claimspayload.signature"
@@ -0,0 +1,73 @@
+import time
+
+import pytest
+import requests
+
+from auth0.exceptions import Auth0Error
+from auth0_ai.auth.auth_client import AIAuth
+from auth0_ai.session_module.storage.local_store import LocalStore
+from auth0_ai.testing.fake_auth0 import FakeAuth0, _free_port
+
+
+@pytest.fixture(scope="module")
+def fake_auth0():
+    with FakeAuth0() as fake:
+        yield fake
+
+
+@pytest.fixture
+def auth_client(fake_auth0, tmp_path):
+    auth_client = AIAuth(
+        domain=fake_auth0.domain,
+        client_id=fake_auth0.client_id,
+        client_secret=fake_auth0.client_secret,
+        redirect_uri=f"http://127.0.0.1:{_free_port()}/auth/callback",
+        secret_key="a-test-secret-that-is-long-enough-for-hs256",
+        protocol="http",
+    )
+    auth_client.session_manager.store = LocalStore(file_path=str(tmp_path / "sessions"))
+    return auth_client
+
+
+def test_jwks_is_served(fake_auth0):
+    response = requests.get(f"http://{fake_auth0.domain}/.well-known/jwks.json")
+    assert response.json()["keys"][0]["kid"] == fake_auth0.kid
+
+
+@pytest.mark.asyncio
+async def test_code_exchange_refresh_and_userinfo(fake_auth0, auth_client):
+    code = fake_auth0.issue_code(sub="auth0|alice")
+    token_manager = auth_client.token_manager
+
+    tokens = token_manager.exchange_code_for_tokens(code)
+    claims = await token_manager.verify_claims(tokens["id_token"])
+    await auth_client.session_manager.set_encrypted_session(tokens, user_id=claims["sub"])
+    refreshed = await token_manager.refresh_tokens_async(tokens["refresh_token"], user_id="auth0|alice")
+    profile = token_manager.get_userinfo(refreshed["access_token"])
+    upstream = token_manager.get_upstream_token("github", tokens["refresh_token"], user_id="auth0|alice")
+
+    assert claims["sub"] == "auth0|alice"
+    assert claims["iss"] == f"http://{fake_auth0.domain}/"
+    # The default /userinfo audience matches what the plain HTTP tenant issued
+    assert token_manager.get_token_data("auth0|alice") is not None
+    assert profile["sub"] == "auth0|alice"
+    assert upstream["access_token"].startswith("fake_github_")
+
+
+def test_injected_errors_surface_as_auth0_errors(fake_auth0, auth_client):
+    fake_auth0.error_rate = 1.0
+    try:
+        with pytest.raises(Auth0Error):
+            auth_client.token_manager.exchange_code_for_tokens("any")
+    finally:
+        fake_auth0.error_rate = 0.0
+
+
+def test_injected_latency(fake_auth0):
+    fake_auth0.latency = 0.2
+    try:
+        started = time.time()
+        requests.get(f"http://{fake_auth0.domain}/.well-known/jwks.json")
+        assert time.time() - started >= 0.2
+    finally:
+        fake_auth0.latency = 0.0
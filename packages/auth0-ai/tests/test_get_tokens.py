@@ -0,0 +1,192 @@
+import asyncio
+import time
+
+import httpx
+import jwt
+import pytest
+
+from fastapi import FastAPI
+from unittest.mock import AsyncMock, MagicMock
+from auth0_ai.server.routes import create_auth_router
+from auth0_ai.server.session_dependency import SessionDependency
+from auth0_ai.token_module.manager import TokenManager
+
+SECRET_KEY = "a-test-secret-that-is-long-enough-for-hs256"
+REFRESH_SECONDS = 0.05
+
+
+def _token(aud, expires_in):
+    return {"aud": aud, "access_token": f"at-{aud}", "scope": "read", "expires_at": {"epoch": int(time.time()) + expires_in}}
+
+
+@pytest.fixture
+def auth_client():
+    auth_client = MagicMock()
+    auth_client.domain = "example.auth0.com"
+    auth_client.secret_key = SECRET_KEY
+    auth_client.io_executor = None
+    token_manager = TokenManager(auth_client)
+    token_manager.refreshed_with = []
+    token_manager.in_flight = token_manager.max_in_flight = 0
+
+    async def refresh_tokens_async(refresh_token, scope=None, user_id=None, audience=None):
+        token_manager.refreshed_with.append(refresh_token)
+        token_manager.in_flight += 1
+        token_manager.max_in_flight = max(token_manager.max_in_flight, token_manager.in_flight)
+        await asyncio.sleep(REFRESH_SECONDS)
+        token_manager.in_flight -= 1
+        return {"access_token": f"new-{audience}", "refresh_token": f"rotated-{len(token_manager.refreshed_with)}",
+                "id_token": "id", "expires_in": 600, "scope": scope}
+
+    async def set_encrypted_session_tokens(user_id, token_data_list):
+        tokens = [{**_token(token_data["access_token"][len("new-"):], 600), "access_token": token_data["access_token"],
+                   "scope": token_data["scope"]}
+                  for token_data in token_data_list]
+        return jwt.encode({"user": {"sub": user_id}, "tokens": tokens}, SECRET_KEY, algorithm="HS256")
+
+    token_manager.refresh_tokens_async = refresh_tokens_async
+    token_manager.get_new_token_url = MagicMock(return_value="https://example.auth0.com/authorize?state=x")
+    auth_client.token_manager = token_manager
+    auth_client.session_manager.set_encrypted_session_tokens = AsyncMock(side_effect=set_encrypted_session_tokens)
+    return auth_client
+
+
+def _client(auth_client, session):
+    current_session = SessionDependency(auth_client)
+    app = FastAPI()
+    app.include_router(create_auth_router(auth_client, current_session))
+    encoded = jwt.encode(session, SECRET_KEY, algorithm="HS256")
+    cookies = {f"__session_data_{i}": value for i, value in enumerate(current_session.cookies.encode(encoded))}
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test", cookies=cookies)
+
+
+@pytest.fixture
+def client(auth_client):
+    return _client(auth_client, {
+        "user": {"sub": "user|1"},
+        "refresh_token": "rt",
+        "tokens": [_token("https://a.example.com", 600), _token("https://b.example.com", -1), _token("https://c.example.com", -1)],
+    })
+
+
+@pytest.mark.asyncio
+async def test_batch_serves_cached_refreshes_concurrently_and_writes_once(auth_client, client):
+    audiences = ["https://a.example.com", "https://b.example.com", "https://c.example.com", "https://d.example.com"]
+
+    async with client:
+        response = await client.post("/auth/get_tokens", json=[{"audience": aud, "scope": "read"} for aud in audiences])
+
+    results = response.json()["tokens"]
+    assert [result["audience"] for result in results] == audiences
+    assert results[0]["token"]["access_token"] == "at-https://a.example.com"
+    assert results[1]["token"]["access_token"] == "new-https://b.example.com"
+    assert results[2]["token"]["access_token"] == "new-https://c.example.com"
+    assert results[2]["token"]["aud"] == "https://c.example.com"
+    assert results[3]["error"] == "login_required"
+    assert results[3]["authorize_url"].startswith("https://example.auth0.com/authorize")
+    assert "return_to" not in auth_client.token_manager.get_new_token_url.call_args.kwargs
+    # Both refreshes use the session's refresh token and overlap
+    assert auth_client.token_manager.refreshed_with == ["rt", "rt"]
+    assert auth_client.token_manager.max_in_flight == 2
+    assert "rotated" not in response.text and "id_token" not in response.text
+
+    write = auth_client.session_manager.set_encrypted_session_tokens
+    write.assert_awaited_once()
+    assert len(write.await_args.args[1]) == 2
+    assert "__session_data_0" in response.cookies
+
+
+@pytest.mark.asyncio
+async def test_batch_size_is_bounded(client):
+    async with client:
+        empty = await client.post("/auth/get_tokens", json=[])
+        too_many = await client.post("/auth/get_tokens", json=[{"audience": f"https://{i}"} for i in range(21)])
+
+    assert empty.status_code == too_many.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_refreshed_token_is_returned_as_session_entry(auth_client, client):
+    refreshed = _token("https://b.example.com", 600)
+    session = {"user": {"sub": "user|1"}, "refresh_token": "rotated-rt", "tokens": [refreshed]}
+    auth_client.session_manager.set_encrypted_session = AsyncMock(
+        return_value=jwt.encode(session, SECRET_KEY, algorithm="HS256"))
+
+    async def refresh_tokens_async(refresh_token, scope=None, user_id=None, audience=None):
+        return {"access_token": refreshed["access_token"], "refresh_token": "rotated-rt", "id_token": "id",
+                "expires_in": 600, "scope": scope}
+
+    auth_client.token_manager.refresh_tokens_async = refresh_tokens_async
+
+    async with client:
+        response = await client.get("/auth/get_token", params={"audience": "https://b.example.com", "scope": "read"})
+
+    assert response.json() == refreshed
+    assert "rotated-rt" not in response.text
+
+
+@pytest.mark.asyncio
+async def test_subset_request_refreshes_the_full_scope_token(auth_client):
+    superset = {**_token("https://b.example.com", -1), "scope": "read write"}
+    session = {"user": {"sub": "user|1"}, "refresh_token": "rt", "tokens": [superset]}
+    written = []
+
+    async def set_encrypted_session(token_data, user_id=None):
+        written.append(token_data)
+        tokens = [{**superset, "access_token": token_data["access_token"], "scope": token_data["scope"],
+                   "expires_at": {"epoch": int(time.time()) + 600}}]
+        return jwt.encode({**session, "tokens": tokens}, SECRET_KEY, algorithm="HS256")
+
+    auth_client.session_manager.set_encrypted_session = AsyncMock(side_effect=set_encrypted_session)
+
+    async with _client(auth_client, session) as client:
+        single = await client.get("/auth/get_token", params={"audience": "https://b.example.com", "scope": "read"})
+        batch = await client.post("/auth/get_tokens", json=[
+            {"audience": "https://b.example.com", "scope": "read"},
+            {"audience": "https://b.example.com", "scope": "write"}])
+
+    # The session keeps the token covering every scope it had, not just the requested one
+    assert written[0]["scope"] == "read write"
+    assert single.json()["scope"] == "read write"
+    write = auth_client.session_manager.set_encrypted_session_tokens
+    assert [token_data["scope"] for token_data in write.await_args.args[1]] == ["read write"]
+    assert len(auth_client.token_manager.refreshed_with) == 2
+    assert all("token" in result for result in batch.json()["tokens"])
+
+
+@pytest.mark.asyncio
+async def test_refresh_granting_fewer_scopes_asks_for_the_rest(auth_client):
+    expired = {**_token("https://b.example.com", -1), "scope": "read write"}
+    session = {"user": {"sub": "user|1"}, "refresh_token": "rt", "tokens": [expired]}
+    # Auth0 only granted part of the scopes on refresh
+    narrowed = {**_token("https://b.example.com", 600), "scope": "read"}
+    auth_client.session_manager.set_encrypted_session = AsyncMock(
+        return_value=jwt.encode({**session, "tokens": [narrowed]}, SECRET_KEY, algorithm="HS256"))
+
+    async with _client(auth_client, session) as client:
+        response = await client.get("/auth/get_token", params={"audience": "https://b.example.com", "scope": "write"})
+
+    assert response.status_code == 302
+    assert response.headers["location"].startswith("https://example.auth0.com/authorize")
+
+
+@pytest.mark.asyncio
+async def test_batch_refresh_granting_fewer_scopes_returns_authorize_url(auth_client):
+    expired = {**_token("https://b.example.com", -1), "scope": "read write"}
+    session = {"user": {"sub": "user|1"}, "refresh_token": "rt", "tokens": [expired]}
+
+    async def set_encrypted_session_tokens(user_id, token_data_list):
+        narrowed = {**_token("https://b.example.com", 600), "scope": "read"}
+        return jwt.encode({**session, "tokens": [narrowed]}, SECRET_KEY, algorithm="HS256")
+
+    auth_client.session_manager.set_encrypted_session_tokens = AsyncMock(side_effect=set_encrypted_session_tokens)
+
+    async with _client(auth_client, session) as client:
+        response = await client.post("/auth/get_tokens", json=[
+            {"audience": "https://b.example.com", "scope": "read"},
+            {"audience": "https://b.example.com", "scope": "write"}])
+
+    read, write = response.json()["tokens"]
+    assert read["token"]["scope"] == "read"
+    assert "token" not in write and write["error"] == "login_required"
+    assert write["authorize_url"].startswith("https://example.auth0.com/authorize")
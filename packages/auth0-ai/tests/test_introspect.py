@@ -0,0 +1,62 @@
+import time
+
+import pytest
+
+from unittest.mock import AsyncMock, MagicMock
+from auth0.exceptions import Auth0Error
+from auth0_ai.token_module.manager import TokenManager
+
+
+@pytest.fixture
+def token_manager():
+    auth_client = MagicMock()
+    auth_client.domain = "example.auth0.com"
+    auth_client.token_verifier.verify_signature = AsyncMock(return_value={
+        "sub": "user|1", "aud": "https://api.example.com", "scope": "read:a",
+        "exp": int(time.time()) + 600, "iat": int(time.time()),
+    })
+    manager = TokenManager(auth_client)
+    manager.get_userinfo_async = AsyncMock(return_value={"sub": "user|1"})
+    return manager
+
+
+@pytest.mark.asyncio
+async def test_jwt_is_introspected_from_verified_claims(token_manager):
+    info = await token_manager.introspect("header.payload.signature")
+    await token_manager.introspect("header.payload.signature")
+
+    assert info["active"] is True
+    assert info["sub"] == "user|1"
+    assert info["scope"] == "read:a"
+    assert token_manager.token_verifier.verify_signature.await_count == 1
+    token_manager.get_userinfo_async.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_expired_or_invalid_jwt_is_inactive(token_manager):
+    verify_signature = token_manager.token_verifier.verify_signature
+    verify_signature.return_value = {"sub": "user|1", "exp": int(time.time()) - 1}
+    assert (await token_manager.introspect("expired.payload.signature"))["active"] is False
+
+    verify_signature.side_effect = ValueError("bad signature")
+    assert await token_manager.introspect("forged.payload.signature") == {"active": False}
+
+
+@pytest.mark.asyncio
+async def test_opaque_token_uses_stored_metadata_before_network(token_manager):
+    token_data = {"aud": "https://example.auth0.com/userinfo", "scope": "openid",
+                  "expires_at": {"epoch": int(time.time()) + 600}}
+
+    info = await token_manager.introspect("opaque-token", token_data)
+
+    assert info["active"] is True
+    assert info["scope"] == "openid"
+    token_manager.get_userinfo_async.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_opaque_token_falls_back_to_userinfo(token_manager):
+    assert await token_manager.introspect("opaque-token") == {"active": True, "sub": "user|1"}
+
+    token_manager.get_userinfo_async.side_effect = Auth0Error(401, "invalid_token", "expired")
+    assert await token_manager.introspect("opaque-token") == {"active": False}
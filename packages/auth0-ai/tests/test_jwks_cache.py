@@ -0,0 +1,138 @@
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import jwt
+import pytest
+
+from cryptography.hazmat.primitives.asymmetric import rsa
+from unittest.mock import MagicMock, patch
+from auth0.exceptions import TokenValidationError
+from auth0_ai.token_module.jwks import JwksCache, JwksSignatureVerifier
+from auth0_ai.utils.call_policy import CallPolicy, OutboundPolicies
+
+
+@pytest.fixture
+def private_key():
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+@pytest.fixture
+def jwks(private_key):
+    jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key()))
+    jwk.update({"kid": "key-1", "alg": "RS256", "use": "sig"})
+    return {"keys": [jwk]}
+
+
+@pytest.fixture
+def mock_requests(jwks):
+    with patch("auth0_ai.token_module.jwks.requests.get") as get:
+        get.return_value = MagicMock(json=MagicMock(return_value=jwks))
+        yield get
+
+
+@pytest.fixture
+def jwks_cache():
+    cache = JwksCache("https://example.auth0.com/.well-known/jwks.json")
+    yield cache
+    cache.close()
+
+
+def test_shared_instance_per_domain():
+    assert JwksCache.for_domain("tenant.auth0.com") is JwksCache.for_domain("tenant.auth0.com")
+    assert JwksCache.for_domain("tenant.auth0.com") is not JwksCache.for_domain("other.auth0.com")
+
+
+def test_prefetch_loads_keys_once(jwks_cache, mock_requests):
+    jwks_cache.prefetch(background=False)
+    jwks_cache.get_key("key-1")
+    jwks_cache.get_key("key-1")
+
+    assert mock_requests.call_count == 1
+
+
+def test_unknown_kid_refetch_is_rate_limited(jwks_cache, mock_requests):
+    jwks_cache.prefetch(background=False)
+
+    for _ in range(3):
+        with pytest.raises(TokenValidationError):
+            jwks_cache.get_key("rotated-key")
+
+    assert mock_requests.call_count == 1
+
+
+def test_unknown_kid_triggers_refetch_after_interval(jwks_cache, mock_requests, jwks):
+    jwks_cache.min_refetch_interval = 0
+    jwks_cache.prefetch(background=False)
+    rotated = {"keys": [dict(jwks["keys"][0], kid="key-2")]}
+    mock_requests.return_value.json.return_value = rotated
+
+    assert jwks_cache.get_key("key-2") is not None
+    assert mock_requests.call_count == 2
+
+
+def test_failed_refresh_keeps_previous_keys(jwks_cache, mock_requests):
+    jwks_cache.prefetch(background=False)
+    jwks_cache._fetched_at = jwks_cache._attempted_at = 0
+    mock_requests.side_effect = ConnectionError("unreachable")
+
+    assert jwks_cache.get_key("key-1") is not None
+    assert mock_requests.call_count == 2
+
+
+def test_failed_background_refresh_is_retried_until_it_recovers(jwks_cache, mock_requests, jwks):
+    ok = mock_requests.return_value
+    mock_requests.side_effect = [ConnectionError("unreachable"), ConnectionError("unreachable"), ok]
+
+    jwks_cache.prefetch(background=False)
+    # Expired and failing: verifications do not refetch again within the rate limit
+    with pytest.raises(TokenValidationError):
+        jwks_cache.get_key("key-1")
+    assert mock_requests.call_count == 1
+
+    # The background chain keeps going, backing off after each failure
+    assert jwks_cache._refresh_timer.interval == jwks_cache.retry_backoff
+    jwks_cache._refresh_timer.function()
+    assert jwks_cache._refresh_timer.interval == jwks_cache.retry_backoff * 2
+    jwks_cache._refresh_timer.function()
+
+    assert jwks_cache.get_key("key-1") is not None
+    assert jwks_cache._refresh_timer.interval == jwks_cache.cache_ttl - jwks_cache.refresh_ahead
+    assert mock_requests.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_verifier_uses_shared_cache(jwks_cache, mock_requests, private_key):
+    token = jwt.encode({"sub": "user|1"}, private_key,
+                       algorithm="RS256", headers={"kid": "key-1"})
+    first = JwksSignatureVerifier(jwks_cache)
+    second = JwksSignatureVerifier(jwks_cache)
+
+    assert (await first.verify_signature(token))["sub"] == "user|1"
+    assert second.verify_signature_sync(token)["sub"] == "user|1"
+    assert mock_requests.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_verifier_fetches_under_its_own_policies_and_executor(jwks_cache, mock_requests, private_key):
+    token = jwt.encode({"sub": "user|1"}, private_key,
+                       algorithm="RS256", headers={"kid": "key-1"})
+    fetch_threads = []
+    response = mock_requests.return_value
+
+    def get(*args, **kwargs):
+        fetch_threads.append(threading.current_thread().name)
+        return response
+
+    mock_requests.side_effect = get
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="client-io")
+    slow = OutboundPolicies({"jwks": CallPolicy(timeout=9.0)})
+    # Another client sharing the cache does not change the policies of this one
+    JwksSignatureVerifier(jwks_cache, call_policies=OutboundPolicies({"jwks": CallPolicy(timeout=1.0)}))
+    verifier = JwksSignatureVerifier(jwks_cache, call_policies=slow, executor=executor)
+
+    assert (await verifier.verify_signature(token))["sub"] == "user|1"
+    executor.shutdown()
+
+    assert fetch_threads[0].startswith("client-io")
+    assert mock_requests.call_args.kwargs["timeout"] == 9.0
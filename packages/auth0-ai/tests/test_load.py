@@ -0,0 +1,31 @@
+import pytest
+
+from auth0_ai.testing import FakeAuth0, LoadReport, LoadTest, check_reports, format_reports
+
+USERS = 10
+# Generous budgets for shared CI runners; they catch regressions such as blocking the event loop
+MAX_P95_SECONDS = 2.0
+MIN_THROUGHPUT = 5.0
+
+
+@pytest.mark.asyncio
+async def test_auth_routes_meet_performance_budget():
+    with FakeAuth0() as fake:
+        reports = await LoadTest(users=USERS, concurrency=5, requests_per_user=3, fake=fake).run()
+
+    assert list(reports) == ["callback", "get_user", "get_token_warm", "get_token_expired", "logout"]
+    assert reports["get_user"].requests == USERS * 3
+    # One code exchange per user plus one refresh per user of the expiring cohort, none for warm tokens
+    assert fake.calls["/oauth/token"] == USERS + USERS // 2
+    failures = check_reports(reports, max_p95=MAX_P95_SECONDS, min_throughput=MIN_THROUGHPUT)
+    assert failures == [], format_reports(reports)
+
+
+def test_report_percentiles_and_budget_failures():
+    report = LoadReport("scenario", [0.01 * i for i in range(1, 101)], errors=2, duration=2.0)
+
+    assert report.percentile(50) == pytest.approx(0.5)
+    assert report.percentile(95) == pytest.approx(0.95)
+    assert report.throughput == 50
+    failures = check_reports({"scenario": report}, max_p95=0.5, min_throughput=100)
+    assert len(failures) == 3
@@ -0,0 +1,69 @@
+import httpx
+import pytest
+
+from fastapi import FastAPI
+from unittest.mock import MagicMock
+from auth0_ai.server.routes import create_auth_router
+from auth0_ai.state.storage import MemoryStateStore
+from auth0_ai.token_module.cache import TTLCache
+from auth0_ai.utils.call_policy import OutboundPolicies
+from auth0_ai.utils.metrics import CACHE_REQUESTS, OUTBOUND_LATENCY, MetricsRegistry
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    latency = registry.histogram("latency_seconds", "Latency.", ("endpoint",), buckets=(0.1, 1.0))
+    latency.observe(0.05, endpoint="a")
+    latency.observe(0.5, endpoint="a")
+    latency.observe(5, endpoint="a")
+    registry.counter("hits_total", "Hits.", ("cache",)).inc(cache='say "hi"')
+
+    text = registry.render()
+
+    assert "# TYPE latency_seconds histogram" in text
+    assert 'latency_seconds_bucket{endpoint="a",le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{endpoint="a",le="1.0"} 2' in text
+    assert 'latency_seconds_bucket{endpoint="a",le="+Inf"} 3' in text
+    assert 'latency_seconds_count{endpoint="a"} 3' in text
+    assert 'hits_total{cache="say \\"hi\\""} 1' in text
+    assert registry.counter("hits_total", "Hits.", ("cache",)) is registry.get("hits_total")
+    with pytest.raises(ValueError):
+        registry.histogram("hits_total", "Hits.", ("cache",))
+
+
+def test_outbound_calls_and_cache_lookups_are_recorded():
+    before = OUTBOUND_LATENCY.count(endpoint="test_endpoint", outcome="success")
+    OutboundPolicies().call("test_endpoint", lambda: "ok")
+    assert OUTBOUND_LATENCY.count(endpoint="test_endpoint", outcome="success") == before + 1
+
+    cache = TTLCache(name="test_cache")
+    cache.get("key")
+    cache.set("key", "value")
+    cache.get("key")
+    assert CACHE_REQUESTS.value(cache="test_cache", result="miss") >= 1
+    assert CACHE_REQUESTS.value(cache="test_cache", result="hit") >= 1
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_reports_routes_and_state_failures():
+    auth_client = MagicMock()
+    auth_client.io_executor = None
+    auth_client.admission = None
+    auth_client.state_store = MemoryStateStore()
+    app = FastAPI()
+    app.include_router(create_auth_router(auth_client, expose_metrics=True))
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        rejected = await client.get("/auth/callback", params={"code": "c", "state": "unknown"})
+        response = await client.get("/auth/metrics")
+
+    assert rejected.status_code == 400
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'auth0_ai_route_duration_seconds_count{route="/auth/callback",method="GET",status="400"}' in response.text
+    assert 'auth0_ai_state_validation_failures_total{reason="unknown_state"}' in response.text
+    assert 'auth0_ai_store_duration_seconds_count{store="state",operation="get"}' in response.text
+
+
+def test_metrics_endpoint_is_opt_in():
+    paths = {route.path for route in create_auth_router(object()).routes}
+    assert "/auth/metrics" not in paths
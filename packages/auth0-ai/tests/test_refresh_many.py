@@ -0,0 +1,106 @@
+import time
+
+import jwt
+import pytest
+
+from unittest.mock import AsyncMock, MagicMock, patch
+from auth0_ai.session_module.manager import SessionManager
+from auth0_ai.session_module.storage.local_store import LocalStore
+from auth0_ai.token_module.manager import TokenManager
+
+SECRET_KEY = "a-test-secret-that-is-long-enough-for-hs256"
+
+
+@pytest.fixture
+def auth_client(tmp_path):
+    auth_client = MagicMock()
+    auth_client.domain = "example.auth0.com"
+    auth_client.secret_key = SECRET_KEY
+    auth_client.state_store = {}
+    auth_client.token_verifier.verify_signature = AsyncMock(side_effect=ValueError("opaque"))
+    auth_client.token_manager = TokenManager(auth_client)
+    auth_client.session_manager = SessionManager(
+        auth_client, store=LocalStore(file_path=str(tmp_path / "sessions")))
+    return auth_client
+
+
+def _store_session(auth_client, user_id, refresh_token):
+    session = {
+        "user": {"sub": user_id},
+        "id_token": {"id_token": "id", "id_token_expiry": int(time.time()) + 600},
+        "refresh_token": refresh_token,
+        "tokens": [],
+        "linked_connections": [],
+    }
+    auth_client.session_manager._set_stored_session(
+        user_id, jwt.encode(session, SECRET_KEY, algorithm="HS256"))
+
+
+@pytest.mark.asyncio
+async def test_refresh_many_returns_per_user_results(auth_client):
+    for i in range(5):
+        _store_session(auth_client, f"user|{i}", f"rt-{i}")
+    token_manager = auth_client.token_manager
+
+    def refresh(refresh_token, scope=None, audience=None):
+        if refresh_token == "rt-3":
+            raise RuntimeError("invalid_grant")
+        return {"access_token": f"at-{refresh_token}", "expires_in": 3600}
+
+    with patch.object(token_manager, "_request_refresh", side_effect=refresh):
+        results = await token_manager.refresh_many(
+            [f"user|{i}" for i in range(5)] + ["user|missing"], concurrency=2)
+
+    assert results["user|0"] == {"is_successful": True, "error": None}
+    assert results["user|3"] == {"is_successful": False, "error": "invalid_grant"}
+    assert results["user|missing"]["is_successful"] is False
+    session = auth_client.session_manager.get_encrypted_session("user|0")
+    assert session["tokens"][0]["access_token"] == "at-rt-0"
+    assert session["refresh_token"] == "rt-0"
+
+
+@pytest.mark.asyncio
+async def test_refresh_many_bounds_concurrency(auth_client):
+    for i in range(6):
+        _store_session(auth_client, f"user|{i}", f"rt-{i}")
+    token_manager = auth_client.token_manager
+    in_flight = []
+    peak = []
+
+    def refresh(refresh_token, scope=None, audience=None):
+        in_flight.append(refresh_token)
+        peak.append(len(in_flight))
+        time.sleep(0.05)
+        in_flight.remove(refresh_token)
+        return {"access_token": "at", "expires_in": 3600}
+
+    with patch.object(token_manager, "_request_refresh", side_effect=refresh), \
+            patch.object(auth_client.session_manager.store, "set_many_stored_sessions",
+                         wraps=auth_client.session_manager.store.set_many_stored_sessions) as bulk_write:
+        await token_manager.refresh_many([f"user|{i}" for i in range(6)], concurrency=2)
+
+    assert max(peak) <= 2
+    bulk_write.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_invalid_id_token_only_fails_its_own_user(auth_client):
+    for i in range(3):
+        _store_session(auth_client, f"user|{i}", f"rt-{i}")
+    token_manager = auth_client.token_manager
+
+    def refresh(refresh_token, scope=None, audience=None):
+        token_data = {"access_token": f"at-{refresh_token}", "refresh_token": f"new-{refresh_token}", "expires_in": 3600}
+        if refresh_token == "rt-1":
+            token_data["id_token"] = "forged"
+        return token_data
+
+    with patch.object(token_manager, "_request_refresh", side_effect=refresh):
+        results = await token_manager.refresh_many([f"user|{i}" for i in range(3)])
+
+    assert results["user|1"]["is_successful"] is False
+    assert results["user|1"]["error"].startswith("failed to store session: Invalid ID token")
+    for user_id in ("user|0", "user|2"):
+        assert results[user_id]["is_successful"] is True
+        # The rotated refresh tokens of the valid users are saved
+        assert auth_client.session_manager.get_encrypted_session(user_id)["refresh_token"] == f"new-rt-{user_id[-1]}"
@@ -0,0 +1,65 @@
+import time
+
+import pytest
+
+from unittest.mock import MagicMock
+from auth0_ai.token_module.manager import TokenManager
+from auth0_ai.token_module.refresh_policy import RefreshPolicy
+
+
+def test_token_inside_refresh_window_is_not_fresh():
+    policy = RefreshPolicy(skew=10, refresh_ahead=30, jitter=0)
+    now = 1_000_000
+
+    assert policy.is_fresh(now + 41, now=now)
+    assert not policy.is_fresh(now + 40, now=now)
+    assert not policy.is_fresh(None, now=now)
+
+
+def test_jitter_is_stable_per_token_and_bounded():
+    policy = RefreshPolicy(skew=0, refresh_ahead=0, jitter=20)
+    expires_at = 1_000_000
+
+    refresh_times = {policy.refresh_at(expires_at, key=f"token-{i}") for i in range(50)}
+
+    assert policy.refresh_at(expires_at, key="token-1") == policy.refresh_at(expires_at, key="token-1")
+    assert all(expires_at - 20 <= refresh_at <= expires_at for refresh_at in refresh_times)
+    assert len(refresh_times) > 1
+
+
+def test_short_lived_token_is_fresh_for_part_of_its_lifetime():
+    policy = RefreshPolicy()
+    issued_at = 1_000_000
+    expires_at = issued_at + 60
+
+    # At most half of the lifetime is spent in the window, instead of 40-60s of it
+    assert not policy.is_fresh(expires_at, key="token", now=issued_at + 29)
+    assert policy.is_fresh(expires_at, key="token", now=issued_at + 29, issued_at=issued_at)
+    assert not policy.is_fresh(expires_at, key="token", now=expires_at - 20, issued_at=issued_at)
+    # Long-lived tokens keep the full window
+    assert policy.refresh_at(issued_at + 3600, issued_at=issued_at) == policy.refresh_at(issued_at + 3600)
+
+
+@pytest.fixture
+def token_manager():
+    auth_client = MagicMock()
+    auth_client.domain = "example.auth0.com"
+    return TokenManager(auth_client, refresh_policy=RefreshPolicy(skew=10, refresh_ahead=30, jitter=0))
+
+
+def test_validate_tokens_applies_policy(token_manager):
+    now = time.time()
+    assert token_manager.validate_tokens({"expires_at": {"epoch": now + 300}})
+    assert not token_manager.validate_tokens({"expires_at": {"epoch": now + 20}})
+    assert token_manager.validate_tokens({"issued_at": {"epoch": now}, "expires_at": {"epoch": now + 60}})
+    assert not token_manager.validate_tokens({})
+
+
+def test_get_access_token_skips_tokens_about_to_expire(token_manager):
+    session_manager = token_manager.auth_client.session_manager
+    session_manager._get_stored_sessions.return_value = ["user|1"]
+    session_manager.get_encrypted_session.return_value = {"tokens": [
+        {"aud": "api", "access_token": "expiring", "expires_at": {"epoch": time.time() + 5}},
+    ]}
+
+    assert token_manager.get_access_token("user|1", aud="api") == {"no valid tokens found"}
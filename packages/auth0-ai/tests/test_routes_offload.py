@@ -0,0 +1,80 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+
+from fastapi import FastAPI
+from unittest.mock import AsyncMock, MagicMock
+from auth0_ai.server.routes import setup_routes
+from auth0_ai.session_module.storage.local_store import LocalStore
+from auth0_ai.state.storage import MemoryStateStore
+from auth0_ai.utils.offload import run_blocking
+
+EXCHANGE_SECONDS = 0.3
+CONCURRENT_LOGINS = 4
+SESSIONS = 200
+WORKERS = 32
+
+
+def _slow_exchange(code):
+    time.sleep(EXCHANGE_SECONDS)
+    return {"access_token": code}
+
+
+@pytest.fixture
+def auth_client():
+    auth_client = MagicMock()
+    auth_client.io_executor = ThreadPoolExecutor(max_workers=CONCURRENT_LOGINS)
+    auth_client.admission = None
+    auth_client.state_waiters = None
+    auth_client.state_store = MemoryStateStore()
+    for i in range(CONCURRENT_LOGINS):
+        auth_client.state_store.set_state(f"state-{i}", {"user_id": f"user|{i}"})
+    auth_client.token_manager.exchange_code_for_tokens_async = lambda code: run_blocking(
+        auth_client.io_executor, _slow_exchange, code)
+    auth_client.session_manager.set_encrypted_session = AsyncMock(return_value="session")
+    yield auth_client
+    auth_client.io_executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_slow_code_exchange_does_not_block_other_callbacks(auth_client):
+    app = FastAPI()
+    setup_routes(app, auth_client)
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        started = time.perf_counter()
+        responses = await asyncio.gather(*(
+            client.get("/auth/callback", params={"code": f"code-{i}", "state": f"state-{i}"})
+            for i in range(CONCURRENT_LOGINS)
+        ))
+        elapsed = time.perf_counter() - started
+
+    assert all(response.status_code == 200 for response in responses)
+    # Sequential exchanges on the event loop would take CONCURRENT_LOGINS * EXCHANGE_SECONDS
+    assert elapsed < EXCHANGE_SECONDS * 2
+
+
+@pytest.mark.asyncio
+async def test_offloaded_store_calls_do_not_lose_writes(tmp_path):
+    # Routes run session store I/O on io_executor, so shelve calls arrive from many threads at once
+    store = LocalStore(str(tmp_path / "sessions"))
+    store.set_many_stored_sessions({f"old|{i}": "session" for i in range(SESSIONS)})
+    executor = ThreadPoolExecutor(max_workers=WORKERS)
+
+    await asyncio.gather(*(
+        operation
+        for i in range(SESSIONS)
+        for operation in (
+            run_blocking(executor, store.set_stored_session, f"new|{i}", f"session-{i}"),
+            run_blocking(executor, store.delete_stored_session, f"old|{i}"),
+            run_blocking(executor, store.get_stored_session, f"new|{i}"),
+        )
+    ))
+    executor.shutdown()
+
+    sessions = store.get_many_stored_sessions([f"new|{i}" for i in range(SESSIONS)])
+    assert sessions == {f"new|{i}": f"session-{i}" for i in range(SESSIONS)}
+    assert sorted(store.get_stored_sessions()) == sorted(sessions)
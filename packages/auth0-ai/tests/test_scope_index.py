@@ -0,0 +1,43 @@
+from auth0_ai.token_module.scope_index import ScopeIndex
+
+
+def _token(scope, aud="https://api.example.com", epoch=2_000_000_000):
+    return {"aud": aud, "access_token": scope, "scope": scope, "expires_at": {"epoch": epoch}}
+
+
+def test_subset_request_reuses_superset_token():
+    index = ScopeIndex([_token("read:a write:a")])
+
+    assert index.find("https://api.example.com", "read:a")["scope"] == "read:a write:a"
+    assert index.find("https://api.example.com")["scope"] == "read:a write:a"
+    assert index.find("https://api.example.com", "read:b") is None
+    assert index.find("https://other.example.com", "read:a") is None
+
+
+def test_prefers_narrowest_then_latest_expiring_token():
+    index = ScopeIndex([
+        _token("read:a write:a delete:a"),
+        _token("read:a write:a", epoch=1_000),
+        _token("read:a write:a", epoch=3_000),
+    ])
+
+    token = index.find("https://api.example.com", "read:a")
+
+    assert token["scope"] == "read:a write:a"
+    assert token["expires_at"]["epoch"] == 3_000
+
+
+def test_is_valid_filters_candidates():
+    index = ScopeIndex([_token("read:a", epoch=1_000), _token("read:a write:a")])
+
+    token = index.find("https://api.example.com", "read:a",
+                       is_valid=lambda t: t["expires_at"]["epoch"] > 1_000)
+
+    assert token["scope"] == "read:a write:a"
+
+
+def test_token_with_multiple_audiences_is_indexed_under_each():
+    index = ScopeIndex([_token("openid profile", aud=["https://api.example.com", "https://example.auth0.com/userinfo"])])
+
+    assert index.find("https://example.auth0.com/userinfo", "openid")
+    assert index.find("https://api.example.com", "profile")
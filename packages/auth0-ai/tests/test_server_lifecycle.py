@@ -0,0 +1,81 @@
+import socket
+import threading
+
+import pytest
+import requests
+
+from auth0_ai.auth.auth_client import AIAuth
+from auth0_ai.testing.fake_auth0 import _free_port
+
+
+def _auth_client(port, **kwargs):
+    return AIAuth(
+        domain="example.auth0.com",
+        client_id="client-id",
+        client_secret="client-secret",
+        redirect_uri=f"http://127.0.0.1:{port}/auth/callback",
+        secret_key="a-test-secret-that-is-long-enough-for-hs256",
+        prefetch_jwks=False,
+        **kwargs,
+    )
+
+
+def test_server_starts_lazily_and_stops_gracefully():
+    port = _free_port()
+    auth_client = _auth_client(port)
+
+    assert not auth_client.server.is_running
+    with pytest.raises(requests.ConnectionError):
+        requests.get(f"http://127.0.0.1:{port}/auth/get_user", timeout=1)
+
+    auth_client.start()
+    auth_client.start()
+    try:
+        assert requests.get(f"http://127.0.0.1:{port}/auth/get_user", timeout=1).status_code == 401
+    finally:
+        auth_client.stop()
+
+    assert not auth_client.server.is_running
+    with pytest.raises(requests.ConnectionError):
+        requests.get(f"http://127.0.0.1:{port}/auth/get_user", timeout=1)
+
+
+def test_stop_during_start_does_not_break_the_waiting_caller():
+    auth_client = _auth_client(_free_port())
+    errors = []
+
+    def start():
+        try:
+            auth_client.start()
+        except RuntimeError:
+            pass
+        except Exception as error:
+            errors.append(error)
+
+    for _ in range(5):
+        starter = threading.Thread(target=start)
+        starter.start()
+        auth_client.stop()
+        starter.join(10)
+        auth_client.stop()
+        assert not starter.is_alive()
+    assert errors == []
+
+
+def test_port_clash_is_reported_on_start_not_construction():
+    with socket.socket() as taken:
+        taken.bind(("127.0.0.1", 0))
+        taken.listen()
+        auth_client = _auth_client(taken.getsockname()[1])
+
+        with pytest.raises(RuntimeError, match="port in use"):
+            auth_client.start()
+
+
+@pytest.mark.asyncio
+async def test_headless_has_no_server_and_no_interactive_flows():
+    auth_client = _auth_client(_free_port(), headless=True)
+
+    assert auth_client.server is None
+    with pytest.raises(RuntimeError, match="headless"):
+        await auth_client.interactive_login()
@@ -0,0 +1,61 @@
+import httpx
+import jwt
+import pytest
+
+from fastapi import Depends, FastAPI
+from unittest.mock import MagicMock, patch
+from auth0_ai.server.session_dependency import SessionDependency
+
+SECRET_KEY = "a-test-secret-that-is-long-enough-for-hs256"
+
+
+@pytest.fixture
+def current_session():
+    auth_client = MagicMock()
+    auth_client.secret_key = SECRET_KEY
+    return SessionDependency(auth_client)
+
+
+@pytest.fixture
+def app(current_session):
+    app = FastAPI()
+
+    @app.get("/me")
+    async def me(session=Depends(current_session.required), again=Depends(current_session.optional)):
+        assert session is again
+        return session["user"]
+
+    return app
+
+
+def _cookies(current_session, session):
+    encoded = jwt.encode(session, SECRET_KEY, algorithm="HS256")
+    return {f"__session_data_{i}": value for i, value in enumerate(current_session.cookies.encode(encoded))}
+
+
+@pytest.mark.asyncio
+async def test_session_is_decoded_once_across_requests(app, current_session):
+    cookies = _cookies(current_session, {"user": {"sub": "user|1"}})
+
+    with patch("auth0_ai.server.session_dependency.jwt.decode", wraps=jwt.decode) as decode:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test", cookies=cookies) as client:
+            first = await client.get("/me")
+            second = await client.get("/me")
+
+    assert first.json() == second.json() == {"sub": "user|1"}
+    assert decode.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_missing_or_invalid_session_is_rejected(app, current_session):
+    forged = {f"__session_data_{i}": value for i, value in enumerate(
+        current_session.cookies.encode(jwt.encode({"user": {}}, "another-secret-that-is-long-enough-for-hs256")))}
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        missing = await client.get("/me")
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test", cookies=forged) as client:
+        invalid = await client.get("/me")
+
+    assert missing.status_code == 401
+    assert invalid.status_code == 401
+    assert invalid.json()["detail"] == "Invalid session cookie."
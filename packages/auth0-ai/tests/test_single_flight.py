@@ -0,0 +1,129 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from unittest.mock import AsyncMock, MagicMock, patch
+from auth0_ai.session_module.manager import SessionManager
+from auth0_ai.token_module.manager import TokenManager
+from auth0_ai.token_module.single_flight import SingleFlight
+
+
+@pytest.fixture
+def token_manager():
+    auth_client = MagicMock()
+    auth_client.domain = "example.auth0.com"
+    return TokenManager(auth_client)
+
+
+def test_sync_callers_share_one_call():
+    flight = SingleFlight()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.2)
+        return {"access_token": "at"}
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(flight.do("key", slow)))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == [{"access_token": "at"}] * 5
+    assert not flight.in_flight("key")
+
+
+def test_errors_are_shared_and_not_cached():
+    flight = SingleFlight()
+
+    def failing():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        flight.do("key", failing)
+    assert flight.do("key", lambda: "ok") == "ok"
+
+
+
+@pytest.mark.asyncio
+async def test_leader_cancelled_while_queued_releases_the_flight():
+    flight = SingleFlight()
+    fn = MagicMock(return_value="late")
+
+    async def queued_run(*args):
+        await asyncio.sleep(10)
+
+    leader = asyncio.create_task(flight.do_async("key", fn, run=queued_run))
+    await asyncio.sleep(0.01)
+    follower = asyncio.create_task(flight.do_async("key", fn))
+    await asyncio.sleep(0.01)
+    leader.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await asyncio.wait_for(follower, timeout=1)
+    assert not flight.in_flight("key")
+    assert await flight.do_async("key", lambda: "ok") == "ok"
+    fn.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_async_refreshes_are_coalesced(token_manager):
+    calls = []
+
+    def slow_refresh(refresh_token, scope=None, audience=None):
+        calls.append(refresh_token)
+        time.sleep(0.2)
+        return {"access_token": "new", "expires_in": 60}
+
+    with patch.object(token_manager, "_request_refresh", side_effect=slow_refresh):
+        results = await asyncio.gather(*[
+            token_manager.refresh_tokens_async(
+                "rt", scope="read write", user_id="user|1", audience="api")
+            for _ in range(4)
+        ], asyncio.to_thread(
+            token_manager.refresh_tokens,
+            "rt", scope="write read", user_id="user|1", audience="api"))
+
+    assert len(calls) == 1
+    assert all(result["access_token"] == "new" for result in results)
+
+
+@pytest.mark.asyncio
+async def test_different_audiences_are_not_coalesced(token_manager):
+    with patch.object(token_manager, "_request_refresh",
+                      side_effect=lambda refresh_token, scope=None, audience=None: time.sleep(0.05) or {}) as refresh:
+        await asyncio.gather(
+            token_manager.refresh_tokens_async("rt", user_id="user|1", audience="api-1"),
+            token_manager.refresh_tokens_async("rt", user_id="user|1", audience="api-2"),
+        )
+
+    assert refresh.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_session_update_saves_refreshed_tokens():
+    auth_client = MagicMock()
+    auth_client.token_manager.refresh_tokens_async = AsyncMock(return_value={"access_token": "new"})
+    session_manager = SessionManager(auth_client)
+
+    with patch.object(session_manager, "set_encrypted_session", AsyncMock()) as set_session:
+        await session_manager._update_encrypted_session("user|1", "rt")
+
+    set_session.assert_awaited_once_with({"access_token": "new"}, user_id="user|1")
+
+
+def test_refresh_requests_the_audience(token_manager):
+    with patch("auth0_ai.token_module.manager.GetToken") as get_token:
+        get_token.return_value.authenticated_post.return_value = {"access_token": "new"}
+        token_manager._request_refresh("rt", scope="read", audience="https://api.example.com")
+
+    data = get_token.return_value.authenticated_post.call_args.kwargs["data"]
+    assert data["audience"] == "https://api.example.com"
+    assert data["refresh_token"] == "rt"
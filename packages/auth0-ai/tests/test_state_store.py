@@ -0,0 +1,73 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from auth0_ai.state.login_state import LoginState
+from auth0_ai.state.storage import MemoryStateStore, SQLiteStateStore
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def state_store(request, tmp_path):
+    if request.param == "memory":
+        return MemoryStateStore()
+    return SQLiteStateStore(file_path=str(tmp_path / "states.db"))
+
+
+def test_dict_compatible(state_store):
+    state_store["abc"] = {"return_to": "/home"}
+
+    assert "abc" in state_store
+    assert state_store["abc"] == {"return_to": "/home"}
+    assert state_store.get("missing", {}) == {}
+    assert list(state_store) == ["abc"]
+    del state_store["abc"]
+    assert "abc" not in state_store
+
+
+def test_update_merges_fields(state_store):
+    state_store.set_state("abc", {"return_to": "/home"})
+
+    assert state_store.update_state("abc", user_id="user|1") == {"return_to": "/home", "user_id": "user|1"}
+    assert state_store.update_state("missing", user_id="user|1") is None
+
+
+def test_only_first_completion_succeeds(state_store):
+    state_store.set_state("abc", {"is_completed": False})
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda i: state_store.complete_state("abc", user_id=f"user|{i}"), range(8)))
+
+    winners = [result for result in results if result]
+    assert len(winners) == 1
+    assert state_store.get_state("abc")["user_id"] == winners[0]["user_id"]
+
+
+def test_consume_hands_out_state_once(state_store):
+    state_store.set_state("abc", {"user_id": "user|1"})
+
+    assert state_store.consume_state("abc") == {"user_id": "user|1"}
+    assert state_store.consume_state("abc") is None
+
+
+def test_expired_states_are_gone(tmp_path):
+    for state_store in (MemoryStateStore(ttl=-1), SQLiteStateStore(file_path=str(tmp_path / "states.db"), ttl=-1)):
+        state_store.set_state("abc", {})
+        assert state_store.get_state("abc") is None
+        assert len(state_store) == 0
+
+
+@pytest.mark.asyncio
+async def test_login_completed_through_another_store_instance(tmp_path):
+    # Two instances over the same file stand in for two worker processes
+    waiting_worker = SQLiteStateStore(file_path=str(tmp_path / "states.db"))
+    callback_worker = SQLiteStateStore(file_path=str(tmp_path / "states.db"))
+    waiting_worker.set_state("abc", {"is_completed": False})
+    login_state = LoginState(waiting_worker, "abc")
+
+    waiter = asyncio.create_task(login_state.wait_for_completion())
+    await asyncio.sleep(0.1)
+    callback_worker.complete_state("abc", user_id="user|1")
+
+    assert await asyncio.wait_for(waiter, timeout=2) == "user|1"
+    assert "abc" not in callback_worker
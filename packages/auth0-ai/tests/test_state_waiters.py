@@ -0,0 +1,172 @@
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+
+from fastapi import FastAPI
+from unittest.mock import AsyncMock, MagicMock
+from auth0_ai.server.routes import setup_routes
+from auth0_ai.state import LoginState, MemoryStateStore, SQLiteStateStore, StateWaiters
+from auth0_ai.utils import AdmissionController
+
+PENDING_LOGINS = 1000
+
+
+@pytest.mark.asyncio
+async def test_many_pending_waits_resolve_together():
+    waiters = StateWaiters()
+    tasks = [asyncio.create_task(waiters.wait(f"state-{i}", timeout=5)) for i in range(PENDING_LOGINS)]
+    await asyncio.sleep(0.05)
+    assert waiters.pending == PENDING_LOGINS
+
+    started = time.perf_counter()
+    for i in range(PENDING_LOGINS):
+        waiters.resolve(f"state-{i}", {"status": "completed", "user_id": f"user|{i}"})
+    outcomes = await asyncio.gather(*tasks)
+
+    assert time.perf_counter() - started < 1
+    assert outcomes[7] == {"status": "completed", "user_id": "user|7"}
+    assert waiters.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_late_waiter_and_timeout():
+    waiters = StateWaiters()
+    waiters.resolve("abc", {"status": "failed", "error": "access_denied"})
+
+    assert await waiters.wait("abc", timeout=0) == {"status": "failed", "error": "access_denied"}
+    assert await waiters.wait("other", timeout=0.05) is None
+    assert waiters.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_login_state_woken_from_another_thread():
+    # The standalone auth server resolves states on its own thread and event loop
+    state_store = MemoryStateStore()
+    state_store.set_state("abc", {"is_completed": False})
+    waiters = StateWaiters()
+    waiter = asyncio.create_task(LoginState(state_store, "abc", waiters).wait_for_completion())
+    await asyncio.sleep(0.05)
+
+    def complete():
+        state_store.complete_state("abc", user_id="user|1")
+        waiters.resolve("abc", {"status": "completed", "user_id": "user|1"})
+
+    threading.Thread(target=complete).start()
+    # Well below StateWaiters.POLL_INTERVAL, so the store was not simply re-read
+    assert await asyncio.wait_for(waiter, timeout=1) == "user|1"
+
+
+
+@pytest.mark.asyncio
+async def test_login_state_completed_by_another_worker(tmp_path):
+    # Another worker completes the state in the shared store, without reaching these waiters
+    path = str(tmp_path / "states.db")
+    state_store = SQLiteStateStore(path)
+    state_store.set_state("abc", {"is_completed": False})
+    waiter = asyncio.create_task(LoginState(state_store, "abc", StateWaiters()).wait_for_completion())
+    await asyncio.sleep(0.05)
+
+    SQLiteStateStore(path).complete_state("abc", user_id="user|1")
+
+    assert await asyncio.wait_for(waiter, timeout=1) == "user|1"
+
+
+@pytest.mark.asyncio
+async def test_waiting_reads_the_store_off_the_event_loop():
+    loop_thread = threading.get_ident()
+    read_threads = set()
+
+    class RecordingStore(MemoryStateStore):
+        def get_state(self, state):
+            read_threads.add(threading.get_ident())
+            return super().get_state(state)
+
+        def consume_state(self, state):
+            read_threads.add(threading.get_ident())
+            return super().consume_state(state)
+
+    state_store = RecordingStore()
+    state_store.set_state("abc", {"is_completed": False})
+    login_state = LoginState(state_store, "abc")
+    login_state.POLL_INTERVAL = 0.01
+    waiter = asyncio.create_task(login_state.wait_for_completion())
+    await asyncio.sleep(0.05)
+    state_store.complete_state("abc", user_id="user|1")
+
+    assert await asyncio.wait_for(waiter, timeout=1) == "user|1"
+    assert read_threads and loop_thread not in read_threads
+
+@pytest.fixture
+def app():
+    auth_client = MagicMock()
+    auth_client.io_executor = None
+    auth_client.admission = None
+    auth_client.state_store = MemoryStateStore()
+    auth_client.state_store.set_state("abc", {"is_completed": False, "user_id": "user|1"})
+    auth_client.state_waiters = StateWaiters()
+    auth_client.token_manager.exchange_code_for_tokens_async = AsyncMock(
+        side_effect=lambda code: {"access_token": code})
+    auth_client.session_manager.set_encrypted_session = AsyncMock(return_value="session")
+    app = FastAPI()
+    setup_routes(app, auth_client)
+    return app
+
+
+@pytest.mark.asyncio
+async def test_long_poll_returns_when_callback_completes(app):
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        wait = asyncio.create_task(client.get("/auth/wait", params={"state": "abc"}))
+        await asyncio.sleep(0.05)
+        callback = await client.get("/auth/callback", params={"code": "code", "state": "abc"})
+        response = await asyncio.wait_for(wait, timeout=1)
+        unknown = await client.get("/auth/wait", params={"state": "missing"})
+
+    assert callback.status_code == 200
+    # Knowing the state reveals whether the login completed, not who logged in
+    assert response.json() == {"status": "completed"}
+    assert unknown.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_event_stream_reports_failed_login(app):
+    headers = {"Accept": "text/event-stream"}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        wait = asyncio.create_task(client.get("/auth/wait", params={"state": "abc"}, headers=headers))
+        await asyncio.sleep(0.05)
+        await client.get("/auth/callback", params={"error": "access_denied", "error_description": "denied",
+                                                   "state": "abc"})
+        response = await asyncio.wait_for(wait, timeout=1)
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.text == 'event: failed\ndata: {"status": "failed", "error": "denied"}\n\n'
+
+
+@pytest.mark.asyncio
+async def test_event_stream_times_out_while_pending(app):
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get("/auth/wait", params={"state": "abc", "timeout": 0.05},
+                                    headers={"Accept": "text/event-stream"})
+
+    assert response.text.endswith('event: timeout\ndata: {"status": "pending"}\n\n')
+
+
+@pytest.mark.asyncio
+async def test_wait_is_admission_controlled_and_hides_the_user():
+    auth_client = MagicMock()
+    auth_client.io_executor = None
+    auth_client.admission = AdmissionController(per_client_rate=1, max_wait=0)
+    auth_client.state_store = MemoryStateStore()
+    auth_client.state_store.set_state("abc", {"is_completed": True, "user_id": "user|1"})
+    auth_client.state_waiters = StateWaiters()
+    app = FastAPI()
+    setup_routes(app, auth_client)
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        first = await client.get("/auth/wait", params={"state": "abc"})
+        second = await client.get("/auth/wait", params={"state": "abc"})
+
+    assert first.json() == {"status": "completed"}
+    assert second.status_code == 429
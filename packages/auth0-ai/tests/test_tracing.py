@@ -0,0 +1,123 @@
+import contextvars
+import time
+from contextlib import contextmanager
+
+import httpx
+import jwt
+import pytest
+
+from fastapi import FastAPI
+from unittest.mock import MagicMock, patch
+from auth0_ai.server.routes import create_auth_router
+from auth0_ai.server.session_dependency import SessionDependency
+from auth0_ai.token_module.manager import TokenManager
+from auth0_ai.utils import tracing
+from auth0_ai.utils.offload import run_blocking
+
+SECRET_KEY = "a-test-secret-that-is-long-enough-for-hs256"
+
+
+class FakeSpan:
+    def __init__(self, name, attributes, parent):
+        self.name = name
+        self.attributes = dict(attributes or {})
+        self.parent = parent
+
+    def is_recording(self):
+        return True
+
+    def set_attributes(self, attributes):
+        self.attributes.update(attributes)
+
+
+class FakeTrace:
+    """Records spans like an OpenTelemetry SDK would, keeping the current span in a context variable"""
+
+    def __init__(self):
+        self.spans = []
+        self._current = contextvars.ContextVar("current_span", default=None)
+
+    def get_tracer(self, name):
+        return self
+
+    @contextmanager
+    def start_as_current_span(self, name, attributes=None):
+        span = FakeSpan(name, attributes, self._current.get())
+        self.spans.append(span)
+        token = self._current.set(span)
+        try:
+            yield span
+        finally:
+            self._current.reset(token)
+
+    def get_current_span(self):
+        return self._current.get() or MagicMock(is_recording=lambda: False)
+
+    def named(self, name):
+        return [span for span in self.spans if span.name == name]
+
+
+@pytest.fixture
+def fake_trace():
+    fake = FakeTrace()
+    with patch.object(tracing, "trace", fake):
+        yield fake
+
+
+@pytest.mark.asyncio
+async def test_spans_follow_blocking_calls_onto_worker_threads(fake_trace):
+    with tracing.span("auth0_ai.parent", audience="https://api.example.com", scope=None) as parent:
+        await run_blocking(None, tracing.set_attributes, batch_size=3)
+        with tracing.span("auth0_ai.child") as child:
+            pass
+
+    assert parent.attributes == {"auth0_ai.audience": "https://api.example.com", "auth0_ai.batch_size": 3}
+    assert child.parent is parent
+
+
+@pytest.mark.asyncio
+async def test_route_span_records_audience_and_cache_outcome(fake_trace):
+    auth_client = MagicMock()
+    auth_client.secret_key = SECRET_KEY
+    auth_client.io_executor = None
+    auth_client.token_manager = TokenManager(auth_client)
+    current_session = SessionDependency(auth_client)
+    app = FastAPI()
+    app.include_router(create_auth_router(auth_client, current_session))
+    token = {"aud": "https://api.example.com", "access_token": "at", "scope": "read",
+             "expires_at": {"epoch": int(time.time()) + 600}}
+    encoded = jwt.encode({"user": {"sub": "user|1"}, "tokens": [token]}, SECRET_KEY, algorithm="HS256")
+    cookies = {f"__session_data_{i}": value for i, value in enumerate(current_session.cookies.encode(encoded))}
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test", cookies=cookies) as client:
+        response = await client.get("/auth/get_token", params={"audience": "https://api.example.com", "scope": "read"})
+
+    assert response.status_code == 200
+    [route_span] = fake_trace.named("auth0_ai.route GET /auth/get_token")
+    assert route_span.attributes["auth0_ai.audience"] == "https://api.example.com"
+    assert route_span.attributes["auth0_ai.cache.session_tokens"] == "hit"
+    assert route_span.attributes["auth0_ai.cache.session"] == "miss"
+    assert route_span.attributes["auth0_ai.status"] == 200
+
+
+@pytest.mark.asyncio
+async def test_traced_methods_and_outbound_calls_open_spans(fake_trace):
+    auth_client = MagicMock()
+    token_manager = TokenManager(auth_client)
+    token_manager._rest_client = MagicMock()
+    token_manager._rest_client.return_value.get.return_value = {"sub": "user|1"}
+
+    await token_manager.get_userinfo_async("opaque-token")
+
+    [userinfo] = fake_trace.named("auth0_ai.token.userinfo")
+    [outbound] = fake_trace.named("auth0_ai.outbound.userinfo")
+    assert outbound.parent is userinfo
+    assert outbound.attributes["auth0_ai.outcome"] == "success"
+    assert userinfo.attributes["auth0_ai.cache.userinfo"] == "miss"
+
+
+def test_spans_are_no_ops_without_opentelemetry():
+    with patch.object(tracing, "trace", None):
+        with tracing.span("auth0_ai.anything", audience="x") as span:
+            tracing.set_attributes(batch_size=1)
+    assert span is None
@@ -0,0 +1,79 @@
+import jwt
+import pytest
+
+from unittest.mock import MagicMock, patch
+from auth0_ai.token_module.manager import TokenManager
+
+
+def _access_token(sub):
+    return jwt.encode({"sub": sub}, "a-test-secret-that-is-long-enough-for-hs256", algorithm="HS256")
+
+
+@pytest.fixture
+def mock_rest_client():
+    with patch("auth0_ai.token_module.manager.AuthenticationBase") as rest_client:
+        rest_client.return_value.get.side_effect = lambda url, headers: {"sub": "user|1", "name": "Jane"}
+        yield rest_client.return_value
+
+
+@pytest.fixture
+def token_manager(mock_rest_client):
+    auth_client = MagicMock()
+    auth_client.domain = "example.auth0.com"
+    return TokenManager(auth_client)
+
+
+def test_userinfo_is_cached_per_token(token_manager, mock_rest_client):
+    access_token = _access_token("user|1")
+    first = token_manager.get_userinfo(access_token)
+    second = token_manager.get_userinfo(access_token)
+
+    assert first == second
+    assert mock_rest_client.get.call_count == 1
+
+
+def test_forged_token_with_same_subject_misses_cache(token_manager, mock_rest_client):
+    token_manager.get_userinfo(_access_token("user|1"))
+    forged = jwt.encode({"sub": "user|1"}, "an-attacker-secret-that-is-long-enough", algorithm="HS256")
+    mock_rest_client.get.side_effect = Exception("401 Unauthorized")
+
+    with pytest.raises(Exception, match="401"):
+        token_manager.get_userinfo(forged)
+    assert mock_rest_client.get.call_count == 2
+
+
+def test_userinfo_is_refetched_after_invalidation(token_manager, mock_rest_client):
+    access_token = _access_token("user|1")
+    token_manager.get_userinfo(access_token)
+    token_manager.invalidate_userinfo("user|1")
+    token_manager.get_userinfo(access_token)
+
+    assert mock_rest_client.get.call_count == 2
+
+
+def test_opaque_tokens_are_keyed_by_digest(token_manager, mock_rest_client):
+    token_manager.get_userinfo("opaque-1")
+    token_manager.get_userinfo("opaque-1")
+    token_manager.get_userinfo("opaque-2")
+
+    assert mock_rest_client.get.call_count == 2
+
+
+def test_zero_ttl_disables_cache(mock_rest_client):
+    auth_client = MagicMock()
+    auth_client.domain = "example.auth0.com"
+    token_manager = TokenManager(auth_client, userinfo_ttl=0)
+
+    token_manager.get_userinfo(_access_token("user|1"))
+    token_manager.get_userinfo(_access_token("user|1"))
+
+    assert mock_rest_client.get.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_async_userinfo_shares_cache(token_manager, mock_rest_client):
+    access_token = _access_token("user|1")
+    await token_manager.get_userinfo_async(access_token)
+    token_manager.get_userinfo(access_token)
+
+    assert mock_rest_client.get.call_count == 1
@@ -0,0 +1,52 @@
+import time
+
+import pytest
+
+from unittest.mock import AsyncMock, MagicMock
+from auth0_ai.token_module.manager import TokenManager
+
+
+@pytest.fixture
+def token_manager():
+    auth_client = MagicMock()
+    auth_client.domain = "example.auth0.com"
+    auth_client.token_verifier.verify_signature = AsyncMock(
+        return_value={"sub": "user|1", "exp": int(time.time()) + 600})
+    return TokenManager(auth_client)
+
+
+@pytest.mark.asyncio
+async def test_verified_claims_are_cached(token_manager):
+    verify_signature = token_manager.token_verifier.verify_signature
+
+    first = await token_manager.verify_claims("header.payload.signature")
+    second = await token_manager.verify_token("header.payload.signature")
+
+    assert first == second
+    assert verify_signature.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_cached_claims_cannot_be_mutated(token_manager):
+    claims = await token_manager.verify_claims("header.payload.signature")
+    claims["sub"] = "tampered"
+
+    assert (await token_manager.verify_claims("header.payload.signature"))["sub"] == "user|1"
+
+
+@pytest.mark.asyncio
+async def test_tokens_without_future_exp_are_not_cached(token_manager):
+    verify_signature = token_manager.token_verifier.verify_signature
+    verify_signature.return_value = {"sub": "user|1", "exp": int(time.time()) - 1}
+
+    await token_manager.verify_claims("expired.token.signature")
+    await token_manager.verify_claims("expired.token.signature")
+
+    assert verify_signature.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_verify_token_returns_none_on_failure(token_manager):
+    token_manager.token_verifier.verify_signature.side_effect = ValueError("bad signature")
+
+    assert await token_manager.verify_token("bad.token.signature") is None
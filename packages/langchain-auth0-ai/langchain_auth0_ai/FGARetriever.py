@@ -1,5 +1,6 @@
 import os
 
+from contextlib import nullcontext
 from typing import Callable, Optional
 from langchain_core.retrievers import BaseRetriever
 from langchain_core.documents import Document
@@ -10,6 +11,22 @@ from openfga_sdk.client.models import ClientBatchCheckItem
 from openfga_sdk.sync import OpenFgaClient as OpenFgaClientSync
 from openfga_sdk.credentials import CredentialConfiguration, Credentials
 
+try:
+    from opentelemetry import trace
+
+    tracer = trace.get_tracer(__name__)
+except ImportError:  # Tracing is optional, installed with the opentelemetry extra
+    tracer = None
+
+
+def _span(name: str, **attributes):
+    """Span around an FGA step, or a no-op context when OpenTelemetry is missing."""
+    if tracer is None:
+        return nullcontext()
+    return tracer.start_as_current_span(
+        name, attributes={f"auth0_ai.{key}": value for key, value in attributes.items()}
+    )
+
 
 class FGARetriever(BaseRetriever):
     """
@@ -100,10 +117,14 @@ class FGARetriever(BaseRetriever):
         Returns:
             List[Document]: Filtered and relevant documents.
         """
-        docs = await self._retriever._aget_relevant_documents(
-            query, run_manager=run_manager
-        )
-        docs = await self._async_filter_FGA(docs)
+        with _span("auth0_ai.fga.retrieve"):
+            docs = await self._retriever._aget_relevant_documents(
+                query, run_manager=run_manager
+            )
+        with _span("auth0_ai.fga.filter", batch_size=len(docs)) as current:
+            docs = await self._async_filter_FGA(docs)
+            if current is not None:
+                current.set_attribute("auth0_ai.allowed", len(docs))
         return docs
 
     def _filter_FGA(self, docs: list[Document]) -> list[Document]:
@@ -153,6 +174,10 @@ class FGARetriever(BaseRetriever):
         Returns:
             List[Document]: Filtered and relevant documents.
         """
-        docs = self._retriever._get_relevant_documents(query, run_manager=run_manager)
-        docs = self._filter_FGA(docs)
+        with _span("auth0_ai.fga.retrieve"):
+            docs = self._retriever._get_relevant_documents(query, run_manager=run_manager)
+        with _span("auth0_ai.fga.filter", batch_size=len(docs)) as current:
+            docs = self._filter_FGA(docs)
+            if current is not None:
+                current.set_attribute("auth0_ai.allowed", len(docs))
         return docs
@@ -136,3 +136,48 @@ def test_get_relevant_docs(
         )
         assert len(filtered_docs) == expected_count
         mock_client_constructor.assert_called_once_with(mock_fga_configuration)
+
+
+def test_retrieval_and_filtering_are_traced(fga_retriever, mock_query_builder, mock_retriever):
+    spans = []
+    current = MagicMock()
+
+    @contextmanager
+    def start_as_current_span(name, attributes=None):
+        spans.append((name, attributes))
+        yield current
+
+    tracer = MagicMock()
+    tracer.start_as_current_span = start_as_current_span
+    mock_query_builder.side_effect = [
+        MagicMock(spec=ClientBatchCheckItem, object=f"doc:{i}") for i in range(2)
+    ]
+    mock_results = MagicMock(
+        result=[
+            MagicMock(
+                allowed=x,
+                request=MagicMock(spec=ClientBatchCheckItem, object=f"doc:{i}"),
+            )
+            for i, x in enumerate([True, False])
+        ]
+    )
+    mock_retriever._get_relevant_documents.return_value = [
+        MagicMock(spec=Document, id=i) for i in range(2)
+    ]
+
+    @contextmanager
+    def mock_client(*args, **kwargs):
+        mock = MagicMock()
+        mock.batch_check.return_value = mock_results
+        yield mock
+
+    with patch("langchain_auth0_ai.FGARetriever.tracer", tracer), patch(
+        "langchain_auth0_ai.FGARetriever.OpenFgaClientSync", mock_client
+    ):
+        fga_retriever._get_relevant_documents("test_query", run_manager=MagicMock())
+
+    assert spans == [
+        ("auth0_ai.fga.retrieve", {}),
+        ("auth0_ai.fga.filter", {"auth0_ai.batch_size": 2}),
+    ]
+    current.set_attribute.assert_called_with("auth0_ai.allowed", 1)
@@ -1,4 +1,6 @@
 import os
+
+from contextlib import nullcontext
 from typing import Callable, Optional, List
 from llama_index.core.retrievers import BaseRetriever
 from pydantic import PrivateAttr
@@ -14,6 +16,22 @@ from llama_index.core.schema import (
     QueryBundle,
 )
 
+try:
+    from opentelemetry import trace
+
+    tracer = trace.get_tracer(__name__)
+except ImportError:  # Tracing is optional, installed with the opentelemetry extra
+    tracer = None
+
+
+def _span(name: str, **attributes):
+    """Span around an FGA step, or a no-op context when OpenTelemetry is missing."""
+    if tracer is None:
+        return nullcontext()
+    return tracer.start_as_current_span(
+        name, attributes={f"auth0_ai.{key}": value for key, value in attributes.items()}
+    )
+
 
 class FGARetriever(BaseRetriever):
     """
@@ -98,8 +116,12 @@ class FGARetriever(BaseRetriever):
 
     def _retrieve(self, query_bundle: QueryBundle) -> List[NodeWithScore]:
         """Retrieve nodes given query and filtered by FGA access."""
-        nodes = self._retriever._retrieve(query_bundle)
-        nodes = self._filter_FGA(nodes)
+        with _span("auth0_ai.fga.retrieve"):
+            nodes = self._retriever._retrieve(query_bundle)
+        with _span("auth0_ai.fga.filter", batch_size=len(nodes)) as current:
+            nodes = self._filter_FGA(nodes)
+            if current is not None:
+                current.set_attribute("auth0_ai.allowed", len(nodes))
         return nodes
 
     async def _async_filter_FGA(
@@ -138,6 +160,10 @@ class FGARetriever(BaseRetriever):
 
     async def _aretrieve(self, query_bundle: QueryBundle) -> List[NodeWithScore]:
         """Retrieve nodes given query and filtered by FGA access."""
-        nodes = await self._retriever._aretrieve(query_bundle)
-        nodes = await self._async_filter_FGA(nodes)
+        with _span("auth0_ai.fga.retrieve"):
+            nodes = await self._retriever._aretrieve(query_bundle)
+        with _span("auth0_ai.fga.filter", batch_size=len(nodes)) as current:
+            nodes = await self._async_filter_FGA(nodes)
+            if current is not None:
+                current.set_attribute("auth0_ai.allowed", len(nodes))
         return nodes